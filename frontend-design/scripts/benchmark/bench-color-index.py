@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+近似重复颜色检测基准测试
+
+对比朴素两两比较 (O(n²)) 与 OKLab 网格索引 (ColorIndex.pairs) 查找
+ΔE_OK < ε 的颜色对。朴素循环只在不超过 --naive-limit 的规模上实际运行,
+更大规模按平方关系外推耗时。
+
+用法:
+    python bench-color-index.py
+    python bench-color-index.py --sizes 1000 10000 50000 --threshold 0.02
+
+示例:
+    python bench-color-index.py --sizes 50000
+"""
+
+import sys
+import math
+import time
+import random
+import argparse
+from pathlib import Path
+
+# 添加父目录到路径以导入共享模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.color import ColorPalette
+from utils.spatial import ColorIndex, DUPLICATE_DELTA_E
+
+
+def random_palette(size: int, rng: random.Random) -> ColorPalette:
+    """生成覆盖OKLCH色域的随机调色板"""
+    return ColorPalette(
+        [f"color-{i}" for i in range(size)],
+        [rng.random() for _ in range(size)],
+        [rng.random() * 0.4 for _ in range(size)],
+        [rng.random() * 360 for _ in range(size)],
+    )
+
+
+def naive_pairs(palette: ColorPalette, threshold: float):
+    """朴素实现: 两两计算OKLab距离"""
+    lab = []
+    for l, c, h in zip(palette.l, palette.c, palette.h):
+        rad = math.radians(h)
+        lab.append((l, c * math.cos(rad), c * math.sin(rad)))
+    limit = threshold * threshold
+    result = []
+    for i in range(len(lab)):
+        li, ai, bi = lab[i]
+        for j in range(i + 1, len(lab)):
+            lj, aj, bj = lab[j]
+            d2 = (li - lj) ** 2 + (ai - aj) ** 2 + (bi - bj) ** 2
+            if d2 < limit:
+                result.append((i, j))
+    return result
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='近似重复颜色检测基准测试',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 10000, 50000],
+                        help='调色板规模')
+    parser.add_argument('--threshold', type=float, default=DUPLICATE_DELTA_E, help='ΔE_OK 阈值')
+    parser.add_argument('--naive-limit', type=int, default=5000,
+                        help='朴素循环实际运行的最大规模, 更大规模按 n² 外推')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    print("=" * 64)
+    print(f"近似重复颜色检测 (ΔE_OK < {args.threshold})")
+    print("=" * 64)
+    print(f"{'规模':>8}{'近似对':>10}{'朴素循环':>14}{'网格索引':>12}{'加速比':>10}")
+
+    naive_rate = None  # 每对比较的耗时, 用于外推
+    for size in args.sizes:
+        palette = random_palette(size, rng)
+
+        start = time.perf_counter()
+        pairs = ColorIndex(palette, args.threshold).pairs()
+        index_time = time.perf_counter() - start
+
+        comparisons = size * (size - 1) / 2
+        if size <= args.naive_limit:
+            start = time.perf_counter()
+            expected = naive_pairs(palette, args.threshold)
+            naive_time = time.perf_counter() - start
+            naive_rate = naive_time / max(comparisons, 1)
+            if expected != [(i, j) for i, j, _ in pairs]:
+                print(f"❌ 结果不一致: 规模 {size}", file=sys.stderr)
+                return 1
+            naive_text = f"{naive_time:.2f}s"
+        elif naive_rate is not None:
+            naive_time = naive_rate * comparisons
+            naive_text = f"~{naive_time:.0f}s*"
+        else:
+            naive_time = None
+            naive_text = "-"
+
+        speedup = f"{naive_time / index_time:.0f}x" if naive_time else "-"
+        print(f"{size:>10}{len(pairs):>10}{naive_text:>14}{index_time:>11.2f}s{speedup:>10}")
+
+    print("-" * 64)
+    print("* 按平方关系外推的估计值")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
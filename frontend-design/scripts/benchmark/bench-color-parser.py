@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+颜色解析基准测试
+
+对比旧的正则解析路径 (LEGACY_OKLCH_PATTERN + 每次新建对象) 与新的单遍分派解析器
+(ColorUtils.parse_color, 带LRU缓存和驻留)。
+
+场景:
+    cold    - 每个值都不同, 解析器不使用缓存 (最坏情况)
+    tokens  - 模拟真实Token文件: 少量颜色值被大量Token重复引用
+    mixed   - 同tokens, 但颜色值混合 hex/rgb/hsl/oklab/oklch 格式
+              (旧路径只能识别纯数字oklch, 其余直接判为无效)
+
+用法:
+    python bench-color-parser.py
+    python bench-color-parser.py --count 200000 --unique 500
+
+示例:
+    python bench-color-parser.py --count 100000
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from dataclasses import dataclass
+
+# 添加父目录到路径以导入共享模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.color import ColorUtils, _parse_css_color
+
+
+# 旧实现中的 ColorUtils.OKLCH_PATTERN (只识别纯数字的 oklch(L C H))
+LEGACY_OKLCH_PATTERN = re.compile(
+    r'oklch\s*\(\s*([\d.]+)\s+([\d.]+)\s+([\d.]+)\s*\)',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class _LegacyOKLCHColor:
+    """旧实现中的颜色对象 (每次解析新建)"""
+    l: float
+    c: float
+    h: float
+
+
+def legacy_parse(color_str: str):
+    """旧实现: 正则匹配 + 新建对象"""
+    match = LEGACY_OKLCH_PATTERN.match(color_str.strip())
+    if match:
+        l, c, h = map(float, match.groups())
+        return _LegacyOKLCHColor(l, c, h)
+    return None
+
+
+def random_oklch(rng: random.Random) -> str:
+    return f"oklch({rng.random():.3f} {rng.random() * 0.4:.3f} {rng.random() * 360:.1f})"
+
+
+def random_any(rng: random.Random) -> str:
+    kind = rng.randrange(5)
+    if kind == 0:
+        return "#%06x" % rng.randrange(0x1000000)
+    if kind == 1:
+        return f"rgb({rng.randrange(256)} {rng.randrange(256)} {rng.randrange(256)} / 0.5)"
+    if kind == 2:
+        return f"hsl({rng.randrange(360)}deg {rng.randrange(101)}% {rng.randrange(101)}%)"
+    if kind == 3:
+        return f"oklab({rng.random():.3f} {rng.uniform(-0.4, 0.4):.3f} {rng.uniform(-0.4, 0.4):.3f})"
+    return f"oklch({rng.randrange(101)}% {rng.random() * 0.4:.3f} {rng.random() * 360:.1f} / 80%)"
+
+
+def measure(func, values, repeat: int) -> float:
+    """返回最快一轮的耗时 (秒)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            func(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def parse_cached(value: str):
+    return ColorUtils.parse_color(value)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='颜色解析基准测试',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--count', '-n', type=int, default=100000, help='每个场景的颜色值数量')
+    parser.add_argument('--unique', type=int, default=200, help='tokens场景中不同颜色值的数量')
+    parser.add_argument('--repeat', type=int, default=3, help='重复轮数, 取最快一轮')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    uncached = _parse_css_color.__wrapped__
+
+    cold = [random_oklch(rng) for _ in range(args.count)]
+    pool = [random_oklch(rng) for _ in range(args.unique)]
+    tokens = [rng.choice(pool) for _ in range(args.count)]
+    mixed_pool = [random_any(rng) for _ in range(args.unique)]
+    mixed = [rng.choice(mixed_pool) for _ in range(args.count)]
+
+    scenarios = [
+        ('cold', cold, uncached),
+        ('tokens', tokens, parse_cached),
+        ('mixed', mixed, parse_cached),
+    ]
+
+    print("=" * 60)
+    print(f"颜色解析基准测试 (每场景 {args.count} 个值, 最快{args.repeat}轮)")
+    print("=" * 60)
+    print(f"{'场景':<8}{'旧正则路径':>12}{'新解析器':>12}{'加速比':>8}{'识别率(旧/新)':>16}")
+
+    for name, values, func in scenarios:
+        ColorUtils.clear_parse_cache()
+        legacy_time = measure(legacy_parse, values, args.repeat)
+        ColorUtils.clear_parse_cache()
+        new_time = measure(func, values, args.repeat)
+        legacy_rate = sum(1 for v in values if legacy_parse(v)) / len(values)
+        new_rate = sum(1 for v in values if ColorUtils.parse_color(v)) / len(values)
+        print(f"{name:<10}{legacy_time * 1000:>12.1f}ms{new_time * 1000:>12.1f}ms"
+              f"{legacy_time / new_time:>9.2f}x{legacy_rate:>10.0%} / {new_rate:.0%}")
+
+    info = ColorUtils.parse_cache_info()
+    print("-" * 60)
+    print(f"解析缓存: 命中 {info.hits} | 未命中 {info.misses} | 容量 {info.maxsize}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+硬编码值扫描基准测试
+
+生成一组合成源文件 (.tsx 组件和 .css 样式表, 混有颜色、px/rem 尺寸和
+href="#x" 锚点), 分别用单进程 (jobs=1) 和进程池 (scan_sources 的并行路径)
+扫描, 报告耗时和每秒文件数, 并校验两种方式的结果完全一致。
+
+进程池路径只在文件数不少于 PARALLEL_MIN_FILES 时启用, 文件数小于该值时
+只测单进程。单核机器上进程池不会更快, 但仍会测量其开销。
+
+用法:
+    python bench-hardcoded.py
+    python bench-hardcoded.py --files 20000 --jobs 4
+
+示例:
+    python bench-hardcoded.py --files 2000 --keep /tmp/sources
+"""
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List, Tuple
+
+# 添加父目录到路径以导入共享模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.literals import PARALLEL_MIN_FILES, scan_sources
+from utils.benchmark import measure
+
+PROPERTIES = ['padding', 'margin', 'gap', 'border-radius', 'font-size', 'line-height', 'width']
+
+
+def make_entries(rng: random.Random) -> List[Tuple[str, str, str]]:
+    """生成颜色和尺寸Token (名称, 值, 类型)"""
+    entries = []
+    for i in range(200):
+        value = f"oklch({rng.random():.3f} {rng.random() * 0.3:.3f} {rng.random() * 360:.1f})"
+        entries.append((f"color-{i}", value, 'color'))
+    for category in ('spacing', 'radius', 'font'):
+        for px in range(2, 66, 2):
+            entries.append((f"{category}-{px}", f"{px}px", 'dimension'))
+    return entries
+
+
+def _color(rng: random.Random) -> str:
+    return f"#{rng.randrange(0x1000000):06x}"
+
+
+def _dimension(rng: random.Random) -> str:
+    if rng.random() < 0.2:
+        return f"{rng.randrange(1, 8) * 0.25}rem"
+    return f"{rng.randrange(1, 64)}px"
+
+
+def make_component(rng: random.Random, index: int) -> str:
+    """合成一个React组件"""
+    lines = [f"export function Component{index}() {{", "  return ("]
+    for i in range(rng.randrange(10, 40)):
+        prop = rng.choice(PROPERTIES).replace('-r', 'R').replace('-s', 'S').replace('-h', 'H')
+        lines.append(f"    <div style={{{{ color: '{_color(rng)}', {prop}: '{_dimension(rng)}' }}}}>")
+        lines.append(f'      <a href="#section-{i}">item {i}</a>')
+        lines.append('    </div>')
+    lines += ["  );", "}", ""]
+    return '\n'.join(lines)
+
+
+def make_stylesheet(rng: random.Random, index: int) -> str:
+    """合成一个样式表"""
+    lines = []
+    for i in range(rng.randrange(10, 40)):
+        lines.append(f".block-{index}-{i} {{")
+        lines.append(f"  color: {_color(rng)};")
+        lines.append(f"  {rng.choice(PROPERTIES)}: {_dimension(rng)};")
+        lines.append(f"  --local-{i}: {_dimension(rng)};")
+        lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_sources(count: int, directory: Path, rng: random.Random) -> None:
+    """写出 count 个源文件, 每个子目录100个"""
+    for i in range(count):
+        sub = directory / f"pkg-{i // 100}"
+        sub.mkdir(exist_ok=True)
+        if i % 3 == 0:
+            (sub / f"style-{i}.css").write_text(make_stylesheet(rng, i), encoding='utf-8')
+        else:
+            (sub / f"Component{i}.tsx").write_text(make_component(rng, i), encoding='utf-8')
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='硬编码值扫描基准测试',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--files', '-n', type=int, default=2000, help='源文件数量')
+    parser.add_argument('--jobs', '-j', type=int, default=max(os.cpu_count() or 1, 2),
+                        help='进程池的进程数 (默认: CPU核数, 至少2)')
+    parser.add_argument('--repeat', type=int, default=3, help='重复轮数, 取最快一轮')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    parser.add_argument('--keep', type=Path, metavar='DIR', help='把生成的文件保留在该目录 (默认使用临时目录)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entries = make_entries(rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.keep or Path(tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+        write_sources(args.files, directory, rng)
+        size = sum(path.stat().st_size for path in directory.rglob('*') if path.is_file()) / (1 << 20)
+
+        print("=" * 72)
+        print(f"硬编码值扫描基准测试 ({args.files} 个文件, {size:.1f}MB, 最快{args.repeat}轮)")
+        print("=" * 72)
+        print(f"{'方式':<16}{'进程数':>8}{'耗时':>12}{'文件/秒':>14}{'硬编码值':>12}")
+
+        cases = [('单进程', 1)]
+        if args.files >= PARALLEL_MIN_FILES and args.jobs > 1:
+            cases.append(('进程池', args.jobs))
+        results = {}
+        for name, jobs in cases:
+            found, files = scan_sources(entries, [directory], jobs=jobs)
+            seconds = measure(lambda: scan_sources(entries, [directory], jobs=jobs), args.repeat)
+            results[name] = found
+            print(f"{name:<16}{jobs:>8}{seconds:>11.2f}s{files / seconds:>14,.0f}{len(found):>12,}")
+
+    print("-" * 72)
+    if len(cases) == 1:
+        print(f"⚠️  文件数少于 {PARALLEL_MIN_FILES} 或进程数为1, 未测量进程池")
+        return 0
+    if results['进程池'] != results['单进程']:
+        print("❌ 进程池与单进程的扫描结果不一致")
+        return 1
+    print("✅ 进程池与单进程的扫描结果一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Token文件加载基准测试
+
+把同一组合成Token (DTCG嵌套格式) 分别写成 JSON、YAML、TOML、JSON5 文件,
+比较各格式的整体加载 (load_token_file) 与逐成员读取 (iter_token_members +
+iter_tokens 展开) 耗时, 并校验所有格式读出的Token完全一致。YAML 同时测量
+libyaml (CSafeLoader) 与纯Python SafeLoader; 未安装解析器的格式跳过。
+
+用法:
+    python bench-token-loaders.py
+    python bench-token-loaders.py --count 200000 --repeat 3
+
+示例:
+    python bench-token-loaders.py --count 50000 --keep /tmp/tokens
+"""
+
+import sys
+import json
+import random
+import argparse
+import importlib
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 添加父目录到路径以导入共享模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.loaders import TokenFileError, load_token_file, iter_token_members
+from utils.token import TokenValidator
+from utils.benchmark import measure
+
+CATEGORIES = ['color', 'spacing', 'font', 'shadow', 'radius', 'duration']
+WORDS = ['primary', 'secondary', 'bg', 'text', 'border', 'hover', 'active', 'muted',
+         'subtle', 'sm', 'md', 'lg', 'xl', 'base', 'heading', 'inset']
+
+
+def make_tokens(count: int, rng: random.Random) -> Dict[str, Dict[str, Any]]:
+    """生成两层分组的DTCG Token: 类别 -> 名称 -> {$value, $type}"""
+    tokens: Dict[str, Dict[str, Any]] = {category: {} for category in CATEGORIES}
+    for i in range(count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        name = f"{rng.choice(WORDS)}-{i}"
+        if category == 'color':
+            value = f"oklch({rng.random():.3f} {rng.random() * 0.4:.3f} {rng.random() * 360:.1f})"
+            token = {'$value': value, '$type': 'color'}
+        elif category in ('spacing', 'radius'):
+            token = {'$value': f"{rng.randrange(1, 64)}px", '$type': 'dimension'}
+        elif i % 10 == 0:
+            token = {'$value': f"{{color.{rng.choice(WORDS)}-0}}"}
+        else:
+            token = {'$value': f"{rng.randrange(100, 900)}", '$description': f"{category} {name}"}
+        tokens[category][name] = token
+    return tokens
+
+
+def _toml_string(value: str) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def to_toml(tokens: Dict[str, Dict[str, Any]]) -> str:
+    """两层分组的Token写成TOML (每个Token一个内联表)"""
+    lines = []
+    for category, group in tokens.items():
+        lines.append(f"[{category}]")
+        for name, token in group.items():
+            fields = ', '.join(f"{_toml_string(key)} = {_toml_string(value)}" for key, value in token.items())
+            lines.append(f"{_toml_string(name)} = {{ {fields} }}")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def to_json5(tokens: Dict[str, Dict[str, Any]]) -> str:
+    """写成典型的手写JSON5: 注释、未加引号的键、单引号字符串、尾随逗号"""
+    lines = ['// generated design tokens', '{']
+    for category, group in tokens.items():
+        lines.append(f"  /* {category} */")
+        lines.append(f"  {category}: {{")
+        for name, token in group.items():
+            fields = ', '.join(f"{key}: '{value}'" for key, value in token.items())
+            lines.append(f"    '{name}': {{ {fields}, }},")
+        lines.append('  },')
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def write_files(tokens: Dict[str, Dict[str, Any]], directory: Path) -> Dict[str, Path]:
+    """写出各格式文件, 返回 格式名 -> 路径 (缺少写出依赖的格式跳过)"""
+    files = {'json': directory / 'tokens.json'}
+    files['json'].write_text(json.dumps(tokens, ensure_ascii=False, indent=2), encoding='utf-8')
+    try:
+        yaml = importlib.import_module('yaml')
+    except ImportError:
+        yaml = None
+    if yaml is not None:
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        files['yaml'] = directory / 'tokens.yaml'
+        files['yaml'].write_text(
+            yaml.dump(tokens, Dumper=dumper, allow_unicode=True, sort_keys=False), encoding='utf-8'
+        )
+    files['toml'] = directory / 'tokens.toml'
+    files['toml'].write_text(to_toml(tokens), encoding='utf-8')
+    files['json5'] = directory / 'tokens.json5'
+    files['json5'].write_text(to_json5(tokens), encoding='utf-8')
+    return files
+
+
+def load_all(path: Path) -> None:
+    load_token_file(path)
+
+
+def stream_all(path: Path) -> None:
+    for _ in TokenValidator.iter_tokens(iter_token_members(path)):
+        pass
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='Token文件加载基准测试',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--count', '-n', type=int, default=50000, help='Token数量')
+    parser.add_argument('--repeat', type=int, default=3, help='重复轮数, 取最快一轮')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    parser.add_argument('--keep', type=Path, metavar='DIR', help='把生成的文件保留在该目录 (默认使用临时目录)')
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.count, random.Random(args.seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.keep or Path(tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+        files = write_files(tokens, directory)
+
+        print("=" * 72)
+        print(f"Token文件加载基准测试 ({args.count} 个Token, 最快{args.repeat}轮)")
+        print("=" * 72)
+        print(f"{'格式':<12}{'大小':>10}{'整体加载':>12}{'逐成员读取':>12}{'Token/秒':>14}")
+
+        expected = list(TokenValidator.iter_tokens(tokens))
+        cases: List[tuple] = [(name, path) for name, path in files.items()]
+        if 'yaml' in files:
+            cases.insert(2, ('yaml (纯Py)', files['yaml']))
+        mismatched = []
+        for name, path in cases:
+            yaml_python = name == 'yaml (纯Py)'
+            if yaml_python:
+                # 临时隐藏 libyaml, 两种读取方式都走纯Python实现
+                import yaml
+                import utils.loaders as loaders
+                saved = (yaml.CSafeLoader, yaml.__with_libyaml__, loaders._yaml_loaders)
+                yaml.CSafeLoader, yaml.__with_libyaml__, loaders._yaml_loaders = \
+                    yaml.SafeLoader, False, None
+            try:
+                loaded = list(TokenValidator.iter_tokens(load_token_file(path)))
+                streamed = list(TokenValidator.iter_tokens(iter_token_members(path)))
+                load_time = measure(lambda: load_all(path), args.repeat)
+                stream_time = measure(lambda: stream_all(path), args.repeat)
+            except TokenFileError as e:
+                print(f"{name:<14}跳过: {e}")
+                continue
+            finally:
+                if yaml_python:
+                    yaml.CSafeLoader, yaml.__with_libyaml__, loaders._yaml_loaders = saved
+            if loaded != expected or streamed != expected:
+                mismatched.append(name)
+            size = path.stat().st_size / (1 << 20)
+            print(f"{name:<14}{size:>8.1f}MB{load_time * 1000:>10.0f}ms{stream_time * 1000:>10.0f}ms"
+                  f"{args.count / load_time:>14,.0f}")
+
+    print("-" * 72)
+    if mismatched:
+        print(f"❌ 读出的Token与JSON不一致: {', '.join(mismatched)}")
+        return 1
+    print("✅ 所有格式读出的Token一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
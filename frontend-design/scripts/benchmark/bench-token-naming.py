@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Token命名检查基准测试
+
+对比旧的逐条检查实现 (未编译的 re.match + 子串判断 + split) 与合并规则后的
+TokenValidator.validate_naming, 并校验两者报告的问题完全一致。
+
+用法:
+    python bench-token-naming.py
+    python bench-token-naming.py --count 100000 --bad-ratio 0.05
+
+示例:
+    python bench-token-naming.py --count 200000
+"""
+
+import re
+import sys
+import random
+import argparse
+from pathlib import Path
+
+# 添加父目录到路径以导入共享模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.token import TokenValidator
+from utils.benchmark import measure
+
+CATEGORIES = ['color', 'spacing', 'font', 'shadow', 'radius', 'duration', 'ease']
+WORDS = ['primary', 'secondary', 'bg', 'text', 'border', 'hover', 'active', 'muted',
+         'subtle', 'sm', 'md', 'lg', 'xl', '2xl', 'base', 'heading', 'inset']
+BAD_NAMES = ['color-brand-red', 'Spacing-lg', 'font--size', 'radius_md', '9-shadow', 'color-x-blue-2']
+
+
+def legacy_validate_naming(token_name: str):
+    """旧实现 (逐条检查)"""
+    issues = []
+    if not re.match(r'^[a-z][a-z0-9-]*$', token_name):
+        issues.append("Token名称必须使用小写字母、数字和连字符，且以字母开头")
+    if '--' in token_name:
+        issues.append("Token名称不应包含连续的连字符")
+    if '_' in token_name:
+        issues.append("Token名称应使用连字符而非下划线")
+    if token_name.startswith('color-'):
+        parts = token_name.split('-')
+        if len(parts) >= 3:
+            concept = parts[2]
+            concrete_colors = ['red', 'blue', 'green', 'yellow', 'purple', 'orange']
+            if concept in concrete_colors:
+                issues.append(
+                    f"建议使用语义化命名 (如 'color-primary') 而非具体颜色名 ('{token_name}')"
+                )
+    return issues
+
+
+def synthetic_names(count: int, bad_ratio: float, rng: random.Random):
+    """生成Token名称, 其中 bad_ratio 比例不合规"""
+    names = []
+    for i in range(count):
+        if rng.random() < bad_ratio:
+            names.append(f"{rng.choice(BAD_NAMES)}-{i}")
+        else:
+            parts = [rng.choice(CATEGORIES)] + rng.sample(WORDS, rng.randint(1, 3))
+            names.append('-'.join(parts) + f"-{i}")
+    return names
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='Token命名检查基准测试',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--count', '-n', type=int, default=100000, help='Token数量')
+    parser.add_argument('--bad-ratio', type=float, default=0.02, help='不合规名称比例')
+    parser.add_argument('--repeat', type=int, default=3, help='重复轮数, 取最快一轮')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    args = parser.parse_args()
+
+    names = synthetic_names(args.count, args.bad_ratio, random.Random(args.seed))
+
+    # 结果必须与旧实现完全一致
+    mismatched = [
+        name for name in names
+        if legacy_validate_naming(name) != TokenValidator.validate_naming(name)
+    ]
+    if mismatched:
+        print(f"❌ 结果不一致: {len(mismatched)} 个名称, 如 {mismatched[:3]}", file=sys.stderr)
+        return 1
+
+    def run(func):
+        return lambda: [func(name) for name in names]
+
+    legacy_time = measure(run(legacy_validate_naming), args.repeat)
+    new_time = measure(run(TokenValidator.validate_naming), args.repeat)
+    structure_time = measure(
+        lambda: TokenValidator.validate_token_structure(dict.fromkeys(names, "1rem")),
+        args.repeat
+    )
+
+    print("=" * 60)
+    print(f"Token命名检查 ({args.count} 个Token, 不合规 {args.bad_ratio:.0%}, 最快{args.repeat}轮)")
+    print("=" * 60)
+    print(f"旧实现 (逐条检查):     {legacy_time * 1000:>9.1f}ms")
+    print(f"合并规则:              {new_time * 1000:>9.1f}ms  ({legacy_time / new_time:.2f}x)")
+    print(f"validate_token_structure: {structure_time * 1000:>6.1f}ms")
+    print("-" * 60)
+    print("✅ 两种实现报告的问题完全一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享模块 (utils) 微基准测试
+
+在合成调色板 (默认 1k/10k/100k 个颜色) 上测量解析、校验、转换和
+对比度计算的吞吐量, 可写入JSON基线, 并在吞吐量下降超过容差时失败。
+
+用例:
+    parse            - ColorUtils.parse_oklch, 每轮清空解析缓存 (冷解析)
+    parse-cached     - ColorUtils.parse_oklch, 缓存已预热
+    validate         - ColorUtils.is_valid_oklch
+    palette          - ColorPalette.from_values 批量构建
+    convert          - ColorUtils.oklch_to_linear_srgb 逐个转换
+    luminance        - ColorPalette.luminance 批量计算
+    contrast         - ColorUtils.calculate_contrast_ratio 逐对计算
+    contrast-batch   - ColorPalette.contrast_ratios 批量计算
+
+用法:
+    python bench-utils.py
+    python bench-utils.py --baseline                 # 与仓库中的参考基线比较
+    python bench-utils.py --save baselines/utils.json  # 重新生成参考基线
+    python bench-utils.py --baseline baseline.json --tolerance 0.3
+
+参考基线 baselines/utils.json 记录在开发机上, 与机器相关; CI 中应在同一类
+运行环境上用 --save 重新生成后提交, 或把 --tolerance 放宽到能覆盖机器差异。
+
+示例:
+    python bench-utils.py --sizes 1000 10000 --only parse contrast
+"""
+
+import sys
+import random
+import argparse
+from pathlib import Path
+
+# 添加父目录到路径以导入共享模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.color import ColorUtils, ColorPalette
+from utils.benchmark import (
+    BenchmarkResult, measure, load_baseline, save_baseline, find_regressions,
+    DEFAULT_TOLERANCE
+)
+
+# 仓库中提交的参考基线 (--baseline 不带路径时使用)
+DEFAULT_BASELINE = Path(__file__).parent / 'baselines' / 'utils.json'
+
+
+def random_oklch(rng: random.Random) -> str:
+    return f"oklch({rng.random():.4f} {rng.random() * 0.4:.4f} {rng.random() * 360:.2f})"
+
+
+def _each(func, values):
+    def run():
+        for value in values:
+            func(value)
+    return run
+
+
+def build_cases(values, backgrounds):
+    """
+    构建基准用例
+
+    Args:
+        values: 前景颜色字符串列表
+        backgrounds: 等长的背景颜色字符串列表
+
+    Returns:
+        (名称, 被测函数, 每轮准备函数) 列表
+    """
+    palette = ColorPalette.from_values(values)
+    bg_palette = ColorPalette.from_values(backgrounds)
+    parsed = [ColorUtils.parse_oklch(v) for v in values]
+
+    def convert():
+        for color in parsed:
+            ColorUtils.oklch_to_linear_srgb(color.l, color.c, color.h)
+
+    def contrast():
+        for fg, bg in zip(values, backgrounds):
+            ColorUtils.calculate_contrast_ratio(fg, bg)
+
+    def warm():
+        for value in values:
+            ColorUtils.parse_oklch(value)
+
+    return [
+        ('parse', _each(ColorUtils.parse_oklch, values), ColorUtils.clear_parse_cache),
+        ('parse-cached', _each(ColorUtils.parse_oklch, values), warm),
+        ('validate', _each(ColorUtils.is_valid_oklch, values), None),
+        ('palette', lambda: ColorPalette.from_values(values), None),
+        ('convert', convert, None),
+        ('luminance', palette.luminance, None),
+        ('contrast', contrast, warm),
+        ('contrast-batch', lambda: palette.contrast_ratios(bg_palette), None),
+    ]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='utils 共享模块微基准测试',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='调色板规模')
+    parser.add_argument('--repeat', type=int, default=3, help='重复轮数, 取最快一轮')
+    parser.add_argument('--only', nargs='+', metavar='CASE', help='只运行指定用例')
+    parser.add_argument('--baseline', type=Path, nargs='?', const=DEFAULT_BASELINE,
+                        help='与基线JSON比较, 回归时返回1 (不带路径时使用 baselines/utils.json)')
+    parser.add_argument('--save', type=Path, help='把本次结果写入基线JSON')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'允许的吞吐量下降比例 (默认: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except Exception as e:
+            print(f"❌ 基线读取错误: {e}", file=sys.stderr)
+            return 1
+
+    rng = random.Random(args.seed)
+    results = []
+
+    print("=" * 64)
+    print(f"utils 微基准测试 (最快{args.repeat}轮)")
+    print("=" * 64)
+    print(f"{'用例':<18}{'规模':>8}{'耗时':>12}{'吞吐量 (个/秒)':>18}{'基线比':>8}")
+
+    for size in args.sizes:
+        values = [random_oklch(rng) for _ in range(size)]
+        backgrounds = [random_oklch(rng) for _ in range(size)]
+        for name, func, setup in build_cases(values, backgrounds):
+            if args.only and name not in args.only:
+                continue
+            result = BenchmarkResult(name, size, measure(func, args.repeat, setup))
+            results.append(result)
+            ratio = ""
+            if baseline and result.key in baseline:
+                ratio = f"{result.throughput / baseline[result.key]:.2f}x"
+            print(f"{name:<20}{size:>8}{result.seconds * 1000:>10.1f}ms"
+                  f"{result.throughput:>18,.0f}{ratio:>9}")
+
+    print("-" * 64)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"📄 基线已保存到: {args.save}")
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f"❌ 性能回归 {r.key}: {r.current:,.0f}/秒, 基线 {r.baseline:,.0f}/秒 "
+                  f"({r.ratio:.0%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✅ 无性能回归 (容差 {args.tolerance:.0%})")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,20 +9,27 @@
     python generate-theme.py --primary "oklch(0.7 0.15 250)"
     python generate-theme.py --config theme-config.json
     python generate-theme.py --output tokens/
+    python generate-theme.py --primary "oklch(0.7 0.15 250)" --secondary "oklch(0.65 0.12 180)" --contrast-model apca
+    python generate-theme.py --primary "oklch(0.7 0.15 250)" --secondary "oklch(0.65 0.12 180)" --fix-contrast
+    python generate-theme.py --primary "oklch(0.7 0.15 250)" --secondary "oklch(0.65 0.12 180)" --token "color-link={color-primary}"
 
 示例:
     python generate-theme.py --primary "oklch(0.7 0.15 250)" --secondary "oklch(0.65 0.12 180)"
 """
 
 import sys
+import math
 import argparse
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from utils.color import ColorUtils, ColorPalette
+from utils.alias import AliasGraph
+
 
 @dataclass
 class ThemeConfig:
@@ -32,6 +39,9 @@ class ThemeConfig:
     name: str = "default"
     include_dark: bool = True
     output_format: str = "css"  # css, json, scss
+    gamut: str = "srgb"  # srgb, p3, none
+    fix_contrast: Optional[str] = None  # None, wcag2, apca
+    overrides: Dict[str, Any] = field(default_factory=dict)  # 追加/覆盖的Token, 值可引用其他Token
 
 
 class ThemeGenerator:
@@ -87,25 +97,88 @@ class ThemeGenerator:
         "ease-out": "cubic-bezier(0, 0, 0.2, 1)",
     }
 
+    # 派生色定义: (Token名称, 基色, 亮度调整, 色度调整, 色相调整)
+    LIGHT_DERIVED = (
+        ("color-primary-hover", "primary", 0.05, 0.02, 0),
+        ("color-primary-active", "primary", -0.05, 0, 0),
+        ("color-secondary-hover", "secondary", 0.05, 0.02, 0),
+    )
+
+    DARK_DERIVED = (
+        ("color-primary", "primary", 0.05, 0.02, 0),
+        ("color-primary-hover", "primary", 0.08, 0.03, 0),
+        ("color-primary-active", "primary", 0.02, 0, 0),
+        ("color-secondary", "secondary", 0.05, 0.02, 0),
+        ("color-secondary-hover", "secondary", 0.08, 0.03, 0),
+    )
+
+    # 文本色对比度目标: 模型 -> {文本Token: 最小对比度 (wcag2为比值, apca为|Lc|)}
+    TEXT_CONTRAST_TARGETS = {
+        "wcag2": {"color-text": 4.5, "color-text-muted": 4.5, "color-text-disabled": 3.0},
+        "apca": {"color-text": 75, "color-text-muted": 60, "color-text-disabled": 30},
+    }
+
+    # 参与对比度审查的背景Token
+    BACKGROUND_TOKENS = ("color-bg", "color-bg-subtle", "color-bg-muted")
+
+    # 可自动修正亮度的文本Token (color-text 作为主文本色不自动改动)
+    FIXABLE_TEXT_TOKENS = ("color-text-muted", "color-text-disabled")
+
     @staticmethod
-    def generate_color_tokens(primary: str, secondary: str) -> Dict[str, str]:
+    def _derive_colors(bases: Dict[str, str], specs, gamut: str = "srgb") -> Dict[str, str]:
+        """
+        批量生成派生色
+
+        所有派生色放入一个ColorPalette, 通过一次向量化transform完成调整,
+        再一次性映射回目标色域。
+
+        Args:
+            bases: 基色字典 (e.g., {"primary": "oklch(...)"})
+            specs: 派生色定义序列, 见 LIGHT_DERIVED
+            gamut: 目标色域 ('srgb', 'p3'), 'none' 表示不做色域映射
+
+        Returns:
+            派生色Token字典, 无法解析的基色原样保留
+        """
+        sources = [bases[base] for _, base, _, _, _ in specs]
+        palette = ColorPalette.from_values(sources, names=[spec[0] for spec in specs])
+        adjusted = palette.transform(
+            dl=[spec[2] for spec in specs],
+            dc=[spec[3] for spec in specs],
+            dh=[spec[4] for spec in specs],
+        )
+        if gamut != "none":
+            adjusted = adjusted.gamut_map(gamut)
+        return {
+            name: value if value is not None else source
+            for name, value, source in zip(adjusted.names, adjusted.css_values(), sources)
+        }
+
+    @staticmethod
+    def generate_color_tokens(primary: str, secondary: str, gamut: str = "srgb") -> Dict[str, str]:
         """
         生成颜色Token
 
         Args:
             primary: 主色 OKLCH
             secondary: 次要色 OKLCH
+            gamut: 派生色的目标色域 ('srgb', 'p3', 'none')
 
         Returns:
             颜色Token字典
         """
+        derived = ThemeGenerator._derive_colors(
+            {"primary": primary, "secondary": secondary},
+            ThemeGenerator.LIGHT_DERIVED,
+            gamut
+        )
         return {
             # Light主题
             "color-primary": primary,
-            "color-primary-hover": ThemeGenerator._adjust_color(primary, 0.05, 0.02, 0),
-            "color-primary-active": ThemeGenerator._adjust_color(primary, -0.05, 0, 0),
+            "color-primary-hover": derived["color-primary-hover"],
+            "color-primary-active": derived["color-primary-active"],
             "color-secondary": secondary,
-            "color-secondary-hover": ThemeGenerator._adjust_color(secondary, 0.05, 0.02, 0),
+            "color-secondary-hover": derived["color-secondary-hover"],
             "color-success": "oklch(0.75 0.15 145)",
             "color-warning": "oklch(0.80 0.12 85)",
             "color-error": "oklch(0.60 0.20 25)",
@@ -126,24 +199,26 @@ class ThemeGenerator:
         }
 
     @staticmethod
-    def generate_dark_color_tokens(primary: str, secondary: str) -> Dict[str, str]:
+    def generate_dark_color_tokens(primary: str, secondary: str, gamut: str = "srgb") -> Dict[str, str]:
         """
         生成暗色主题颜色Token
 
         Args:
             primary: 主色 OKLCH
             secondary: 次要色 OKLCH
+            gamut: 派生色的目标色域 ('srgb', 'p3', 'none')
 
         Returns:
             暗色Token字典
         """
+        derived = ThemeGenerator._derive_colors(
+            {"primary": primary, "secondary": secondary},
+            ThemeGenerator.DARK_DERIVED,
+            gamut
+        )
         return {
             # Dark主题 - 调整亮度和色度
-            "color-primary": ThemeGenerator._adjust_color(primary, 0.05, 0.02, 0),
-            "color-primary-hover": ThemeGenerator._adjust_color(primary, 0.08, 0.03, 0),
-            "color-primary-active": ThemeGenerator._adjust_color(primary, 0.02, 0, 0),
-            "color-secondary": ThemeGenerator._adjust_color(secondary, 0.05, 0.02, 0),
-            "color-secondary-hover": ThemeGenerator._adjust_color(secondary, 0.08, 0.03, 0),
+            **derived,
             "color-success": "oklch(0.70 0.18 145)",
             "color-warning": "oklch(0.75 0.15 85)",
             "color-error": "oklch(0.65 0.22 25)",
@@ -163,30 +238,6 @@ class ThemeGenerator:
             "color-error-bg": "oklch(0.25 0.05 25)",
         }
 
-    @staticmethod
-    def _adjust_color(color: str, dl: float, dc: float, dh: float) -> str:
-        """
-        调整OKLCH颜色值
-
-        Args:
-            color: OKLCH颜色字符串
-            dl: 亮度调整量
-            dc: 色度调整量
-            dh: 色相调整量
-
-        Returns:
-            调整后的OKLCH颜色
-        """
-        import re
-        match = re.match(r'oklch\s*\(\s*([\d.]+)\s+([\d.]+)\s+([\d.]+)\s*\)', color)
-        if match:
-            l, c, h = map(float, match.groups())
-            l = max(0, min(1, l + dl))
-            c = max(0, min(0.4, c + dc))
-            h = (h + dh) % 360
-            return f"oklch({l} {c} {h})"
-        return color
-
     def generate(self, config: ThemeConfig) -> Dict[str, Any]:
         """
         生成完整主题
@@ -199,15 +250,173 @@ class ThemeGenerator:
         """
         # 合并所有Token
         light_theme = {**self.BASE_TOKENS}
-        light_theme.update(self.generate_color_tokens(config.primary_color, config.secondary_color))
+        light_theme.update(self.generate_color_tokens(
+            config.primary_color, config.secondary_color, config.gamut
+        ))
 
         dark_theme = {**self.BASE_TOKENS}
-        dark_theme.update(self.generate_dark_color_tokens(config.primary_color, config.secondary_color))
+        dark_theme.update(self.generate_dark_color_tokens(
+            config.primary_color, config.secondary_color, config.gamut
+        ))
 
-        return {
-            "light": light_theme,
-            "dark": dark_theme
+        theme = {
+            "light": self.resolve_aliases({**light_theme, **config.overrides}),
+            "dark": self.resolve_aliases({**dark_theme, **config.overrides})
         }
+        if config.fix_contrast:
+            self.fix_text_contrast(list(theme.values()), config.fix_contrast)
+        return theme
+
+    @staticmethod
+    def resolve_aliases(tokens: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        把引用值 ("{color-primary}") 替换为最终值
+
+        同一模式下的引用在 AliasGraph 中一次线性遍历解析, 因此 dark 模式中的
+        引用会得到 dark 模式的值。
+
+        Args:
+            tokens: 单个模式的Token字典
+
+        Returns:
+            引用已解析的新字典 (顺序不变)
+
+        Raises:
+            ValueError: 存在悬空或循环引用
+        """
+        graph = AliasGraph(tokens)
+        if not graph.targets:
+            return tokens
+        if not graph.is_valid:
+            problems = [f"{name} -> {{{target}}} 不存在" for name, target in graph.dangling]
+            problems.extend(f"循环引用 {graph.describe_cycle(cycle)}" for cycle in graph.cycles)
+            raise ValueError("无法解析Token引用: " + "; ".join(problems))
+        return {name: graph.resolve(name) for name in tokens}
+
+    def generate_all(self, configs: List[ThemeConfig]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量生成多个品牌主题
+
+        需要修正对比度的主题在全部生成后通过一次 fix_text_contrast 统一求解。
+
+        Args:
+            configs: 主题配置列表
+
+        Returns:
+            主题名称 -> 完整主题字典
+        """
+        themes = {}
+        pending = {}
+        for config in configs:
+            theme = self.generate(ThemeConfig(**{**config.__dict__, "fix_contrast": None}))
+            themes[config.name] = theme
+            if config.fix_contrast:
+                pending.setdefault(config.fix_contrast, []).extend(theme.values())
+        for model, modes in pending.items():
+            self.fix_text_contrast(modes, model)
+        return themes
+
+    @staticmethod
+    def fix_text_contrast(modes: List[Dict[str, str]], model: str = "wcag2") -> int:
+        """
+        调整次要文本色亮度, 使其对所有背景Token达到 TEXT_CONTRAST_TARGETS
+
+        所有模式的 (文本, 背景) 组合一次性交给 ColorUtils.solve_accessible_lightness,
+        在更暗和更亮两侧各求一个解。这些解连同原亮度作为候选, 对该模式的全部背景
+        复核, 取全部达标且离原亮度最近的候选。没有候选能同时满足所有背景时
+        (如一个背景要求更暗、另一个要求更亮), 取最差对比度最高的候选, 剩余的
+        不达标组合由 audit_contrast 报告。原地修改传入的Token字典。
+
+        Args:
+            modes: Token字典列表 (如 [theme["light"], theme["dark"]])
+            model: 对比度模型 ('wcag2' 或 'apca')
+
+        Returns:
+            被修改的Token数量
+        """
+        targets = ThemeGenerator.TEXT_CONTRAST_TARGETS[model]
+        pairs = []
+        mode_backgrounds = []
+        for index, tokens in enumerate(modes):
+            backgrounds = [tokens[name] for name in ThemeGenerator.BACKGROUND_TOKENS if name in tokens]
+            mode_backgrounds.append(backgrounds)
+            for text in ThemeGenerator.FIXABLE_TEXT_TOKENS:
+                if text in tokens:
+                    pairs.extend((index, text, background) for background in backgrounds)
+        if not pairs:
+            return 0
+
+        foregrounds = ColorPalette.from_values([modes[i][text] for i, text, _ in pairs])
+        backgrounds = [background for _, _, background in pairs]
+        goals = [targets[text] for _, text, _ in pairs]
+        # (模式, 文本) -> (第一个组合的下标, 候选亮度)
+        groups = {}
+        for k, (index, text, _) in enumerate(pairs):
+            groups.setdefault((index, text), (k, {foregrounds.l[k]}))
+        for direction in ("darker", "lighter"):
+            solved = ColorUtils.solve_accessible_lightness(
+                foregrounds, backgrounds, goals, model, direction
+            )
+            for k, (index, text, _) in enumerate(pairs):
+                groups[(index, text)][1].add(solved.l[k])
+
+        changed = 0
+        for (index, text), (k, candidates) in groups.items():
+            original = foregrounds.l[k]
+            if math.isnan(original):
+                continue
+            candidates = sorted(candidates, key=lambda l: (abs(l - original), l))
+            n = len(candidates)
+            palette = ColorPalette(
+                [text] * n, candidates, [foregrounds.c[k]] * n,
+                [foregrounds.h[k]] * n, [foregrounds.alpha[k]] * n
+            )
+            matrix = ColorUtils.contrast_matrix(palette, mode_backgrounds[index], model)
+            # 每个候选在所有背景下的最差对比度 (相对目标)
+            worst = [min(abs(float(value)) for value in row) / targets[text] for row in matrix]
+            passing = [i for i, ratio in enumerate(worst) if ratio >= 1]
+            best = passing[0] if passing else max(range(n), key=worst.__getitem__)
+            if candidates[best] != original:
+                modes[index][text] = palette.css_values()[best]
+                changed += 1
+        return changed
+
+    @staticmethod
+    def audit_contrast(theme: Dict[str, Any], model: str = "wcag2") -> List[Dict[str, Any]]:
+        """
+        审查主题中文本色与背景色的对比度
+
+        每个模式的所有文本/背景组合通过一次 contrast_matrix 计算。
+
+        Args:
+            theme: generate() 返回的主题字典
+            model: 对比度模型 ('wcag2' 或 'apca')
+
+        Returns:
+            审查记录列表 (mode, text, background, value, target, passed)
+        """
+        targets = ThemeGenerator.TEXT_CONTRAST_TARGETS[model]
+        records = []
+        for mode, tokens in theme.items():
+            texts = [name for name in targets if name in tokens]
+            backgrounds = [name for name in ThemeGenerator.BACKGROUND_TOKENS if name in tokens]
+            matrix = ColorUtils.contrast_matrix(
+                [tokens[name] for name in texts],
+                [tokens[name] for name in backgrounds],
+                model
+            )
+            for i, text in enumerate(texts):
+                for j, background in enumerate(backgrounds):
+                    value = float(matrix[i][j])
+                    records.append({
+                        "mode": mode,
+                        "text": text,
+                        "background": background,
+                        "value": value,
+                        "target": targets[text],
+                        "passed": abs(value) >= targets[text],
+                    })
+        return records
 
     def to_css(self, theme: Dict[str, Any], name: str = "theme") -> str:
         """
@@ -305,6 +514,14 @@ def main():
     parser.add_argument('--format', '-f', choices=['css', 'json', 'scss'], default='css', help='输出格式')
     parser.add_argument('--output', '-o', type=Path, help='输出文件路径')
     parser.add_argument('--no-dark', action='store_true', help='不生成暗色主题')
+    parser.add_argument('--gamut', choices=['srgb', 'p3', 'none'], default='srgb',
+                        help='派生色的目标色域 (默认: srgb, none表示不映射)')
+    parser.add_argument('--contrast-model', choices=['wcag2', 'apca'],
+                        help='按指定模型审查文本/背景对比度 (结果输出到stderr)')
+    parser.add_argument('--token', action='append', default=[], metavar='NAME=VALUE',
+                        help='追加或覆盖Token, 值可为 {其他Token} 引用 (可重复)')
+    parser.add_argument('--fix-contrast', action='store_true',
+                        help='自动调整次要文本色亮度以满足对比度目标 (模型同 --contrast-model, 默认wcag2)')
 
     args = parser.parse_args()
 
@@ -322,12 +539,38 @@ def main():
             secondary_color=args.secondary,
             name=args.name,
             include_dark=not args.no_dark,
-            output_format=args.format
+            output_format=args.format,
+            gamut=args.gamut
         )
+    if args.fix_contrast:
+        config.fix_contrast = args.contrast_model or 'wcag2'
+
+    for item in args.token:
+        name, sep, value = item.partition('=')
+        if not sep or not name:
+            print(f"❌ 错误: --token 格式应为 NAME=VALUE: {item}", file=sys.stderr)
+            return 1
+        config.overrides[name.strip()] = value.strip()
 
     # 生成主题
     generator = ThemeGenerator()
-    theme = generator.generate(config)
+    try:
+        theme = generator.generate(config)
+    except ValueError as e:
+        print(f"❌ 错误: {e}", file=sys.stderr)
+        return 1
+
+    # 对比度审查 (自动修正后同样审查, 报告无法同时满足所有背景的组合)
+    audit_model = args.contrast_model or config.fix_contrast
+    if audit_model:
+        records = generator.audit_contrast(theme, audit_model)
+        unit = "Lc " if audit_model == 'apca' else ""
+        failed = [r for r in records if not r["passed"]]
+        for r in failed:
+            print(f"⚠️  对比度不足 [{r['mode']}] {r['text']} / {r['background']}: "
+                  f"{unit}{r['value']:.2f} (要求 {r['target']})", file=sys.stderr)
+        print(f"🔍 对比度审查 ({audit_model}): "
+              f"{len(records) - len(failed)}/{len(records)} 通过", file=sys.stderr)
 
     # 输出
     if args.format == 'css':
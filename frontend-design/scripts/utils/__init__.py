@@ -1,7 +1,8 @@
 # 共享工具模块
 
-from .color import ColorUtils
+from .color import ColorUtils, ColorPalette
 from .token import TokenValidator
-from .reporter import Reporter
+from .spatial import ColorIndex
+from .reporter import Reporter, BaseStreamReporter, StreamReporter
 
-__all__ = ['ColorUtils', 'TokenValidator', 'Reporter']
+__all__ = ['ColorUtils', 'ColorPalette', 'ColorIndex', 'TokenValidator', 'Reporter', 'BaseStreamReporter', 'StreamReporter']
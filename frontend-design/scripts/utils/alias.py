@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Token引用解析模块
+
+Token值可以整体引用另一个Token ("{color-primary}" 或 DTCG 的
+"{color.primary}")。AliasGraph 在引用图上做一次迭代深度优先遍历,
+得到拓扑顺序、每个Token的最终值, 以及悬空引用和循环引用;
+每个Token只访问一次, 复杂度与Token数量成线性。
+"""
+
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# 整体引用: {名称} (名称中的 . 视为分组分隔符)
+ALIAS_PATTERN = re.compile(r'^\{([^{}\s]+)\}$')
+
+# 遍历状态
+_VISITING = 1
+_DONE = 2
+
+
+def alias_target(value: Any) -> Optional[str]:
+    """
+    解析引用值指向的规范Token名称
+
+    Args:
+        value: Token值
+
+    Returns:
+        被引用的Token名称 (如 "{color.primary}" -> "color-primary"), 不是引用时为None
+    """
+    if not isinstance(value, str) or not value.startswith('{'):
+        return None
+    match = ALIAS_PATTERN.match(value)
+    return match.group(1).replace('.', '-') if match else None
+
+
+class AliasGraph:
+    """Token引用图"""
+
+    __slots__ = ('values', 'targets', 'resolved', 'order', 'dangling', 'cycles')
+
+    def __init__(self, values: Mapping[str, Any]):
+        """
+        构建引用图并一次性解析所有Token
+
+        Args:
+            values: 规范名称 -> 原始值 (如 TokenValidator.iter_tokens 的结果)
+        """
+        self.values = values
+        self.targets: Dict[str, str] = {}
+        for name, value in values.items():
+            if isinstance(value, str) and value[:1] == '{':
+                target = alias_target(value)
+                if target is not None:
+                    self.targets[name] = target
+
+        # 引用Token及其引用链上字面值Token的最终值, 按拓扑顺序 (被引用者在前) 记录
+        self.resolved: Dict[str, Any] = {}
+        self.order: List[str] = []
+        # (引用者, 不存在的目标)
+        self.dangling: List[Tuple[str, str]] = []
+        # 每个环按引用方向列出成员
+        self.cycles: List[List[str]] = []
+        self._resolve()
+
+    def _resolve(self) -> None:
+        values, targets, resolved = self.values, self.targets, self.resolved
+        state: Dict[str, int] = {}
+
+        # 只从引用Token出发; 字面值Token在被引用时才访问
+        for start in targets:
+            if start in state:
+                continue
+            stack = [start]
+            while stack:
+                name = stack[-1]
+                if state.get(name) == _DONE:
+                    stack.pop()
+                    continue
+                target = targets.get(name)
+
+                if target is None:
+                    # 字面值
+                    resolved[name] = values[name]
+                elif target not in values:
+                    self.dangling.append((name, target))
+                elif state.get(target) == _DONE:
+                    # 目标已处理; 目标不可解析 (悬空/成环) 时本Token也不可解析
+                    if target in resolved:
+                        resolved[name] = resolved[target]
+                elif target == name or state.get(target) == _VISITING:
+                    cycle = stack[stack.index(target):]
+                    self.cycles.append(cycle)
+                    for member in cycle:
+                        state[member] = _DONE
+                    continue
+                else:
+                    state[name] = _VISITING
+                    stack.append(target)
+                    continue
+
+                state[name] = _DONE
+                if name in resolved:
+                    self.order.append(name)
+                stack.pop()
+
+    def resolve(self, name: str) -> Any:
+        """
+        返回Token的最终值
+
+        Args:
+            name: Token名称
+
+        Returns:
+            最终值 (引用已解析并缓存, 字面值原样返回)
+
+        Raises:
+            KeyError: Token不存在, 或其引用链悬空/成环
+        """
+        if name in self.resolved:
+            return self.resolved[name]
+        if name in self.targets:
+            raise KeyError(name)
+        return self.values[name]
+
+    @property
+    def is_valid(self) -> bool:
+        """所有引用都可解析"""
+        return not self.dangling and not self.cycles and all(
+            name in self.resolved for name in self.targets
+        )
+
+    def unresolved(self) -> List[str]:
+        """因悬空或循环引用而无法解析的引用Token (按原顺序)"""
+        return [name for name in self.targets if name not in self.resolved]
+
+    def describe_cycle(self, cycle: List[str]) -> str:
+        """格式化循环引用, 如 a → b → a"""
+        return " → ".join(cycle + cycle[:1])
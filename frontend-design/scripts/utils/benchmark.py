@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试工具模块
+
+提供计时、基线文件读写和吞吐量回归比较, 供 benchmark/ 下的脚本共用。
+"""
+
+import sys
+import json
+import time
+import platform
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+from dataclasses import dataclass
+
+# 基线文件格式版本
+BASELINE_VERSION = 1
+
+# 默认允许的吞吐量下降比例
+DEFAULT_TOLERANCE = 0.25
+
+
+@dataclass
+class BenchmarkResult:
+    """单个基准用例的结果"""
+    name: str
+    size: int
+    seconds: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.size}"
+
+    @property
+    def throughput(self) -> float:
+        """每秒处理的颜色数"""
+        return self.size / self.seconds if self.seconds > 0 else float('inf')
+
+
+@dataclass
+class Regression:
+    """吞吐量回归记录"""
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float('inf')
+
+
+def measure(func: Callable[[], Any], repeat: int = 3,
+            setup: Optional[Callable[[], Any]] = None) -> float:
+    """
+    多轮计时, 返回最快一轮的耗时
+
+    Args:
+        func: 被测函数 (无参数)
+        repeat: 轮数
+        setup: 每轮开始前执行、不计入耗时的准备函数 (如清空缓存)
+
+    Returns:
+        最快一轮的耗时 (秒)
+    """
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def load_baseline(path: Path) -> Dict[str, float]:
+    """
+    读取基线文件
+
+    Args:
+        path: 基线JSON路径
+
+    Returns:
+        用例键 ("名称@规模") -> 吞吐量
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != BASELINE_VERSION:
+        raise ValueError(f"不支持的基线版本: {data.get('version')}")
+    return {key: entry['throughput'] for key, entry in data['results'].items()}
+
+
+def save_baseline(path: Path, results: List[BenchmarkResult]) -> None:
+    """
+    写入基线文件 (含运行环境信息)
+
+    Args:
+        path: 基线JSON路径
+        results: 基准结果列表
+    """
+    data = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': _numpy_version(),
+        'results': {
+            r.key: {'seconds': r.seconds, 'throughput': r.throughput}
+            for r in results
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def find_regressions(results: List[BenchmarkResult], baseline: Dict[str, float],
+                     tolerance: float = DEFAULT_TOLERANCE) -> List[Regression]:
+    """
+    找出吞吐量低于基线 (1 - tolerance) 倍的用例
+
+    基线中不存在的用例不参与比较。
+
+    Args:
+        results: 本次结果
+        baseline: load_baseline 的返回值
+        tolerance: 允许的下降比例 (0.25 表示最多慢25%)
+
+    Returns:
+        回归列表
+    """
+    regressions = []
+    for r in results:
+        expected = baseline.get(r.key)
+        if expected is not None and r.throughput < expected * (1 - tolerance):
+            regressions.append(Regression(r.key, expected, r.throughput))
+    return regressions
+
+
+def _numpy_version() -> Optional[str]:
+    numpy = sys.modules.get('numpy')
+    return getattr(numpy, '__version__', None)
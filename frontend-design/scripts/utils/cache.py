@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+增量验证缓存模块
+
+按Token内容 (名称、类型、值) 缓存逐Token检查的结果, 缓存文件同时记录
+规则集指纹; 规则变化后旧缓存自动失效。跨Token的检查 (缺失类别、引用、
+近似重复等) 不缓存, 每次都重新计算。
+"""
+
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 缓存文件格式版本
+CACHE_VERSION = 4
+
+# 本次未用到的条目最多保留的运行次数 (按保存次数计)
+MAX_IDLE_RUNS = 30
+
+# 缓存文件最多保存的条目数 (超出时先丢弃闲置最久的条目)
+MAX_ENTRIES = 200_000
+
+# 缓存的问题: (规则名称, 级别, 描述模板, 建议模板, 模板参数)
+CachedIssue = Tuple[str, str, str, Optional[str], Sequence[Any]]
+
+
+def user_cache_dir() -> Path:
+    """
+    用户缓存目录
+
+    Returns:
+        Windows 为 %LOCALAPPDATA%, macOS 为 ~/Library/Caches, 其他系统为
+        $XDG_CACHE_HOME 或 ~/.cache, 下设 frontend-design 子目录
+    """
+    if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+        base = Path(os.environ['LOCALAPPDATA'])
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    return base / 'frontend-design'
+
+
+def default_cache_path(project: Optional[Path] = None) -> Path:
+    """
+    默认缓存文件: 用户缓存目录下按项目目录区分, 不在项目中留下文件
+
+    Args:
+        project: 项目目录 (None 表示当前目录)
+
+    Returns:
+        缓存文件路径
+    """
+    project = Path(project if project is not None else Path.cwd()).resolve()
+    digest = hashlib.sha1(str(project).encode('utf-8')).hexdigest()[:16]
+    return user_cache_dir() / f'check-tokens-{digest}.json'
+
+
+class ValidationCache:
+    """
+    逐Token验证结果缓存
+
+    键直接由名称、类型和值的repr拼接 (字符串 "1" 与数字 1 不同键), 不会发生
+    哈希碰撞; 对象值键顺序变化只会导致一次未命中。
+    同一项目目录下交替验证不同文件时共用一个缓存文件: 保存时保留本次未用到
+    的条目, 记录其闲置的运行次数, 超过 MAX_IDLE_RUNS 次的丢弃; 总条目数
+    超过 MAX_ENTRIES 时先丢弃闲置最久的条目。
+    """
+
+    __slots__ = ('path', 'fingerprint', 'entries', 'idle', 'used', 'hits', 'misses')
+
+    def __init__(self, path: Optional[Path], fingerprint: str):
+        """
+        加载缓存文件; 文件不存在、损坏、结构不对或规则集指纹不同时从空缓存开始
+
+        Args:
+            path: 缓存文件路径 (None 表示只在内存中复用, 不读也不写文件)
+            fingerprint: 规则集指纹 (TokenValidator.ruleset_fingerprint())
+        """
+        self.path = Path(path) if path is not None else None
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, List[CachedIssue]] = {}
+        # 条目已连续未用到的运行次数 (缺省为0)
+        self.idle: Dict[str, int] = {}
+        self.used: Dict[str, List[CachedIssue]] = {}
+        self.hits = 0
+        self.misses = 0
+
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        entries = data.get('entries')
+        if data.get('version') == CACHE_VERSION and data.get('fingerprint') == fingerprint \
+                and isinstance(entries, dict):
+            self.entries = entries
+            idle = data.get('idle')
+            if isinstance(idle, dict):
+                self.idle = idle
+
+    @staticmethod
+    def key(token_name: str, token_value: Any, token_type: Optional[str]) -> str:
+        """Token内容键"""
+        return f"{token_name}\0{token_type or ''}\0{token_value!r}"
+
+    def get(self, key: str) -> Optional[List[CachedIssue]]:
+        """
+        查询缓存 (命中时记为本次使用)
+
+        本次已检查过的内容也会命中, 同一次运行中多个Token集合 (如各品牌×模式
+        组合) 共享的Token只检查一次。
+
+        Args:
+            key: ValidationCache.key() 的返回值
+
+        Returns:
+            缓存的问题列表, 未命中时为None
+        """
+        issues = self.used.get(key)
+        if issues is not None:
+            self.hits += 1
+            return issues
+        issues = self.entries.get(key)
+        if issues is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used[key] = issues
+        return issues
+
+    def put(self, key: str, issues: List[CachedIssue]) -> None:
+        """记录一个Token的检查结果"""
+        self.used[key] = issues
+
+    def merge(self, used: Dict[str, List[CachedIssue]], hits: int, misses: int) -> None:
+        """
+        合并另一个进程中同一缓存的使用记录 (多进程验证时由主进程汇总后保存)
+
+        Args:
+            used: 对方本次用到的条目
+            hits: 对方的命中数
+            misses: 对方的未命中数
+        """
+        self.used.update(used)
+        self.hits += hits
+        self.misses += misses
+
+    @property
+    def dirty(self) -> bool:
+        """本次有新增条目, 或有旧条目未用到 (缓存文件需要重写)"""
+        return self.misses > 0 or len(self.used) != len(self.entries)
+
+    def save(self) -> None:
+        """
+        原子写回缓存 (内容未变或只在内存中使用时跳过)
+
+        本次用到的条目全部写回; 未用到的条目闲置次数加一, 在 MAX_IDLE_RUNS
+        和 MAX_ENTRIES 的限制内按闲置次数从少到多保留。
+        """
+        if self.path is None or not self.dirty:
+            return
+        used = self.used
+        stale = []
+        for key in self.entries:
+            if key not in used:
+                runs = self.idle.get(key, 0)
+                runs = runs + 1 if isinstance(runs, int) else MAX_IDLE_RUNS + 1
+                if runs <= MAX_IDLE_RUNS:
+                    stale.append((runs, key))
+        stale.sort(key=lambda item: item[0])
+        del stale[max(MAX_ENTRIES - len(used), 0):]
+
+        entries = dict(used)
+        idle = {}
+        for runs, key in stale:
+            entries[key] = self.entries[key]
+            idle[key] = runs
+        data = {
+            'version': CACHE_VERSION,
+            'fingerprint': self.fingerprint,
+            'entries': entries,
+            'idle': idle,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        # json.dumps 走C编码器, 比 json.dump 逐块写文件快得多
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, self.path)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+色觉缺陷 (CVD) 模拟模块
+
+用 Machado et al. (2009) 严重度 1.0 矩阵在线性sRGB中模拟红色盲、绿色盲、
+蓝色盲, 并在OKLab空间中找出模拟后难以区分 (ΔE_OK 低于阈值) 的颜色对。
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple, Callable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖, 缺失时逐个计算
+    np = None
+
+from .color import ColorUtils, ColorPalette, LINEAR_SRGB_TO_LMS, LMS_TO_OKLAB, _lab_to_lch
+from .spatial import ColorIndex
+
+# Machado, Oliveira & Fernandes (2009), 严重度 1.0, 作用于线性sRGB
+CVD_MATRICES = {
+    'protanopia': (
+        (0.152286, 1.052583, -0.204868),
+        (0.114503, 0.786281, 0.099216),
+        (-0.003882, -0.048116, 1.051998),
+    ),
+    'deuteranopia': (
+        (0.367322, 0.860646, -0.227968),
+        (0.280085, 0.672501, 0.047413),
+        (-0.011820, 0.042940, 0.968881),
+    ),
+    'tritanopia': (
+        (1.255528, -0.076749, -0.178779),
+        (-0.078411, 0.930809, 0.147602),
+        (0.004733, 0.691367, 0.303900),
+    ),
+}
+
+CVD_TYPES = tuple(CVD_MATRICES)
+
+CVD_NAMES = {
+    'normal': '正常视觉',
+    'protanopia': '红色盲',
+    'deuteranopia': '绿色盲',
+    'tritanopia': '蓝色盲',
+}
+
+# 语义状态色需要保持的最小 ΔE_OK (约为两个可察觉差异)
+CVD_MIN_DELTA_E = 0.04
+
+
+class CVDUtils:
+    """色觉缺陷模拟工具类"""
+
+    @staticmethod
+    def simulate_oklab(palette: ColorPalette, deficiency: str = 'normal'):
+        """
+        模拟色觉缺陷下看到的颜色, 返回OKLab坐标
+
+        颜色先裁剪到sRGB色域, 在线性sRGB中应用缺陷矩阵后转回OKLab。
+
+        Args:
+            palette: 调色板
+            deficiency: 'normal' 或 CVD_TYPES 之一
+
+        Returns:
+            NumPy可用时为 (n, 3) 数组, 否则为 (L, a, b) 元组列表; 无效颜色为NaN
+        """
+        matrix = CVD_MATRICES.get(deficiency)
+        if deficiency != 'normal' and matrix is None:
+            raise ValueError(f"不支持的色觉缺陷类型: {deficiency}")
+
+        if np is not None:
+            l, c, h = palette.arrays()
+            rgb = np.clip(ColorUtils.linear_rgb_array(l, c, h), 0.0, 1.0)
+            if matrix is not None:
+                rgb = np.clip(np.tensordot(np.asarray(matrix), rgb, axes=1), 0.0, 1.0)
+            lms = np.cbrt(np.tensordot(np.asarray(LINEAR_SRGB_TO_LMS), rgb, axes=1))
+            return np.tensordot(np.asarray(LMS_TO_OKLAB), lms, axes=1).T
+
+        nan = (math.nan, math.nan, math.nan)
+        result = []
+        for l, c, h in zip(palette.l, palette.c, palette.h):
+            if math.isnan(l) or math.isnan(c) or math.isnan(h):
+                result.append(nan)
+                continue
+            rgb = [min(max(v, 0.0), 1.0) for v in ColorUtils.oklch_to_linear_srgb(l, c, h)]
+            if matrix is not None:
+                rgb = [
+                    min(max(row[0] * rgb[0] + row[1] * rgb[1] + row[2] * rgb[2], 0.0), 1.0)
+                    for row in matrix
+                ]
+            lms = [
+                (row[0] * rgb[0] + row[1] * rgb[1] + row[2] * rgb[2]) ** (1 / 3)
+                for row in LINEAR_SRGB_TO_LMS
+            ]
+            result.append(tuple(
+                row[0] * lms[0] + row[1] * lms[1] + row[2] * lms[2]
+                for row in LMS_TO_OKLAB
+            ))
+        return result
+
+    @staticmethod
+    def simulate(palette: ColorPalette, deficiency: str) -> ColorPalette:
+        """
+        模拟色觉缺陷, 返回同名的OKLCH调色板
+
+        Args:
+            palette: 调色板
+            deficiency: 'normal' 或 CVD_TYPES 之一
+
+        Returns:
+            模拟后的调色板 (透明度不变)
+        """
+        lch = [
+            (math.nan, math.nan, math.nan) if math.isnan(lab[0])
+            else _lab_to_lch(float(lab[0]), float(lab[1]), float(lab[2]))
+            for lab in CVDUtils.simulate_oklab(palette, deficiency)
+        ]
+        return ColorPalette(
+            palette.names,
+            [v[0] for v in lch], [v[1] for v in lch], [v[2] for v in lch],
+            palette.alpha
+        )
+
+    @staticmethod
+    def confusable_pairs(palette: ColorPalette,
+                         threshold: float = CVD_MIN_DELTA_E,
+                         deficiencies: Sequence[str] = CVD_TYPES,
+                         pair_filter: Optional[Callable[[int, int], bool]] = None
+                         ) -> List[Tuple[str, int, int, float, float]]:
+        """
+        找出正常视觉下可区分、色觉缺陷下 ΔE_OK 低于阈值的颜色对
+
+        模拟结果建立 ColorIndex 网格索引, 只比较相邻格子,
+        数千个颜色时仍为近线性复杂度。
+
+        Args:
+            palette: 调色板
+            threshold: ΔE_OK 阈值
+            deficiencies: 要检查的色觉缺陷类型
+            pair_filter: 可选过滤函数 (i, j) -> 是否需要区分
+
+        Returns:
+            (缺陷类型, i, j, 正常视觉ΔE, 模拟ΔE) 列表
+        """
+        normal = ColorIndex(palette, threshold).lab
+        result = []
+        for deficiency in deficiencies:
+            simulated = CVDUtils.simulate(palette, deficiency)
+            for i, j, distance in ColorIndex(simulated, threshold).pairs():
+                if pair_filter is not None and not pair_filter(i, j):
+                    continue
+                original = math.dist(normal[i], normal[j])
+                if original >= threshold:
+                    result.append((deficiency, i, j, original, distance))
+        return result
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Token名称模糊匹配模块
+
+为拼错的Token名称 ("color-primray"、"spacing-meduim") 找出编辑距离最近的
+已知名称。NameIndex 按鸽巢原理建立分段索引 (Pass-Join 的变体): 名称切成
+k+2 段, 每次编辑最多破坏一段, 所以与它编辑距离不超过 k 的字符串至少原样
+包含其中两段, 且位置偏移不超过 k。查询时在查询串中取出这些位置的子串查表,
+按段求并集后两两求交 (都在C层完成), 只有至少两段命中的名称才用位并行的
+编辑距离验证。Token名称大多共享 color-、spacing- 等前缀, 单段命中的候选
+成千上万, 要求两段命中后通常只剩几个。构建只需一遍遍历。
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 默认最大编辑距离
+MAX_DISTANCE = 2
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """
+    Levenshtein 编辑距离
+
+    先去掉公共前缀和后缀 (不影响距离; 拼写错误通常只在名称中间),
+    剩余部分用 Myers/Hyyrö 位并行算法逐字符更新一个整数位向量。
+
+    Args:
+        a: 字符串
+        b: 字符串
+        limit: 距离上限; 确定超过时提前返回 limit + 1
+
+    Returns:
+        插入、删除、替换的最少次数 (超过 limit 时为 limit + 1)
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_b and a[start] == b[start]:
+        start += 1
+    while end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a = a[start:end_a]
+    b = b[start:end_b]
+    m = len(b)
+    if not m:
+        return len(a) if limit is None else min(len(a), limit + 1)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(b):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    remaining = len(a)
+    for ch in a:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        remaining -= 1
+        # 剩余每个字符最多让距离减 1
+        if limit is not None and score - remaining > limit:
+            return limit + 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
+def suggestion_distance(word: str) -> int:
+    """建议拼写时允许的编辑距离: 短名称只允许一处错误"""
+    return 1 if len(word) <= 4 else MAX_DISTANCE
+
+
+def _segments(length: int, parts: int) -> List[Tuple[int, int]]:
+    """把长度切成 parts 段, 较长的段在后; 返回 (起点, 段长) 列表"""
+    base, extra = divmod(length, parts)
+    result = []
+    start = 0
+    for i in range(parts):
+        size = base + (1 if i >= parts - extra else 0)
+        result.append((start, size))
+        start += size
+    return result
+
+
+class NameIndex:
+    """
+    编辑距离索引
+
+    名称按 (长度, 段序号, 段内容) 入表; 长度小于段数的名称无法分段,
+    单独存放并在查询时逐个比较。
+    """
+
+    __slots__ = ('names', 'max_distance', '_order', '_segments', '_short')
+
+    def __init__(self, names: Iterable[str] = (), max_distance: int = MAX_DISTANCE):
+        """
+        Args:
+            names: 已知名称
+            max_distance: 支持查询的最大编辑距离
+        """
+        self.names: List[str] = []
+        self.max_distance = max_distance
+        self._order: Dict[str, int] = {}
+        self._segments: Dict[Tuple[int, int, str], List[str]] = {}
+        self._short: List[str] = []
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        """加入一个名称 (重复加入被忽略)"""
+        if name in self._order:
+            return
+        self._order[name] = len(self.names)
+        self.names.append(name)
+        length = len(name)
+        parts = self.max_distance + 2
+        if length < parts:
+            self._short.append(name)
+            return
+        for i, (start, size) in enumerate(_segments(length, parts)):
+            self._segments.setdefault((length, i, name[start:start + size]), []).append(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._order
+
+    def search(self, word: str, max_distance: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        编辑距离不超过 max_distance 的所有名称
+
+        Args:
+            word: 查询字符串
+            max_distance: 最大编辑距离 (默认且不能超过构建时的 max_distance)
+
+        Returns:
+            (编辑距离, 名称) 列表, 按距离升序, 距离相同时按加入顺序
+        """
+        k = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        parts = self.max_distance + 2
+        segments = self._segments
+        size = len(word)
+        candidates = set(name for name in self._short if abs(len(name) - size) <= k)
+        # 段序号 -> 该段命中的名称 (所有长度合并; 不同长度的名称互不相交)
+        matched: List[set] = [set() for _ in range(parts)]
+        for length in range(max(parts, size - k), size + k + 1):
+            for i, (start, seg_size) in enumerate(_segments(length, parts)):
+                # 段在查询串中的起点最多偏移 k
+                for pos in range(max(0, start - k), min(size - seg_size, start + k) + 1):
+                    found = segments.get((length, i, word[pos:pos + seg_size]))
+                    if found:
+                        matched[i].update(found)
+        for i in range(parts):
+            if matched[i]:
+                for j in range(i + 1, parts):
+                    candidates |= matched[i] & matched[j]
+
+        order = self._order
+        result = []
+        for name in candidates:
+            distance = edit_distance(word, name, k)
+            if distance <= k:
+                result.append((distance, name))
+        result.sort(key=lambda item: (item[0], order[item[1]]))
+        return result
+
+    def closest(self, word: str, max_distance: Optional[int] = None) -> Optional[str]:
+        """
+        最接近的名称 (不含 word 本身)
+
+        Args:
+            word: 查询字符串
+            max_distance: 最大编辑距离 (默认按长度取 suggestion_distance)
+
+        Returns:
+            名称, 范围内没有时为None
+        """
+        if max_distance is None:
+            max_distance = suggestion_distance(word)
+        for distance, name in self.search(word, max_distance):
+            if name != word:
+                return name
+        return None
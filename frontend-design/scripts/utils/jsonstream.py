@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+增量JSON读取模块
+
+按块读取顶层为对象的JSON文件, 逐个产出 (键, 值)。在当前缓冲区内能完整解码的
+值直接交给标准库 (C实现) 解码器; 跨越缓冲区末尾的对象不再在每次读入新块后从头
+重新解码, 而是作为 ObjectStream 逐个成员读取。因此读取时间与文件大小成线性,
+惰性模式下内存占用只与读取块和单个叶子值的大小有关, 与嵌套分组的大小无关。
+"""
+
+import json
+from json.decoder import WHITESPACE
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+
+# 默认每次读取的字符数
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# 合法JSON中值之后可能出现的字符
+_DELIMITERS = frozenset(' \t\n\r,:]}')
+
+
+class ObjectStream:
+    """
+    尚未读完的JSON对象, 迭代时按文件顺序产出 (键, 值) 成员
+
+    成员的值同样可能是 ObjectStream。同一文件的所有 ObjectStream 共享一个
+    读取器, 必须按文件顺序消费: 继续读取外层对象时, 内层未读完的成员被跳过。
+    """
+
+    __slots__ = ('_reader', '_first', 'done')
+
+    def __init__(self, reader: '_MemberReader'):
+        self._reader = reader
+        self._first = True
+        self.done = False
+
+    def __iter__(self) -> 'ObjectStream':
+        return self
+
+    def __next__(self) -> Tuple[str, Any]:
+        return self._reader.next_member(self)
+
+    def materialize(self) -> Dict[str, Any]:
+        """读取剩余成员并构建字典 (嵌套的 ObjectStream 一并展开)"""
+        return {key: materialize(value) for key, value in self}
+
+
+def materialize(value: Any) -> Any:
+    """把 ObjectStream 展开为字典, 其他值原样返回"""
+    return value.materialize() if isinstance(value, ObjectStream) else value
+
+
+class _MemberReader:
+    """顶层对象成员的增量读取器"""
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        # 尚未读完的对象, 由外到内
+        self.open: List[ObjectStream] = []
+        # 已丢弃文本的字符数/行数/末行列数, 用于报告绝对错误位置
+        self.dropped_chars = 0
+        self.dropped_lines = 0
+        self.dropped_col = 0
+
+    def fill(self, size: int = 0) -> bool:
+        """丢弃已消费的文本并读入下一块 (默认 chunk_size 个字符), 到达文件末尾时返回False"""
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        consumed = self.buffer[:self.pos]
+        newlines = consumed.count('\n')
+        if newlines:
+            self.dropped_lines += newlines
+            self.dropped_col = len(consumed) - consumed.rfind('\n') - 1
+        else:
+            self.dropped_col += len(consumed)
+        self.dropped_chars += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """跳过空白, 返回下一个字符 (文件结束时为空串)"""
+        while True:
+            pos = WHITESPACE.match(self.buffer, self.pos).end()
+            self.pos = pos
+            if pos < len(self.buffer):
+                return self.buffer[pos]
+            if not self.fill():
+                return ''
+
+    def decode(self) -> Any:
+        """从当前位置解码一个完整的JSON值"""
+        # 值跨越缓冲区末尾时按几何级数读入更多, 重新解码的总量与值的大小成线性
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof or not self.fill(size):
+                    raise self.error(e.msg, e.pos)
+                size *= 2
+                continue
+            # 值后面不是分隔符时可能被截断 (如数字 "1." 或 "12" 在块边界),
+            # 需读入更多再确认
+            if (end < len(self.buffer) and self.buffer[end] in _DELIMITERS) \
+                    or self.eof or not self.fill(size):
+                self.pos = end
+                return value
+            size *= 2
+
+    def value(self) -> Any:
+        """读取当前位置的值 (调用前已 peek); 在缓冲区内没有结束的对象返回 ObjectStream"""
+        if self.buffer[self.pos] != '{' or self.eof:
+            return self.decode()
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+        except json.JSONDecodeError:
+            # 对象被缓冲区截断 (语法错误在逐成员读取时定位)
+            self.pos += 1
+            stream = ObjectStream(self)
+            self.open.append(stream)
+            return stream
+        self.pos = end
+        return value
+
+    def next_member(self, stream: ObjectStream) -> Tuple[str, Any]:
+        """读取 stream 的下一个成员, 读完时抛出 StopIteration"""
+        if stream.done:
+            raise StopIteration
+        # 跳过内层未读完的对象
+        while self.open[-1] is not stream:
+            for _ in self.open[-1]:
+                pass
+        char = self.peek()
+        if stream._first:
+            stream._first = False
+            if char == '}':
+                self.close(stream)
+        elif char == ',':
+            self.pos += 1
+            char = self.peek()
+        elif char == '}':
+            self.close(stream)
+        else:
+            raise self.error("Expecting ',' delimiter", self.pos)
+        if char != '"':
+            raise self.error("Expecting property name enclosed in double quotes", self.pos)
+        key = self.decode()
+        if self.peek() != ':':
+            raise self.error("Expecting ':' delimiter", self.pos)
+        self.pos += 1
+        if not self.peek():
+            raise self.error("Expecting value", self.pos)
+        return key, self.value()
+
+    def close(self, stream: ObjectStream) -> None:
+        """消费对象的右括号并结束迭代"""
+        self.pos += 1
+        stream.done = True
+        self.open.pop()
+        raise StopIteration
+
+    def error(self, msg: str, pos: int) -> json.JSONDecodeError:
+        """构造带文件内绝对位置的解析错误"""
+        err = json.JSONDecodeError(msg, self.buffer, pos)
+        err.pos = self.dropped_chars + pos
+        if err.lineno == 1:
+            err.colno += self.dropped_col
+        err.lineno += self.dropped_lines
+        err.args = (f"{msg}: line {err.lineno} column {err.colno} (char {err.pos})",)
+        return err
+
+    def members(self) -> Iterator[Tuple[str, Any]]:
+        if self.peek() != '{':
+            raise self.error("Expecting '{'", self.pos)
+        self.pos += 1
+        root = ObjectStream(self)
+        self.open.append(root)
+        yield from root
+        if self.peek():
+            raise self.error("Extra data", self.pos)
+
+
+def iter_json_members(fp: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      lazy: bool = False) -> Iterator[Tuple[str, Any]]:
+    """
+    增量读取顶层JSON对象, 按文件顺序产出 (键, 值)
+
+    重复的键会各产出一次。语法错误抛出 json.JSONDecodeError, 位置为文件内的
+    绝对行列。
+
+    Args:
+        fp: 文本文件对象
+        chunk_size: 每次读取的字符数
+        lazy: False 时每个值完整解码后产出; True 时跨越读取块的对象值以
+            ObjectStream 产出, 必须在读取下一个成员之前按顺序消费
+            (TokenValidator.iter_tokens 可直接处理)
+
+    Returns:
+        (键, 值) 迭代器
+    """
+    members = _MemberReader(fp, chunk_size).members()
+    if lazy:
+        return members
+    return ((key, materialize(value)) for key, value in members)
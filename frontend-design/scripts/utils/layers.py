@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+分层Token集合模块
+
+多品牌、多模式的Token通常由一个基础文件加若干覆盖文件组成
+(base → brand → mode)。TokenLayers 像 collections.ChainMap 一样按层
+查找, 不复制也不合并任何一层: 每层只在加载时展开一次 (DTCG嵌套格式转为
+平铺名称), 叠加时预先计算本层新增的名称, 因此长度和迭代顺序无需遍历
+所有层。同一个模式层可以叠加到多个品牌上, 展开结果被共享。
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .token import TokenValidator
+
+
+class TokenLayers(Mapping):
+    """
+    分层Token集合 (只读映射: 规范名称 -> 最上层的值)
+
+    迭代顺序为: 基础层的名称, 然后各层按叠加顺序新增的名称。
+    """
+
+    __slots__ = ('name', 'tokens', 'types', 'parent', '_added', '_size')
+
+    def __init__(self, tokens: Optional[Dict[str, Any]] = None,
+                 parent: Optional['TokenLayers'] = None, name: str = ''):
+        """
+        Args:
+            tokens: 本层的Token字典 (平铺或DTCG嵌套格式)
+            parent: 下层 (None 表示本层是基础层)
+            name: 层名称 (如品牌名、模式名)
+        """
+        infer = TokenValidator.CATEGORY_TYPES.get
+        values: Dict[str, Any] = {}
+        # 只记录与按名称推断的类型不同的 $type
+        types: Dict[str, Optional[str]] = {}
+        for token_name, value, token_type in TokenValidator.iter_tokens(tokens or {}):
+            values[token_name] = value
+            if token_type != infer(token_name.partition('-')[0]):
+                types[token_name] = token_type
+        self._link(values, types, parent, name)
+
+    def _link(self, values: Dict[str, Any], types: Dict[str, Optional[str]],
+              parent: Optional['TokenLayers'], name: str) -> None:
+        self.name = name
+        self.tokens = values
+        self.types = types
+        self.parent = parent
+        # 下层没有的名称 (按本层顺序)
+        self._added: List[str] = list(values) if parent is None else [
+            token_name for token_name in values if token_name not in parent
+        ]
+        self._size = (len(parent) if parent is not None else 0) + len(self._added)
+
+    def overlay(self, layer: Any, name: str = '') -> 'TokenLayers':
+        """
+        在本集合之上叠加一层
+
+        Args:
+            layer: Token字典, 或单层的 TokenLayers (共享其展开结果, 不复制)
+            name: 层名称 (layer 为 TokenLayers 时默认沿用其名称)
+
+        Returns:
+            新的分层集合 (本集合不变)
+        """
+        if not isinstance(layer, TokenLayers):
+            return TokenLayers(layer, self, name)
+        if layer.parent is not None:
+            raise ValueError(f"只能叠加单层的TokenLayers: {layer.label}")
+        node = TokenLayers.__new__(TokenLayers)
+        node._link(layer.tokens, layer.types, self, name or layer.name)
+        return node
+
+    @property
+    def chain(self) -> List['TokenLayers']:
+        """从基础层到本层的各层"""
+        layers = []
+        node = self
+        while node is not None:
+            layers.append(node)
+            node = node.parent
+        layers.reverse()
+        return layers
+
+    @property
+    def label(self) -> str:
+        """各层名称, 如 base/acme/dark (跳过未命名的层)"""
+        return '/'.join(layer.name for layer in self.chain if layer.name)
+
+    def __getitem__(self, token_name: str) -> Any:
+        node = self
+        while node is not None:
+            values = node.tokens
+            if token_name in values:
+                return values[token_name]
+            node = node.parent
+        raise KeyError(token_name)
+
+    def __contains__(self, token_name: object) -> bool:
+        node = self
+        while node is not None:
+            if token_name in node.tokens:
+                return True
+            node = node.parent
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        for layer in self.chain:
+            yield from layer._added
+
+    def __len__(self) -> int:
+        return self._size
+
+    def owner(self, token_name: str) -> 'TokenLayers':
+        """
+        提供该Token有效值的层
+
+        Raises:
+            KeyError: Token不存在
+        """
+        node = self
+        while node is not None:
+            if token_name in node.tokens:
+                return node
+            node = node.parent
+        raise KeyError(token_name)
+
+    def entries(self) -> Iterator[Tuple[str, Any]]:
+        """
+        按迭代顺序产出 (名称, 值) 供 TokenValidator 验证
+
+        声明了 $type 且与名称推断不同的Token, 以及对象值 (否则会被当作分组)
+        产出 {"$value", "$type"} 对象, 使 iter_tokens 得到与原文件相同的值和类型。
+        """
+        for token_name in self:
+            layer = self.owner(token_name)
+            value = layer.tokens[token_name]
+            if token_name in layer.types:
+                yield token_name, {'$value': value, '$type': layer.types[token_name]}
+            elif isinstance(value, dict):
+                yield token_name, {'$value': value}
+            else:
+                yield token_name, value
+
+
+def layer_combinations(base: Any, brands: Optional[Dict[str, Any]] = None,
+                       modes: Optional[Dict[str, Any]] = None
+                       ) -> Iterator[Tuple[str, str, TokenLayers]]:
+    """
+    枚举所有 品牌 × 模式 组合, 不生成合并后的字典
+
+    每个品牌层和模式层只展开一次; 模式层在各品牌间共享。
+
+    Args:
+        base: 基础Token字典或 TokenLayers
+        brands: 品牌名称 -> 覆盖Token (None 或空表示只有基础层)
+        modes: 模式名称 -> 覆盖Token (None 或空表示不区分模式)
+
+    Yields:
+        (品牌名称, 模式名称, 分层集合); 没有品牌/模式时对应名称为空字符串
+    """
+    root = base if isinstance(base, TokenLayers) else TokenLayers(base, name='base')
+    mode_layers = [TokenLayers(tokens, name=mode) for mode, tokens in (modes or {}).items()]
+    for brand, tokens in (brands or {'': None}).items():
+        brand_layer = root.overlay(tokens, brand) if tokens is not None else root
+        if not mode_layers:
+            yield brand, '', brand_layer
+        for mode_layer in mode_layers:
+            yield brand, mode_layer.name, brand_layer.overlay(mode_layer)
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+硬编码值检查模块
+
+TokenValueIndex 是从Token值到Token名称的反向索引: 颜色放进OKLab网格索引
+(ColorIndex) 做最近邻查询, 尺寸 (px/rem) 按类别排序后二分查找。
+LiteralScanner 找出源码中直接写的颜色 (#hex、oklch()/rgb()/hsl() 等) 和
+px/rem 尺寸, 为每个字面量建议最接近的Token; scan_sources 用进程池并行扫描
+大量源文件, 每个工作进程只构建一次索引。
+"""
+
+import os
+import re
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .alias import alias_target
+from .color import ColorUtils, ColorPalette
+from .spatial import ColorIndex
+from .usage import SOURCE_EXTENSIONS, iter_sources
+
+# 建议最接近颜色Token的最大 ΔE_OK (更远的颜色不给出建议)
+NEAREST_DELTA_E = 0.1
+
+# 1rem 对应的像素数
+REM_PX = 16.0
+
+# 文件数少于该值时不启动进程池
+PARALLEL_MIN_FILES = 256
+
+# 颜色字面量 (#hex 或颜色函数) 与 px/rem 尺寸字面量
+_LITERAL = re.compile(
+    r'(?P<color>(?<![\w&/])#[0-9a-fA-F]{3,8}(?![\w-])'
+    r'|\b(?:oklch|oklab|rgba?|hsla?)\([^()]*\))'
+    r'|(?<![\w.#-])(?P<number>\d*\.?\d+)(?P<unit>px|rem)(?![\w-])'
+)
+
+# Token中的尺寸值
+_DIMENSION = re.compile(r'^\s*(-?\d*\.?\d+)(px|rem)\s*$')
+
+# 属性名关键字 -> 建议的尺寸Token类别 (按顺序匹配, 都不匹配时为 spacing)
+_PROPERTY_CATEGORIES = (
+    ('radius', 'radius'),
+    ('font', 'font'),
+    ('line', 'font'),
+    ('letter', 'font'),
+    ('shadow', 'shadow'),
+)
+
+# 向前查找所在声明的最大字符数
+_CONTEXT_CHARS = 200
+
+# 冒号前的属性名 (TSX 中可能带引号)
+_PROPERTY_NAME = re.compile(r'([\w$-]+)[\'"]?\s*\Z')
+
+# 整个文件都是样式表的扩展名; 其他文件 (.vue/.svelte 等) 只有 <style> 块内是样式表
+_STYLESHEET_EXTENSIONS = frozenset({'.css', '.scss', '.sass', '.less'})
+
+# 单文件组件中的 <style> 块内容
+_STYLE_BLOCK = re.compile(r'<style\b[^>]*>(.*?)(?:</style\s*>|\Z)', re.IGNORECASE | re.DOTALL)
+
+# 取颜色值的 HTML/SVG 属性 (fill="#fff"); 其他属性中的 #xxx 多为锚点或ID (href="#abc")
+_COLOR_ATTRIBUTE = re.compile(
+    r'(?<![\w-])(?:fill|stroke|stop-color|flood-color|lighting-color|color|bgcolor)'
+    r'\s*=\s*\{?\s*[\'"`]\s*\Z',
+    re.IGNORECASE
+)
+
+
+def _to_px(number: float, unit: str) -> float:
+    return number * REM_PX if unit == 'rem' else number
+
+
+def _normalize(value: str) -> str:
+    return ' '.join(value.lower().split())
+
+
+class TokenValueIndex:
+    """Token值 -> Token名称的反向索引"""
+
+    __slots__ = ('values', 'palette', 'colors', 'dimensions')
+
+    def __init__(self, entries: Iterable[Tuple[str, Any, Optional[str]]],
+                 color_radius: float = NEAREST_DELTA_E):
+        """
+        Args:
+            entries: (名称, 值, 类型) 序列 (如 TokenValidator.iter_tokens 的结果)
+            color_radius: 颜色最近邻查询半径 ΔE_OK
+        """
+        # 规范化的值 (小写、合并空白) -> Token名称, 按Token顺序
+        self.values: Dict[str, List[str]] = {}
+        colors: Dict[str, str] = {}
+        # 类别 -> [(像素值, 名称)]
+        dimensions: Dict[str, List[Tuple[float, str]]] = {}
+        for name, value, token_type in entries:
+            if not isinstance(value, str) or alias_target(value) is not None:
+                continue
+            self.values.setdefault(_normalize(value), []).append(name)
+            match = _DIMENSION.match(value)
+            if match:
+                px = _to_px(float(match.group(1)), match.group(2))
+                dimensions.setdefault(name.partition('-')[0], []).append((px, name))
+            elif token_type == 'color':
+                colors[name] = value
+
+        self.palette = ColorPalette.from_tokens(colors, prefix='')
+        self.colors = ColorIndex(self.palette, color_radius)
+        # 类别 -> (升序像素值, 对应名称); None 键为全部尺寸Token
+        self.dimensions: Dict[Optional[str], Tuple[List[float], List[str]]] = {}
+        everything = []
+        for category, items in dimensions.items():
+            items.sort(key=lambda item: item[0])
+            self.dimensions[category] = ([px for px, _ in items], [name for _, name in items])
+            everything.extend(items)
+        everything.sort(key=lambda item: item[0])
+        self.dimensions[None] = ([px for px, _ in everything], [name for _, name in everything])
+
+    def lookup(self, value: str) -> List[str]:
+        """
+        值完全相同的Token
+
+        Args:
+            value: CSS值
+
+        Returns:
+            Token名称列表 (按Token顺序)
+        """
+        return self.values.get(_normalize(value), [])
+
+    def nearest_color(self, value: str) -> Optional[Tuple[str, float]]:
+        """
+        最接近的颜色Token
+
+        Args:
+            value: CSS颜色字符串
+
+        Returns:
+            (Token名称, ΔE_OK), 颜色无法解析或查询半径内没有颜色Token时为None
+        """
+        found = self.colors.nearest(value, self.colors.cell)
+        if found is None:
+            return None
+        i, distance = found
+        return self.palette.names[i], distance
+
+    def nearest_dimension(self, px: float, category: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """
+        最接近的尺寸Token
+
+        Args:
+            px: 像素值
+            category: 优先查找的Token类别 (没有该类别的尺寸Token时查找全部)
+
+        Returns:
+            (Token名称, 相差像素), 没有尺寸Token时为None
+        """
+        values, names = self.dimensions.get(category) or self.dimensions[None]
+        if not values:
+            return None
+        i = bisect_left(values, px)
+        # 距离相同时取较小的值
+        if i == len(values) or (i > 0 and px - values[i - 1] <= values[i] - px):
+            i -= 1
+        return names[i], abs(values[i] - px)
+
+
+@dataclass
+class HardcodedLiteral:
+    """源码中的一个硬编码值 (行列号从1开始)"""
+    path: str
+    line: int
+    column: int
+    literal: str
+    kind: str  # 'color' 或 'dimension'
+    token: Optional[str] = None  # 建议的Token, 没有可建议的Token时为None
+    distance: float = 0.0  # 与建议Token的差距: 颜色为 ΔE_OK, 尺寸为像素
+
+
+class LiteralScanner:
+    """
+    硬编码值扫描器
+
+    跳过以下位置的字面量: 自定义属性和Sass变量的定义 (--x: 16px, $x: #fff),
+    var() 的回退值, 以及 @media 等 at-rule。#hex 只在声明 (CSS属性、style
+    对象) 和取颜色值的HTML/SVG属性中识别, href="#abc" 等锚点不算颜色。源码中同一字面量往往反复出现,
+    最近Token的查询结果按 (字面量, 类别) 缓存。
+    """
+
+    __slots__ = ('index', '_nearest')
+
+    def __init__(self, index: TokenValueIndex):
+        """
+        Args:
+            index: Token值反向索引
+        """
+        self.index = index
+        # (字面量, 尺寸类别) -> (类型, 最近Token); 无法解析的颜色为None
+        self._nearest: Dict[Tuple[str, Optional[str]], Optional[Tuple[str, Optional[Tuple[str, float]]]]] = {}
+
+    @staticmethod
+    def _style_spans(text: str, path: str) -> List[Tuple[int, int]]:
+        """样式表部分的 (起点, 终点) 列表, 按位置排序"""
+        if Path(path).suffix.lower() in _STYLESHEET_EXTENSIONS:
+            return [(0, len(text))]
+        if '<style' not in text and '<STYLE' not in text:
+            return []
+        return [match.span(1) for match in _STYLE_BLOCK.finditer(text)]
+
+    @staticmethod
+    def _property(text: str, start: int, stylesheet: bool = False) -> Optional[str]:
+        """
+        字面量所在声明的属性名 (小写)
+
+        Args:
+            text: 源码内容
+            start: 字面量的起点
+            stylesheet: 是否在样式表中 (声明可以跨行, 如多行的 box-shadow)
+
+        Returns:
+            属性名 (不在声明中时为空字符串), 应跳过该字面量时为None
+        """
+        # 声明从最后一个 ; { } 之后开始; 样式表以外还在换行处截断
+        lo = max(0, start - _CONTEXT_CHARS)
+        if not stylesheet:
+            lo = text.rfind('\n', lo, start) + 1 or lo
+        segment = text[lo:start]
+        begin = max(segment.rfind(';'), segment.rfind('{'), segment.rfind('}')) + 1
+        if begin:
+            segment = segment[begin:]
+        if segment.lstrip().startswith('@'):
+            return None
+        if 'var(' in segment and segment.rfind('var(') > segment.rfind(')'):
+            return None
+        colon = segment.rfind(':')
+        if colon < 0:
+            return ''
+        match = _PROPERTY_NAME.search(segment, 0, colon)
+        if match is None:
+            return ''
+        prop = match.group(1).lower()
+        if prop.startswith(('--', '$')):
+            return None
+        return prop
+
+    def scan_text(self, text: str, path: str) -> List[HardcodedLiteral]:
+        """
+        扫描一段源码
+
+        Args:
+            text: 源码内容
+            path: 报告中使用的文件路径
+
+        Returns:
+            按出现顺序排列的硬编码值
+        """
+        index = self.index
+        memo = self._nearest
+        found = []
+        line = 1
+        scanned = 0
+        spans = self._style_spans(text, path)
+        span = 0
+        for match in _LITERAL.finditer(text):
+            start = match.start()
+            while span < len(spans) and spans[span][1] <= start:
+                span += 1
+            stylesheet = span < len(spans) and spans[span][0] <= start
+            prop = self._property(text, start, stylesheet)
+            if prop is None:
+                continue
+
+            literal = match.group('color')
+            if literal:
+                if not prop and literal[0] == '#' \
+                        and not _COLOR_ATTRIBUTE.search(text, max(0, start - _CONTEXT_CHARS), start):
+                    continue
+                key = (literal, None)
+            else:
+                literal = match.group(0)
+                category = 'spacing'
+                for keyword, name in _PROPERTY_CATEGORIES:
+                    if keyword in prop:
+                        category = name
+                        break
+                key = (literal, category)
+            if key in memo:
+                entry = memo[key]
+            elif key[1] is None:
+                entry = memo[key] = (
+                    ('color', index.nearest_color(literal))
+                    if ColorUtils.parse_color(literal) is not None else None
+                )
+            else:
+                number = float(match.group('number'))
+                entry = memo[key] = (
+                    ('dimension', index.nearest_dimension(_to_px(number, match.group('unit')), category))
+                    if number != 0 else None
+                )
+            if entry is None:
+                continue
+            kind, nearest = entry
+
+            # 行号增量计算: 只统计上一个字面量之后的换行
+            line += text.count('\n', scanned, start)
+            scanned = start
+            column = start - text.rfind('\n', 0, start)
+            item = HardcodedLiteral(path, line, column, literal, kind)
+            if nearest is not None:
+                item.token, item.distance = nearest
+            found.append(item)
+        return found
+
+    def scan_file(self, path: Path) -> List[HardcodedLiteral]:
+        """扫描一个源文件 (按UTF-8读取, 无法解码的字节被替换)"""
+        text = Path(path).read_text(encoding='utf-8', errors='replace')
+        return self.scan_text(text, str(path))
+
+
+# 工作进程中的扫描器 (由 _init_worker 构建, 每个进程一次)
+_worker_scanner: Optional[LiteralScanner] = None
+
+
+def _init_worker(entries: Sequence[Tuple[str, Any, Optional[str]]]) -> None:
+    global _worker_scanner
+    _worker_scanner = LiteralScanner(TokenValueIndex(entries))
+
+
+def _scan_in_worker(path: Path) -> List[HardcodedLiteral]:
+    return _worker_scanner.scan_file(path)
+
+
+def scan_sources(entries: Iterable[Tuple[str, Any, Optional[str]]], paths: Iterable[Path],
+                 jobs: int = 0,
+                 extensions: Iterable[str] = SOURCE_EXTENSIONS) -> Tuple[List[HardcodedLiteral], int]:
+    """
+    扫描源文件和目录中的硬编码值
+
+    文件数不少于 PARALLEL_MIN_FILES 且任务进程多于一个时使用进程池;
+    结果顺序与文件顺序一致, 与进程数无关。
+
+    Args:
+        entries: (名称, 值, 类型) 序列 (如 TokenValidator.iter_tokens 的结果)
+        paths: 文件或目录 (目录递归查找, 跳过 node_modules 和隐藏目录)
+        jobs: 并行进程数 (0 表示CPU核数)
+        extensions: 目录中要扫描的扩展名
+
+    Returns:
+        (硬编码值列表, 扫描的文件数)
+    """
+    entries = list(entries)
+    files = list(iter_sources(paths, extensions))
+    jobs = min(jobs or os.cpu_count() or 1, len(files))
+    if jobs <= 1 or len(files) < PARALLEL_MIN_FILES:
+        scanner = LiteralScanner(TokenValueIndex(entries))
+        return [item for path in files for item in scanner.scan_file(path)], len(files)
+
+    found = []
+    chunksize = max(1, len(files) // (jobs * 8))
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(entries,)) as pool:
+        for items in pool.map(_scan_in_worker, files, chunksize=chunksize):
+            found.extend(items)
+    return found, len(files)
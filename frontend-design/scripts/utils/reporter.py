@@ -5,8 +5,10 @@
 提供格式化的验证报告输出功能。
 """
 
+import io
 import json
-from typing import List, Dict, Any, Optional
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterable, Optional, TextIO, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
@@ -46,6 +48,83 @@ class Reporter:
         else:
             return Reporter._to_text(result)
 
+    @staticmethod
+    def format_token_reports(results: List[Tuple[str, Any]], output_format: str = 'text') -> str:
+        """
+        格式化多文件Token验证报告: 总体摘要 + 每个文件一节
+
+        Args:
+            results: (文件路径, ValidationResult) 列表
+            output_format: 输出格式 ('text', 'json', 'markdown')
+
+        Returns:
+            格式化报告
+        """
+        total_tokens = sum(r.total_tokens for _, r in results)
+        error_count = sum(r.error_count for _, r in results)
+        warning_count = sum(r.warning_count for _, r in results)
+        is_valid = all(r.is_valid for _, r in results)
+        failed = sum(1 for _, r in results if not r.is_valid)
+
+        if output_format == 'json':
+            data = {
+                "is_valid": is_valid,
+                "total_files": len(results),
+                "failed_files": failed,
+                "total_tokens": total_tokens,
+                "error_count": error_count,
+                "warning_count": warning_count,
+                "files": [
+                    dict({"file": str(path)}, **Reporter._result_dict(result))
+                    for path, result in results
+                ]
+            }
+            return json.dumps(data, ensure_ascii=False, indent=2)
+
+        status = '✅ 通过' if is_valid else '❌ 失败'
+        if output_format == 'markdown':
+            lines = [
+                "# Design Token 验证报告\n",
+                f"**状态**: {status}",
+                f"**文件数**: {len(results)} (失败 {failed})",
+                f"**总Token数**: {total_tokens}",
+                f"**错误数**: {error_count}",
+                f"**警告数**: {warning_count}\n"
+            ]
+            for path, result in results:
+                lines.extend([
+                    f"## `{path}`\n",
+                    f"**状态**: {'✅ 通过' if result.is_valid else '❌ 失败'} | "
+                    f"Token: {result.total_tokens} | "
+                    f"错误: {result.error_count} | 警告: {result.warning_count}\n"
+                ])
+                lines.extend(Reporter._markdown_issues(result, '###'))
+            return "\n".join(lines)
+
+        lines = [
+            "=" * 60,
+            "Design Token 验证报告",
+            "=" * 60,
+            f"状态: {status}",
+            f"文件数: {len(results)} (失败 {failed})",
+            f"总Token数: {total_tokens}",
+            f"错误数: {error_count}",
+            f"警告数: {warning_count}",
+            ""
+        ]
+        for path, result in results:
+            lines.extend([
+                "#" * 60,
+                f"📄 {path}",
+                f"状态: {'✅ 通过' if result.is_valid else '❌ 失败'} | "
+                f"Token: {result.total_tokens} | "
+                f"错误: {result.error_count} | 警告: {result.warning_count}",
+                ""
+            ])
+            lines.extend(Reporter._text_issues(result))
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
     @staticmethod
     def _to_text(result) -> str:
         """生成文本格式报告"""
@@ -59,7 +138,22 @@ class Reporter:
             f"警告数: {result.warning_count}",
             ""
         ]
+        if result.diff is not None:
+            lines.insert(5, f"变更: {Reporter._diff_summary(result.diff)}")
+        lines.extend(Reporter._text_issues(result))
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _diff_summary(diff) -> str:
+        """基线差异摘要"""
+        return (f"新增 {len(diff.added)} | 修改 {len(diff.modified)} | "
+                f"删除 {len(diff.removed)} (只验证新增和修改的Token)")
 
+    @staticmethod
+    def _text_issues(result) -> List[str]:
+        """文本格式的错误和警告列表"""
+        lines = []
         if result.errors:
             lines.extend([
                 "❌ 错误:",
@@ -83,9 +177,7 @@ class Reporter:
                 if warning.suggestion:
                     lines.append(f"    💡 建议: {warning.suggestion}")
                 lines.append("")
-
-        lines.append("=" * 60)
-        return "\n".join(lines)
+        return lines
 
     @staticmethod
     def _to_markdown(result) -> str:
@@ -97,13 +189,21 @@ class Reporter:
             f"**错误数**: {result.error_count}",
             f"**警告数**: {result.warning_count}\n"
         ]
+        if result.diff is not None:
+            lines.insert(3, f"**变更**: {Reporter._diff_summary(result.diff)}")
+        lines.extend(Reporter._markdown_issues(result, '##'))
+        return "\n".join(lines)
 
+    @staticmethod
+    def _markdown_issues(result, heading: str) -> List[str]:
+        """Markdown格式的错误和警告列表 (heading 为章节标题级别, 如 '##')"""
+        lines = []
         if result.errors:
             lines.extend([
-                "## ❌ 错误\n"
+                f"{heading} ❌ 错误\n"
             ])
             for error in result.errors:
-                lines.append(f"### `{error.token_name}`")
+                lines.append(f"{heading}# `{error.token_name}`")
                 lines.append(f"{error.message}")
                 if error.suggestion:
                     lines.append(f"**建议**: {error.suggestion}")
@@ -111,20 +211,24 @@ class Reporter:
 
         if result.warnings:
             lines.extend([
-                "## ⚠️ 警告\n"
+                f"{heading} ⚠️ 警告\n"
             ])
             for warning in result.warnings:
-                lines.append(f"### `{warning.token_name}`")
+                lines.append(f"{heading}# `{warning.token_name}`")
                 lines.append(f"{warning.message}")
                 if warning.suggestion:
                     lines.append(f"**建议**: {warning.suggestion}")
                 lines.append("")
-
-        return "\n".join(lines)
+        return lines
 
     @staticmethod
     def _to_json(result) -> str:
         """生成JSON格式报告"""
+        return json.dumps(Reporter._result_dict(result), ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _result_dict(result) -> Dict[str, Any]:
+        """验证结果转为可JSON序列化的字典"""
         data = {
             "is_valid": result.is_valid,
             "total_tokens": result.total_tokens,
@@ -149,7 +253,13 @@ class Reporter:
                 for w in result.warnings
             ]
         }
-        return json.dumps(data, ensure_ascii=False, indent=2)
+        if result.diff is not None:
+            data["diff"] = {
+                "added": result.diff.added,
+                "modified": result.diff.modified,
+                "removed": result.diff.removed
+            }
+        return data
 
     @staticmethod
     def save_report(report: str, output_path: Path) -> None:
@@ -165,15 +275,212 @@ class Reporter:
             f.write(report)
 
     @staticmethod
-    def print_summary(result) -> None:
+    def print_summary(result, file_count: Optional[int] = None) -> None:
         """
         打印简要摘要
 
         Args:
-            result: ValidationResult对象
+            result: ValidationResult对象 (多文件时为合并结果)
+            file_count: 文件数 (多文件验证时显示)
         """
         status = "✅ 通过" if result.is_valid else "❌ 失败"
         print(f"\n🎨 Design Token 验证 - {status}")
-        print(f"   总Token: {result.total_tokens} | "
+        files = f"文件: {file_count} | " if file_count is not None else ""
+        print(f"   {files}总Token: {result.total_tokens} | "
               f"错误: {result.error_count} | "
               f"警告: {result.warning_count}")
+        if result.diff is not None:
+            print(f"   变更: {Reporter._diff_summary(result.diff)}")
+        hits, misses = result.cache_hits, result.cache_misses
+        if hits or misses:
+            print(f"   缓存: 命中 {hits} | 重新检查 {misses} | "
+                  f"命中率 {hits / (hits + misses):.1%}")
+
+    @staticmethod
+    def format_rule_profile(profile) -> str:
+        """
+        格式化逐规则耗时表 (按总耗时从高到低)
+
+        Args:
+            profile: RuleProfile对象
+
+        Returns:
+            文本表格
+        """
+        total = profile.total_seconds or 1.0
+        lines = [
+            "⏱️  规则耗时:",
+            # 表头中文字符占两列, 按显示宽度手工对齐
+            "   规则" + " " * 16 + "    调用次数" + "    总耗时(ms)" + "    平均(µs)" + "      占比",
+            "   " + "-" * 68
+        ]
+        for name, calls, seconds in profile.table():
+            average = seconds / calls * 1e6 if calls else 0.0
+            lines.append(
+                f"   {name:<20}{calls:>12}{seconds * 1e3:>14.1f}{average:>12.2f}"
+                f"{seconds / total:>10.1%}"
+            )
+        return "\n".join(lines)
+
+
+class BaseStreamReporter(ABC):
+    """
+    流式报告输出基类
+
+    begin() 写出标题, issue() 在问题产生时立即写出并刷新, end() 写出状态和摘要,
+    报告不在内存中累积, 内存占用与问题数量无关。支持 text / markdown / json
+    三种格式; json 输出为 {"issues": [...], 摘要字段...}, 问题列表在摘要之前。
+
+    子类定义标题 (title)、单个问题的三种渲染 (text_issue / markdown_issue /
+    issue_dict) 和摘要 (summary / summary_dict)。
+    """
+
+    title = "检查报告"
+
+    def __init__(self, stream: TextIO, output_format: str = 'text'):
+        """
+        Args:
+            stream: 输出流 (文件、sys.stdout 或 io.StringIO)
+            output_format: 输出格式 ('text', 'json', 'markdown')
+        """
+        self.stream = stream
+        self.output_format = output_format
+        self._issue_count = 0
+
+    @classmethod
+    def render(cls, issues: Iterable[Any], result: Any, output_format: str = 'text') -> str:
+        """
+        一次性渲染完整报告 (与流式输出完全相同)
+
+        Args:
+            issues: 问题序列
+            result: 检查结果 (用于摘要)
+            output_format: 输出格式
+
+        Returns:
+            报告文本
+        """
+        out = io.StringIO()
+        reporter = cls(out, output_format)
+        reporter.begin()
+        for issue in issues:
+            reporter.issue(issue)
+        reporter.end(result)
+        return out.getvalue()
+
+    def begin(self, title: Optional[str] = None) -> None:
+        """写出报告开头 (立即刷新, 长时间检查时也能先看到标题)"""
+        title = title or self.title
+        write = self.stream.write
+        if self.output_format == 'json':
+            write('{\n  "issues": [')
+        elif self.output_format == 'markdown':
+            write(f"# {title}\n\n")
+        else:
+            write("=" * 60 + "\n" + title + "\n" + "=" * 60 + "\n")
+        self.stream.flush()
+
+    def issue(self, issue: Any) -> None:
+        """
+        写出一个问题并立即刷新 (输出到管道或 tail -f 时逐条可见)
+
+        Args:
+            issue: 问题对象 (类型由子类决定)
+        """
+        if self.output_format == 'json':
+            item = json.dumps(self.issue_dict(issue), ensure_ascii=False)
+            self.stream.write(("," if self._issue_count else "") + "\n    " + item)
+        elif self.output_format == 'markdown':
+            self.stream.write(self.markdown_issue(issue))
+        else:
+            self.stream.write(self.text_issue(issue))
+        self.stream.flush()
+        self._issue_count += 1
+
+    def end(self, result: Any) -> None:
+        """
+        写出状态和摘要
+
+        Args:
+            result: 检查结果
+        """
+        write = self.stream.write
+        if self.output_format == 'json':
+            # 摘要字段逐个写在 issues 之后, 与 json.dumps(indent=2) 的排版一致
+            fields = "".join(
+                f',\n  {json.dumps(key, ensure_ascii=False)}: '
+                + json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                for key, value in self.summary_dict(result).items()
+            )
+            write(("\n  " if self._issue_count else "") + "]" + fields + "\n}\n")
+        elif self.output_format == 'markdown':
+            write("\n" + "".join(f"**{label}**: {value}\n" for label, value in self.summary(result)))
+        else:
+            write("-" * 60 + "\n"
+                  + "".join(f"{label}: {value}\n" for label, value in self.summary(result))
+                  + "=" * 60 + "\n")
+        self.stream.flush()
+
+    @abstractmethod
+    def text_issue(self, issue: Any) -> str:
+        """单个问题的文本格式 (以换行结尾)"""
+
+    @abstractmethod
+    def markdown_issue(self, issue: Any) -> str:
+        """单个问题的Markdown格式 (以换行结尾)"""
+
+    @abstractmethod
+    def issue_dict(self, issue: Any) -> Dict[str, Any]:
+        """单个问题的JSON对象"""
+
+    @abstractmethod
+    def summary(self, result: Any) -> List[Tuple[str, Any]]:
+        """文本/Markdown摘要: (标签, 值) 列表, 第一项为状态"""
+
+    @abstractmethod
+    def summary_dict(self, result: Any) -> Dict[str, Any]:
+        """JSON摘要字段"""
+
+
+class StreamReporter(BaseStreamReporter):
+    """Token验证的流式报告 (issue() 接收 TokenIssue, end() 接收 ValidationResult)"""
+
+    title = "Design Token 验证报告"
+
+    def text_issue(self, issue) -> str:
+        icon = "❌" if issue.level == 'error' else "⚠️ "
+        text = f"{icon} [{issue.token_name}]\n    {issue.message}\n"
+        if issue.suggestion:
+            text += f"    💡 建议: {issue.suggestion}\n"
+        return text
+
+    def markdown_issue(self, issue) -> str:
+        icon = "❌" if issue.level == 'error' else "⚠️"
+        text = f"- {icon} `{issue.token_name}`: {issue.message}"
+        if issue.suggestion:
+            text += f" (**建议**: {issue.suggestion})"
+        return text + "\n"
+
+    def issue_dict(self, issue) -> Dict[str, Any]:
+        return {
+            "level": issue.level,
+            "token_name": issue.token_name,
+            "message": issue.message,
+            "suggestion": issue.suggestion
+        }
+
+    def summary(self, result) -> List[Tuple[str, Any]]:
+        return [
+            ("状态", '✅ 通过' if result.is_valid else '❌ 失败'),
+            ("总Token数", result.total_tokens),
+            ("错误数", result.error_count),
+            ("警告数", result.warning_count),
+        ]
+
+    def summary_dict(self, result) -> Dict[str, Any]:
+        return {
+            "is_valid": result.is_valid,
+            "total_tokens": result.total_tokens,
+            "error_count": result.error_count,
+            "warning_count": result.warning_count
+        }
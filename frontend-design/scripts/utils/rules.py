@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Token检查规则注册模块
+
+每条逐Token规则声明适用的名称类别 (color、spacing 等) 和DTCG类型, 验证器
+按 (类别, 类型, 是否引用) 查表只调用相关规则。规则可以额外提供批量形式,
+批量验证时先收集适用的Token再一次调用; 流式验证仍逐个调用。
+RuleProfile 按规则记录调用次数和耗时。
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class Rule:
+    """逐Token检查规则"""
+
+    __slots__ = ('name', 'check', 'categories', 'types', 'values', 'batch', 'version')
+
+    def __init__(self, name: str, check: Callable[[str, Any], Iterable[Any]],
+                 categories: Optional[Iterable[str]] = None,
+                 types: Optional[Iterable[str]] = None,
+                 values: bool = True,
+                 batch: Optional[Callable[[Dict[str, Any]], List[Any]]] = None,
+                 version: int = 1):
+        """
+        Args:
+            name: 规则名称 (唯一)
+            check: check(名称, 值) -> 问题序列, 无问题时返回空序列
+            categories: 适用的名称类别 (None 表示全部)
+            types: 适用的DTCG类型 (None 表示全部, 包括未知类型)
+            values: 是否检查值; 为True时引用值 ({color-primary}) 跳过本规则
+            batch: 批量形式 batch({名称: 值}) -> 问题列表 (可选)
+            version: 规则版本, 修改检查逻辑时递增以使增量缓存失效
+        """
+        self.name = name
+        self.check = check
+        self.categories = frozenset(categories) if categories is not None else None
+        self.types = frozenset(types) if types is not None else None
+        self.values = values
+        self.batch = batch
+        self.version = version
+
+    def applies(self, category: str, token_type: Optional[str], is_alias: bool) -> bool:
+        """规则是否适用于该Token"""
+        return (
+            (self.categories is None or category in self.categories)
+            and (self.types is None or token_type in self.types)
+            and not (is_alias and self.values)
+        )
+
+    def describe(self) -> str:
+        """规则的规范描述 (参与规则集指纹)"""
+        categories = ','.join(sorted(self.categories)) if self.categories is not None else '*'
+        types = ','.join(sorted(self.types)) if self.types is not None else '*'
+        return f"{self.name}@{self.version}:{categories}:{types}:{int(self.values)}:{int(self.batch is not None)}"
+
+
+class RuleRegistry:
+    """
+    规则注册表
+
+    rules_for() 的结果按 (类别, 类型, 是否引用) 缓存, 每种组合只筛选一次;
+    没有任何规则声明的类别共用一项缓存。注册新规则时清空缓存。
+    规则按注册顺序调用, 问题也按此顺序报告。
+    """
+
+    def __init__(self):
+        self.rules: List[Rule] = []
+        # 所有规则声明过的类别; 其他类别的Token适用的规则相同
+        self.categories: frozenset = frozenset()
+        self._dispatch: Dict[Tuple[str, Optional[str], bool], Tuple[Tuple[Rule, ...], Tuple[Rule, ...]]] = {}
+
+    def register(self, name: str, categories: Optional[Iterable[str]] = None,
+                 types: Optional[Iterable[str]] = None, values: bool = True,
+                 batch: Optional[Callable[[Dict[str, Any]], List[Any]]] = None,
+                 version: int = 1) -> Callable:
+        """
+        注册规则的装饰器, 参数含义见 Rule
+
+        Returns:
+            装饰器 (原样返回被装饰的检查函数)
+        """
+        def decorator(check: Callable[[str, Any], Iterable[Any]]) -> Callable:
+            if any(rule.name == name for rule in self.rules):
+                raise ValueError(f"规则已注册: {name}")
+            self.rules.append(Rule(name, check, categories, types, values, batch, version))
+            self._changed()
+            return check
+        return decorator
+
+    def unregister(self, name: str) -> None:
+        """移除规则 (不存在时抛出 KeyError)"""
+        for i, rule in enumerate(self.rules):
+            if rule.name == name:
+                del self.rules[i]
+                self._changed()
+                return
+        raise KeyError(name)
+
+    def _changed(self) -> None:
+        self.categories = frozenset().union(
+            *(rule.categories for rule in self.rules if rule.categories is not None)
+        )
+        self._dispatch.clear()
+
+    def get(self, name: str) -> Rule:
+        """按名称查找规则 (不存在时抛出 KeyError)"""
+        for rule in self.rules:
+            if rule.name == name:
+                return rule
+        raise KeyError(name)
+
+    def rules_for(self, category: str, token_type: Optional[str],
+                  is_alias: bool) -> Tuple[Tuple[Rule, ...], Tuple[Rule, ...]]:
+        """
+        适用于该Token的规则
+
+        Args:
+            category: 名称类别 (名称第一段)
+            token_type: DTCG类型
+            is_alias: 值是否为引用
+
+        Returns:
+            (逐Token调用的规则, 有批量形式的规则)
+        """
+        if category not in self.categories:
+            category = None
+        key = (category, token_type, is_alias)
+        rules = self._dispatch.get(key)
+        if rules is None:
+            applicable = [rule for rule in self.rules if rule.applies(category, token_type, is_alias)]
+            rules = (
+                tuple(rule for rule in applicable if rule.batch is None),
+                tuple(rule for rule in applicable if rule.batch is not None),
+            )
+            self._dispatch[key] = rules
+        return rules
+
+    def __iter__(self) -> Iterator[Rule]:
+        return iter(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+class RuleProfile:
+    """
+    逐规则耗时统计
+
+    逐Token规则每次调用计一次; 批量规则的调用次数按覆盖的Token数计。
+    跨Token的检查阶段 (缺失类别、引用等) 也可以用 timed() 计入。
+    """
+
+    def __init__(self):
+        # 规则名称 -> [调用次数, 总耗时(秒)], 按首次记录的顺序
+        self.stats: Dict[str, List[float]] = {}
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        """记录一次 (或一批) 调用"""
+        entry = self.stats.get(name)
+        if entry is None:
+            self.stats[name] = [calls, seconds]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+
+    @contextmanager
+    def timed(self, name: str, calls: int = 1) -> Iterator[None]:
+        """计时一个代码块"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, calls)
+
+    def merge(self, other: 'RuleProfile') -> None:
+        """合并另一份统计 (如多进程验证时各工作进程的统计)"""
+        for name, (calls, seconds) in other.stats.items():
+            self.add(name, seconds, int(calls))
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(seconds for _, seconds in self.stats.values())
+
+    def table(self) -> List[Tuple[str, int, float]]:
+        """
+        Returns:
+            (规则名称, 调用次数, 总耗时秒) 列表, 按耗时从高到低排列
+        """
+        rows = [(name, int(calls), seconds) for name, (calls, seconds) in self.stats.items()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+
+@contextmanager
+def timed(profile: Optional[RuleProfile], name: str, calls: int = 1) -> Iterator[None]:
+    """profile 不为None时计时代码块, 否则直接执行"""
+    if profile is None:
+        yield
+    else:
+        with profile.timed(name, calls):
+            yield
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+颜色空间索引模块
+
+在OKLab空间中用均匀网格哈希索引调色板, 支持"ΔE_OK < ε 的所有颜色"查询,
+用于检测近似重复的颜色Token。
+"""
+
+import math
+from typing import List, Tuple, Dict, Optional, Union
+
+from .color import ColorUtils, ColorPalette
+
+# 近似重复判定阈值 (OKLab欧氏距离, 约为一个可察觉差异)
+DUPLICATE_DELTA_E = 0.02
+
+# 网格邻居偏移 (3x3x3)
+_NEIGHBORS = tuple(
+    (dl, da, db)
+    for dl in (-1, 0, 1) for da in (-1, 0, 1) for db in (-1, 0, 1)
+)
+# 只取"字典序更大"的一半邻居, 保证每对格子只比较一次
+_FORWARD_NEIGHBORS = tuple(offset for offset in _NEIGHBORS if offset > (0, 0, 0))
+
+
+class ColorIndex:
+    """
+    OKLab 网格哈希索引
+
+    每个颜色按 floor(坐标 / cell) 落入一个格子; 半径不超过 cell 的查询
+    只需检查相邻的 27 个格子, 颜色分布均匀时单次查询为 O(1),
+    全部近邻对为 O(n)。无效颜色 (NaN) 不进入索引。
+    """
+
+    __slots__ = ('palette', 'cell', 'lab', '_grid')
+
+    def __init__(self, palette: ColorPalette, cell: float = DUPLICATE_DELTA_E):
+        """
+        Args:
+            palette: 要索引的调色板
+            cell: 网格边长 (应不小于常用查询半径)
+        """
+        if cell <= 0:
+            raise ValueError(f"网格边长必须为正数: {cell}")
+        self.palette = palette
+        self.cell = cell
+        self.lab: List[Optional[Tuple[float, float, float]]] = []
+        self._grid: Dict[Tuple[int, int, int], List[int]] = {}
+
+        for i, (l, c, h) in enumerate(zip(palette.l, palette.c, palette.h)):
+            if math.isnan(l) or math.isnan(c) or math.isnan(h):
+                self.lab.append(None)
+                continue
+            rad = math.radians(h)
+            point = (l, c * math.cos(rad), c * math.sin(rad))
+            self.lab.append(point)
+            self._grid.setdefault(self._key(point), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.palette)
+
+    def _key(self, point: Tuple[float, float, float]) -> Tuple[int, int, int]:
+        cell = self.cell
+        return (
+            math.floor(point[0] / cell),
+            math.floor(point[1] / cell),
+            math.floor(point[2] / cell),
+        )
+
+    def query(self, color: Union[str, Tuple[float, float, float]],
+              radius: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        查询与给定颜色距离小于 radius 的所有索引项
+
+        Args:
+            color: CSS颜色字符串或OKLab坐标 (L, a, b)
+            radius: 查询半径 ΔE_OK (默认等于网格边长)
+
+        Returns:
+            (调色板下标, 距离) 列表, 按距离升序; 颜色无法解析时为空
+        """
+        if isinstance(color, str):
+            parsed = ColorUtils.parse_color(color)
+            if not parsed:
+                return []
+            rad = math.radians(parsed.h)
+            color = (parsed.l, parsed.c * math.cos(rad), parsed.c * math.sin(rad))
+
+        radius = self.cell if radius is None else radius
+        reach = max(1, math.ceil(radius / self.cell))
+        kl, ka, kb = self._key(color)
+        l0, a0, b0 = color
+        found = []
+        for dl in range(-reach, reach + 1):
+            for da in range(-reach, reach + 1):
+                for db in range(-reach, reach + 1):
+                    for i in self._grid.get((kl + dl, ka + da, kb + db), ()):
+                        l, a, b = self.lab[i]
+                        distance = math.sqrt((l - l0) ** 2 + (a - a0) ** 2 + (b - b0) ** 2)
+                        if distance < radius:
+                            found.append((i, distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def nearest(self, color: Union[str, Tuple[float, float, float]],
+                radius: Optional[float] = None) -> Optional[Tuple[int, float]]:
+        """
+        查询距离小于 radius 的最近索引项
+
+        Args:
+            color: CSS颜色字符串或OKLab坐标 (L, a, b)
+            radius: 查询半径 ΔE_OK (默认等于网格边长)
+
+        Returns:
+            (调色板下标, 距离), 半径内没有颜色或颜色无法解析时为None
+        """
+        found = self.query(color, radius)
+        return found[0] if found else None
+
+    def pairs(self, radius: Optional[float] = None) -> List[Tuple[int, int, float]]:
+        """
+        列出所有距离小于 radius 且透明度相同的颜色对
+
+        Args:
+            radius: ΔE_OK 阈值 (默认等于网格边长, 不能大于网格边长)
+
+        Returns:
+            (i, j, 距离) 列表, 其中 i < j
+        """
+        radius = self.cell if radius is None else radius
+        if radius > self.cell:
+            raise ValueError(f"查询半径 {radius} 超过网格边长 {self.cell}, 请用更大的 cell 重建索引")
+
+        lab = self.lab
+        alpha = self.palette.alpha
+        limit = radius * radius
+        grid = self._grid
+        result = []
+
+        def compare(i: int, j: int) -> None:
+            if alpha[i] != alpha[j]:
+                return
+            li, ai, bi = lab[i]
+            lj, aj, bj = lab[j]
+            d2 = (li - lj) ** 2 + (ai - aj) ** 2 + (bi - bj) ** 2
+            if d2 < limit:
+                result.append((i, j, math.sqrt(d2)) if i < j else (j, i, math.sqrt(d2)))
+
+        for (kl, ka, kb), members in grid.items():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    compare(members[x], members[y])
+            for dl, da, db in _FORWARD_NEIGHBORS:
+                others = grid.get((kl + dl, ka + da, kb + db))
+                if others:
+                    for i in members:
+                        for j in others:
+                            compare(i, j)
+
+        result.sort()
+        return result
+
+    def nearest_earlier(self, radius: Optional[float] = None) -> Dict[int, Tuple[int, float]]:
+        """
+        为每个颜色找出排在它之前、距离小于 radius 的最近颜色
+
+        Args:
+            radius: ΔE_OK 阈值
+
+        Returns:
+            下标 j -> (更早的下标 i, 距离)
+        """
+        nearest: Dict[int, Tuple[int, float]] = {}
+        for i, j, distance in self.pairs(radius):
+            if j not in nearest or distance < nearest[j][1]:
+                nearest[j] = (i, distance)
+        return nearest
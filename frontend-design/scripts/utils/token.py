@@ -6,19 +6,178 @@ Token验证工具模块
 """
 
 import re
-import json
-from typing import List, Dict, Any, Optional
+import time
+import hashlib
+import itertools
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Set, Tuple, Callable, Union
 from pathlib import Path
 from dataclasses import dataclass, field
 
+from .color import ColorUtils, ColorPalette
+from .loaders import load_error_message, load_token_file, iter_token_members
+from .jsonstream import ObjectStream, materialize
+from .alias import AliasGraph, alias_target
+from .spatial import ColorIndex, DUPLICATE_DELTA_E
+from .cvd import CVDUtils, CVD_NAMES, CVD_MIN_DELTA_E
+from .cache import ValidationCache
+from .rules import RuleRegistry, RuleProfile, timed
+from .usage import TokenUsage
+from .literals import HardcodedLiteral
+from .fuzzy import NameIndex
+
+
+# 命名规则: (匹配即违规的模式, 问题描述模板); 模式均从名称开头匹配, 按报告顺序排列;
+# 模板中的 {0} 为Token名称
+_CONCRETE_COLORS = ('red', 'blue', 'green', 'yellow', 'purple', 'orange')
+_NAMING_RULES = tuple(
+    (re.compile(pattern, re.DOTALL), message)
+    for pattern, message in (
+        (r'(?![a-z][a-z0-9-]*$)',
+         "Token名称必须使用小写字母、数字和连字符，且以字母开头"),
+        (r'.*--', "Token名称不应包含连续的连字符"),
+        (r'.*_', "Token名称应使用连字符而非下划线"),
+        # 颜色Token的第三段是具体颜色名 (应使用语义化名称)
+        (r'color-[^-]*-(?:%s)(?:-|\Z)' % '|'.join(_CONCRETE_COLORS),
+         "建议使用语义化命名 (如 'color-primary') 而非具体颜色名 ('{0}')"),
+    )
+)
+# 所有规则取反后合并为一个模式: 匹配成功即名称完全合规
+_NAMING_CLEAN = re.compile(
+    ''.join('(?!%s)' % pattern.pattern for pattern, _ in _NAMING_RULES), re.DOTALL
+)
+
 
-@dataclass
 class TokenIssue:
-    """Token问题记录"""
-    level: str  # 'error', 'warning', 'info'
-    token_name: str
-    message: str
-    suggestion: Optional[str] = None
+    """
+    Token问题记录
+
+    描述和建议以模板 + 参数 (args) 保存, 读取 message / suggestion 时才用
+    str.format(*args) 渲染; 模板是模块级常量, 同类问题共享同一个字符串。
+    args 为空时两者按原文返回 (不做格式化)。
+    """
+
+    __slots__ = ('level', 'token_name', 'template', 'args', 'suggestion_template')
+
+    def __init__(self, level: str, token_name: str, message: str,
+                 suggestion: Optional[str] = None, args: Tuple[Any, ...] = ()):
+        """
+        Args:
+            level: 级别 ('error', 'warning', 'info')
+            token_name: Token名称
+            message: 问题描述 (args 非空时为模板)
+            suggestion: 修复建议 (args 非空时为模板)
+            args: 模板参数
+        """
+        self.level = level
+        self.token_name = token_name
+        self.template = message
+        self.suggestion_template = suggestion
+        self.args = args
+
+    @property
+    def message(self) -> str:
+        return self.template.format(*self.args) if self.args else self.template
+
+    @property
+    def suggestion(self) -> Optional[str]:
+        template = self.suggestion_template
+        if template is None or not self.args:
+            return template
+        return template.format(*self.args)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, TokenIssue):
+            return NotImplemented
+        return (self.level, self.token_name, self.message, self.suggestion) == \
+            (other.level, other.token_name, other.message, other.suggestion)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"TokenIssue(level={self.level!r}, token_name={self.token_name!r}, "
+                f"message={self.message!r}, suggestion={self.suggestion!r})")
+
+
+def _is_alias(value: Any) -> bool:
+    """引用值, 如 "{color-primary}" 或 DTCG 的 "{color.primary}" """
+    return alias_target(value) is not None
+
+
+# 逐Token检查规则, 按注册顺序调用; 第三方规则用 TOKEN_RULES.register() 注册
+TOKEN_RULES = RuleRegistry()
+
+
+def _naming_violations(token_name: str) -> List[str]:
+    """逐条匹配命名规则, 返回未渲染的模板 (只对未通过 _NAMING_CLEAN 的名称调用)"""
+    return [
+        message
+        for pattern, message in _NAMING_RULES
+        if pattern.match(token_name)
+    ]
+
+
+@TOKEN_RULES.register('naming', values=False)
+def _check_naming(token_name: str, token_value: Any) -> List[TokenIssue]:
+    """命名规范 (适用于所有Token, 包括引用)"""
+    if _NAMING_CLEAN.match(token_name):
+        return []
+    # 只有带 {0} 的模板才需要参数; 其余问题不分配参数元组
+    args = (token_name,)
+    return [
+        TokenIssue('warning', token_name, message, args=args if '{' in message else ())
+        for message in _naming_violations(token_name)
+    ]
+
+
+@TOKEN_RULES.register('dimension-unit', types=('dimension',))
+def _check_dimension(token_name: str, token_value: Any) -> List[TokenIssue]:
+    """dimension类型: 建议使用 rem 或 px 单位 (支持字符串和DTCG的 {value, unit} 对象)"""
+    if isinstance(token_value, dict):
+        if 'unit' not in token_value:
+            return []
+        unit = token_value['unit']
+        display = f"{token_value.get('value', '')}{unit}"
+    elif isinstance(token_value, str):
+        unit = 'rem' if token_value.endswith('rem') else 'px' if token_value.endswith('px') else None
+        display = token_value
+    else:
+        return []
+    if unit in ('rem', 'px'):
+        return []
+    kind = '间距' if token_name.startswith('spacing-') else '尺寸'
+    return [TokenIssue(
+        'warning', token_name, "{0}Token建议使用rem或px单位: {1}",
+        suggestion="使用相对单位rem或绝对单位px",
+        args=(kind, display)
+    )]
+
+
+def _check_colors(tokens: Dict[str, Any]) -> List[TokenIssue]:
+    """color类型批量形式: 所有颜色一次解析进ColorPalette再做范围检查"""
+    return TokenValidator.validate_colors(
+        {name: value for name, value in tokens.items() if isinstance(value, str)}, prefix=''
+    )
+
+
+@TOKEN_RULES.register('color-format', types=('color',), batch=_check_colors)
+def _check_color(token_name: str, token_value: Any) -> List[TokenIssue]:
+    """color类型: OKLCH格式与取值范围"""
+    if isinstance(token_value, str) and not ColorUtils.is_valid_color(token_value):
+        return [TokenValidator._color_issue(token_name, token_value)]
+    return []
+
+
+@dataclass
+class TokenDiff:
+    """两个版本Token集合的差异 (按展开后的名称比较值和类型)"""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> int:
+        """需要验证的Token数 (新增 + 修改)"""
+        return len(self.added) + len(self.modified)
 
 
 @dataclass
@@ -28,19 +187,30 @@ class ValidationResult:
     total_tokens: int
     errors: List[TokenIssue] = field(default_factory=list)
     warnings: List[TokenIssue] = field(default_factory=list)
+    # 流式验证时问题直接交给回调而不保存在列表中, 只在此计数
+    streamed_errors: int = 0
+    streamed_warnings: int = 0
+    # 增量缓存命中/未命中的Token数 (未使用缓存时均为0)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # 与基线比较的差异 (只验证变更Token时设置)
+    diff: Optional[TokenDiff] = None
 
     @property
     def error_count(self) -> int:
-        return len(self.errors)
+        return len(self.errors) + self.streamed_errors
 
     @property
     def warning_count(self) -> int:
-        return len(self.warnings)
+        return len(self.warnings) + self.streamed_warnings
 
 
 class TokenValidator:
     """Token验证器"""
 
+    # 规则集版本: 修改逐Token检查的逻辑 (而非仅规则表) 时递增, 使旧缓存失效
+    RULESET_VERSION = 2
+
     # 命名规范模式
     NAMING_PATTERNS = {
         'color': re.compile(r'^color-[a-z]+(-[a-z]+)*$'),
@@ -56,6 +226,12 @@ class TokenValidator:
     # 必需的Token类别
     REQUIRED_CATEGORIES = ['color', 'spacing', 'font', 'shadow', 'radius']
 
+    # 平铺Token没有 $type 时按名称类别推断的DTCG类型
+    CATEGORY_TYPES = {'color': 'color', 'spacing': 'dimension'}
+
+    # 需要在色觉缺陷下保持可区分的状态色
+    STATUS_COLORS = ('success', 'warning', 'error', 'info')
+
     # 语义化Token前缀
     SEMANTIC_PREFIXES = [
         'primary', 'secondary', 'success', 'warning', 'error', 'info',
@@ -67,131 +243,743 @@ class TokenValidator:
         """
         验证Token命名规范
 
+        绝大多数名称一次匹配合并后的 _NAMING_CLEAN 即可判定无问题;
+        只有不合规的名称才逐条匹配 _NAMING_RULES 以生成问题列表。
+
         Args:
             token_name: Token名称
 
         Returns:
             问题列表
         """
-        issues = []
+        if _NAMING_CLEAN.match(token_name):
+            return []
+        return [message.format(token_name) for message in _naming_violations(token_name)]
 
-        # 检查是否使用小写和连字符
-        if not re.match(r'^[a-z][a-z0-9-]*$', token_name):
-            issues.append(
-                "Token名称必须使用小写字母、数字和连字符，且以字母开头"
-            )
+    @staticmethod
+    def iter_tokens(source: Union[Dict[str, Any], Iterable[Tuple[str, Any]]]
+                    ) -> Iterator[Tuple[str, Any, Optional[str]]]:
+        """
+        惰性展开Token, 同时支持平铺格式和W3C Design Tokens (DTCG) 嵌套格式
 
-        # 检查是否包含禁止的模式
-        if '--' in token_name:
-            issues.append("Token名称不应包含连续的连字符")
-
-        if '_' in token_name:
-            issues.append("Token名称应使用连字符而非下划线")
-
-        # 检查是否使用语义化命名
-        if token_name.startswith('color-'):
-            # 提取颜色概念部分
-            parts = token_name.split('-')
-            if len(parts) >= 3:
-                concept = parts[2]
-                # 检查是否使用具体颜色名（应使用语义化名称）
-                concrete_colors = ['red', 'blue', 'green', 'yellow', 'purple', 'orange']
-                if concept in concrete_colors:
-                    issues.append(
-                        f"建议使用语义化命名 (如 'color-primary') 而非具体颜色名 ('{token_name}')"
-                    )
+        用显式栈逐层遍历嵌套分组, 不构建中间字典。含 $value 的对象是一个Token,
+        其他对象是分组; 分组路径用连字符拼接为规范名称 (color.bg.subtle ->
+        color-bg-subtle)。$type 沿分组继承; 都没有时按名称类别推断
+        (CATEGORY_TYPES)。以 $ 开头的元数据键 ($description 等) 被跳过。
 
-        return issues
+        流式读取的大对象 (ObjectStream) 按成员逐个展开, 不整体解码; 此时 $value
+        和 $type 须写在子成员之前才能被识别 (DTCG示例的惯例写法)。
+
+        Args:
+            source: Token字典, 或 (键, 值) 迭代器 (如 iter_token_members() 的返回值)
+
+        Returns:
+            (名称, 值, 类型) 迭代器, 类型未知时为None
+        """
+        infer = TokenValidator.CATEGORY_TYPES.get
+        items = source.items() if isinstance(source, dict) else source
+        stack = [(iter(items), '', None)]
+        while stack:
+            entries, prefix, group_type = stack[-1]
+            for key, value in entries:
+                if key[:1] == '$':
+                    continue
+                name = prefix + key
+                if isinstance(value, ObjectStream):
+                    value, children = TokenValidator._open_stream(value)
+                    if children is not None:
+                        stack.append((children, name + '-', value.get('$type', group_type)))
+                        break
+                if isinstance(value, dict):
+                    if '$value' not in value:
+                        stack.append((iter(value.items()), name + '-', value.get('$type', group_type)))
+                        break
+                    token_type = value.get('$type', group_type)
+                    value = value['$value']
+                else:
+                    token_type = group_type
+                yield name, value, token_type or infer(name.partition('-')[0])
+            else:
+                stack.pop()
 
     @staticmethod
-    def validate_token_structure(tokens: Dict[str, Any]) -> ValidationResult:
+    def _open_stream(stream: ObjectStream) -> Tuple[Dict[str, Any], Optional[Iterator[Tuple[str, Any]]]]:
+        """
+        读取流式对象开头的 $ 元数据键, 判断它是Token还是分组
+
+        Args:
+            stream: 尚未读完的对象
+
+        Returns:
+            (元数据字典, 剩余子成员迭代器); 对象是Token或没有子成员时迭代器为None
+        """
+        meta = {}
+        for key, value in stream:
+            if key[:1] != '$':
+                if '$value' not in meta:
+                    return meta, itertools.chain(((key, value),), stream)
+                # 与字典形式一致, Token的子成员被忽略
+                for key, value in stream:
+                    if key[:1] == '$':
+                        meta[key] = materialize(value)
+                break
+            meta[key] = materialize(value)
+        return meta, None
+
+    @staticmethod
+    def ruleset_fingerprint() -> str:
+        """
+        逐Token检查规则集的指纹, 用作增量缓存的失效条件
+
+        Returns:
+            RULESET_VERSION、命名规则、类别类型推断和已注册规则的SHA-1
+        """
+        parts = [str(TokenValidator.RULESET_VERSION)]
+        parts.extend(f"{pattern.pattern}\0{message}" for pattern, message in _NAMING_RULES)
+        parts.extend(f"{category}={token_type}"
+                     for category, token_type in sorted(TokenValidator.CATEGORY_TYPES.items()))
+        parts.extend(rule.describe() for rule in TOKEN_RULES)
+        return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def validate_token_structure(tokens: Dict[str, Any],
+                                 duplicate_threshold: Optional[float] = None,
+                                 cvd_threshold: Optional[float] = None,
+                                 cache: Optional[ValidationCache] = None,
+                                 profile: Optional[RuleProfile] = None,
+                                 baseline: Optional[Dict[str, Any]] = None) -> ValidationResult:
         """
         验证Token结构完整性
 
+        每个Token只调用 TOKEN_RULES 中适用于其类别和类型的规则; 有批量形式的
+        规则 (如颜色格式) 先收集再一次调用。报告顺序与逐个检查时相同: 缺失类别在前,
+        然后按Token顺序列出每个Token的问题 (逐个规则的问题在前, 批量规则的在后),
+        最后是引用问题。
+
+        传入缓存时, 内容 (名称、类型、值) 未变的Token直接重放缓存的问题,
+        只有新增或修改的Token经过规则检查。缺失类别、引用和近似重复等
+        跨Token检查不缓存。
+
+        传入基线时只验证相对基线新增或修改 (值或类型不同) 的Token, 未变的Token
+        不经过规则也不报告问题; 引用问题只报告涉及变更或删除Token的。缺失类别
+        (以及启用时的近似重复、色觉检查) 仍针对合并后的完整集合。差异记录在
+        result.diff 中。
+
         Args:
-            tokens: Token字典
+            tokens: Token字典 (平铺或DTCG嵌套格式)
+            duplicate_threshold: 近似重复颜色的 ΔE_OK 阈值 (None 表示不检查)
+            cvd_threshold: 状态色在色觉缺陷下的最小 ΔE_OK (None 表示不检查)
+            cache: 增量验证缓存 (None 表示全部重新检查)
+            profile: 逐规则耗时统计 (None 表示不计时)
+            baseline: 基线Token字典 (平铺或DTCG嵌套格式), 只验证相对它的变更
 
         Returns:
             验证结果
         """
-        result = ValidationResult(is_valid=True, total_tokens=len(tokens))
-
-        # 检查必需的类别
+        result = ValidationResult(is_valid=True, total_tokens=0)
+        # 基线: 名称 -> (值, 类型); 循环中匹配到的条目被取出, 剩下的即为已删除的Token
+        previous = None
+        if baseline is not None:
+            previous = {
+                name: (value, token_type)
+                for name, value, token_type in TokenValidator.iter_tokens(baseline)
+            }
+            result.diff = TokenDiff()
         found_categories = set()
-        for token_name in tokens.keys():
+        colors = {} if duplicate_threshold is not None or cvd_threshold is not None else None
+        # 引用检查只需名称和引用值, 字面值不保留 (None)
+        references = {}
+        # 与按名称类别推断不同的类型; 引用两端的类型在检查时才补全
+        type_overrides = {}
+        infer = TokenValidator.CATEGORY_TYPES.get
+        rules_for = TOKEN_RULES.rules_for
+        rule_categories = TOKEN_RULES.categories
+        dispatch = {}
+        # 批量规则名称 -> 待检查的 {名称: 值}
+        batch_inputs: Dict[str, Dict[str, Any]] = {}
+        # 逐Token的问题: 名称 -> [(规则名称, 问题)], 批量规则运行后按Token顺序报告
+        token_issues: Dict[str, List[Tuple[str, TokenIssue]]] = {}
+        pending = []
+        # 同一缓存可跨多个文件复用, 命中统计按本次调用计
+        if cache is not None:
+            hits, misses = cache.hits, cache.misses
+
+        def report(issue: TokenIssue) -> None:
+            (result.errors if issue.level == 'error' else result.warnings).append(issue)
+
+        for token_name, token_value, token_type in TokenValidator.iter_tokens(tokens):
+            result.total_tokens += 1
             category = token_name.split('-')[0]
             found_categories.add(category)
+            is_alias = isinstance(token_value, str) and token_value[:1] == '{' and _is_alias(token_value)
+            references[token_name] = token_value if is_alias else None
+            if token_type != infer(category):
+                type_overrides[token_name] = token_type
+            if colors is not None and token_type == 'color' and isinstance(token_value, str) and not is_alias:
+                colors[token_name] = token_value
+
+            if previous is not None:
+                old = previous.pop(token_name, None)
+                if old is None:
+                    result.diff.added.append(token_name)
+                elif old == (token_value, token_type):
+                    continue
+                else:
+                    result.diff.modified.append(token_name)
+
+            if cache is not None:
+                key = cache.key(token_name, token_value, token_type)
+                cached = cache.get(key)
+                if cached is not None:
+                    if cached:
+                        token_issues[token_name] = [
+                            (rule_name, TokenIssue(level, token_name, message, suggestion, tuple(args)))
+                            for rule_name, level, message, suggestion, args in cached
+                        ]
+                    continue
+
+            rule_key = (category if category in rule_categories else None, token_type, is_alias)
+            rules = dispatch.get(rule_key)
+            if rules is None:
+                rules = dispatch[rule_key] = rules_for(category, token_type, is_alias)
+            checks, batches = rules
+            for rule in checks:
+                if profile is None:
+                    issues = rule.check(token_name, token_value)
+                else:
+                    start = time.perf_counter()
+                    issues = rule.check(token_name, token_value)
+                    profile.add(rule.name, time.perf_counter() - start)
+                for issue in issues:
+                    token_issues.setdefault(token_name, []).append((rule.name, issue))
+            for rule in batches:
+                batch_inputs.setdefault(rule.name, {})[token_name] = token_value
+            if cache is not None:
+                pending.append((key, token_name))
 
-        for required in TokenValidator.REQUIRED_CATEGORIES:
-            if required not in found_categories:
-                result.errors.append(TokenIssue(
-                    level='error',
-                    token_name=f'category:{required}',
-                    message=f"缺少必需的Token类别: {required}",
-                    suggestion=f"添加 {required}-* 相关的Token"
-                ))
+        # 检查必需的类别
+        with timed(profile, 'categories'):
+            result.errors.extend(TokenValidator._missing_categories(found_categories))
+
+        # 批量规则 (如颜色Token的OKLCH格式与范围); 问题并入所属Token, 按规则注册顺序排列
+        if batch_inputs:
+            position = {rule.name: i for i, rule in enumerate(TOKEN_RULES)}
+            merged = set()
+            for rule_name, inputs in batch_inputs.items():
+                with timed(profile, rule_name, len(inputs)):
+                    issues = TOKEN_RULES.get(rule_name).batch(inputs)
+                for issue in issues:
+                    token_issues.setdefault(issue.token_name, []).append((rule_name, issue))
+                    merged.add(issue.token_name)
+            for token_name in merged:
+                token_issues[token_name].sort(key=lambda item: position[item[0]])
+        if token_issues:
+            for token_name in references:
+                for _, issue in token_issues.get(token_name, ()):
+                    report(issue)
+
+        # 引用解析: 悬空/循环引用为错误, 类型不一致为警告
+        only = None
+        if previous is not None:
+            result.diff.removed = list(previous)
+            only = set(result.diff.added)
+            only.update(result.diff.modified, result.diff.removed)
+        with timed(profile, 'aliases', len(references)):
+            types = {}
+            for token_name, token_value in references.items():
+                if token_value is not None:
+                    for endpoint in (token_name, alias_target(token_value)):
+                        if endpoint in references:
+                            types[endpoint] = type_overrides.get(endpoint, infer(endpoint.split('-')[0]))
+            for issue in TokenValidator.check_aliases(references, types, only):
+                report(issue)
+
+        if cache is not None:
+            result.cache_hits = cache.hits - hits
+            result.cache_misses = cache.misses - misses
+            for key, token_name in pending:
+                cache.put(key, [
+                    (rule_name, issue.level, issue.template, issue.suggestion_template, issue.args)
+                    for rule_name, issue in token_issues.get(token_name, ())
+                ])
+
+        # 近似重复/色觉检查比较颜色对; 只验证变更时只报告至少一方变更的颜色对
+        if duplicate_threshold is not None:
+            with timed(profile, 'duplicates', len(colors)):
+                issues = TokenValidator.find_duplicate_colors(colors, duplicate_threshold, prefix='')
+            result.warnings.extend(
+                issue for issue in issues
+                if only is None or issue.token_name in only or issue.args[0] in only
+            )
+        if cvd_threshold is not None:
+            with timed(profile, 'cvd', len(colors)):
+                issues = TokenValidator.check_color_vision(colors, cvd_threshold)
+            result.warnings.extend(
+                issue for issue in issues
+                if only is None or issue.token_name in only or issue.args[1] in only
+            )
 
-        # 验证每个Token
-        for token_name, token_value in tokens.items():
-            # 命名验证
-            naming_issues = TokenValidator.validate_naming(token_name)
-            for issue in naming_issues:
-                result.warnings.append(TokenIssue(
-                    level='warning',
-                    token_name=token_name,
-                    message=issue
-                ))
+        result.is_valid = result.error_count == 0
+        return result
+
+    @staticmethod
+    def merge_results(results: Iterable[ValidationResult]) -> ValidationResult:
+        """
+        合并多个文件的验证结果 (问题列表按文件顺序拼接)
+
+        Args:
+            results: 验证结果
+
+        Returns:
+            合并后的验证结果, 任一文件失败即为失败
+        """
+        merged = ValidationResult(is_valid=True, total_tokens=0)
+        for result in results:
+            merged.is_valid = merged.is_valid and result.is_valid
+            merged.total_tokens += result.total_tokens
+            merged.errors.extend(result.errors)
+            merged.warnings.extend(result.warnings)
+            merged.streamed_errors += result.streamed_errors
+            merged.streamed_warnings += result.streamed_warnings
+            merged.cache_hits += result.cache_hits
+            merged.cache_misses += result.cache_misses
+        return merged
+
+    @staticmethod
+    def check_token(token_name: str, token_value: Any,
+                    token_type: Optional[str] = None,
+                    profile: Optional[RuleProfile] = None) -> List[TokenIssue]:
+        """
+        对单个Token逐个调用适用的规则 (有批量形式的规则也逐个调用)
+
+        Args:
+            token_name: Token名称
+            token_value: Token值
+            token_type: DTCG类型 (None 时按名称类别推断)
+            profile: 逐规则耗时统计 (None 表示不计时)
+
+        Returns:
+            问题列表 (逐Token规则在前, 有批量形式的规则在后, 各自按注册顺序)
+        """
+        category = token_name.split('-')[0]
+        if token_type is None:
+            token_type = TokenValidator.CATEGORY_TYPES.get(category)
+        checks, batches = TOKEN_RULES.rules_for(category, token_type, _is_alias(token_value))
+        issues = []
+        for rule in checks + batches:
+            if profile is None:
+                issues.extend(rule.check(token_name, token_value))
+            else:
+                start = time.perf_counter()
+                issues.extend(rule.check(token_name, token_value))
+                profile.add(rule.name, time.perf_counter() - start)
+        return issues
+
+    @staticmethod
+    def _color_issue(token_name: str, token_value: Any) -> TokenIssue:
+        """颜色Token格式/范围错误"""
+        return TokenIssue(
+            'error', token_name, "颜色Token值格式不正确: {0}",
+            suggestion="使用 #hex、rgb()、hsl()、oklab() 或 oklch() 格式, 换算后 L 0-1、C 0-0.4",
+            args=(token_value,)
+        )
+
+    @staticmethod
+    def check_aliases(values: Dict[str, Any],
+                      types: Optional[Dict[str, Optional[str]]] = None,
+                      only: Optional[Set[str]] = None,
+                      names: Optional[NameIndex] = None) -> List[TokenIssue]:
+        """
+        检查Token引用: 悬空引用、循环引用和引用类型不一致
+
+        悬空引用会附带拼写建议 (编辑距离最近的已有Token)。
+
+        Args:
+            values: 规范名称 -> 原始值
+            types: 规范名称 -> DTCG类型 (提供时检查引用两端类型是否一致)
+            only: 只报告涉及这些名称的问题 (引用者或目标在其中, 或环中有成员在其中);
+                None 表示全部报告
+            names: 全部Token名称的编辑距离索引 (None 时在有悬空引用时按 values 构建)
+
+        Returns:
+            问题列表 (悬空/循环为错误, 类型不一致为警告)
+        """
+        graph = AliasGraph(values)
+        if not graph.targets:
+            return []
 
-            # 值验证
-            if isinstance(token_value, str):
-                # 颜色Token验证OKLCH格式
-                if token_name.startswith('color-'):
-                    from .color import ColorUtils
-                    if not ColorUtils.is_valid_oklch(token_value):
-                        result.errors.append(TokenIssue(
-                            level='error',
-                            token_name=token_name,
-                            message=f"颜色Token值格式不正确: {token_value}",
-                            suggestion="使用 oklch(L C H) 格式"
-                        ))
-
-                # 间距Token验证单位
-                elif token_name.startswith('spacing-'):
-                    if not token_value.endswith('rem') and not token_value.endswith('px'):
-                        result.warnings.append(TokenIssue(
-                            level='warning',
-                            token_name=token_name,
-                            message=f"间距Token建议使用rem或px单位: {token_value}",
-                            suggestion="使用相对单位rem或绝对单位px"
-                        ))
+        def involved(name: str, target: str) -> bool:
+            return only is None or name in only or target in only
+
+        issues = []
+        for name, target in graph.dangling:
+            if not involved(name, target):
+                continue
+            if names is None:
+                names = NameIndex(values)
+            close = names.closest(target)
+            issues.append(TokenIssue(
+                'error', name, "引用的Token不存在: {0}",
+                suggestion="检查引用名称或添加 {1} Token" if close is None else "是否想引用 {{{2}}}?",
+                args=(values[name], target, close)
+            ))
+        issues.extend(
+            TokenIssue(
+                level='error',
+                token_name=cycle[0],
+                message=f"循环引用: {graph.describe_cycle(cycle)}",
+                suggestion="打断引用环, 至少让其中一个Token使用字面值"
+            )
+            for cycle in graph.cycles
+            if only is None or not only.isdisjoint(cycle)
+        )
+        if types:
+            for name, target in graph.targets.items():
+                if not involved(name, target):
+                    continue
+                source_type, target_type = types.get(name), types.get(target)
+                if source_type and target_type and source_type != target_type:
+                    issues.append(TokenIssue(
+                        'warning', name, "引用类型不一致: {0} 类型引用了 {1} 类型的 {2}",
+                        suggestion="引用同类型的Token",
+                        args=(source_type, target_type, target)
+                    ))
+        return issues
+
+    @staticmethod
+    def _missing_categories(found_categories) -> List[TokenIssue]:
+        """缺失的必需类别"""
+        return [
+            TokenIssue(
+                level='error',
+                token_name=f'category:{required}',
+                message=f"缺少必需的Token类别: {required}",
+                suggestion=f"添加 {required}-* 相关的Token"
+            )
+            for required in TokenValidator.REQUIRED_CATEGORIES
+            if required not in found_categories
+        ]
+
+    @staticmethod
+    def validate_token_stream(pairs: Iterable[Tuple[str, Any]],
+                              on_issue: Callable[[TokenIssue], None],
+                              duplicate_threshold: Optional[float] = None,
+                              cvd_threshold: Optional[float] = None,
+                              profile: Optional[RuleProfile] = None) -> ValidationResult:
+        """
+        流式验证: 逐个处理 (名称, 值), 问题一产生就交给 on_issue
+
+        逐Token规则 (TOKEN_RULES, 有批量形式的规则也逐个调用) 在读取时完成;
+        缺失类别和引用问题在结束时报告。问题和Token值不在内存中保留; 引用检查需要保留Token名称,
+        近似重复和色觉缺陷检查启用时会额外保留颜色Token。
+
+        Args:
+            pairs: 顶层 (键, 值) 迭代器, 如 iter_token_file() 的返回值 (支持DTCG嵌套分组)
+            on_issue: 问题回调
+            duplicate_threshold: 近似重复颜色的 ΔE_OK 阈值 (None 表示不检查)
+            cvd_threshold: 状态色在色觉缺陷下的最小 ΔE_OK (None 表示不检查)
+            profile: 逐规则耗时统计 (None 表示不计时)
+
+        Returns:
+            只含计数的验证结果
+        """
+        result = ValidationResult(is_valid=True, total_tokens=0)
+        found_categories = set()
+        colors = {} if duplicate_threshold is not None or cvd_threshold is not None else None
+        # 引用检查只需名称和引用值, 字面值不保留
+        references = {}
+
+        def emit(issue: TokenIssue) -> None:
+            if issue.level == 'error':
+                result.streamed_errors += 1
+            else:
+                result.streamed_warnings += 1
+            on_issue(issue)
+
+        for token_name, token_value, token_type in TokenValidator.iter_tokens(pairs):
+            result.total_tokens += 1
+            found_categories.add(token_name.split('-')[0])
+            references[token_name] = token_value if _is_alias(token_value) else None
+            for issue in TokenValidator.check_token(token_name, token_value, token_type, profile):
+                emit(issue)
+            if colors is not None and token_type == 'color' \
+                    and isinstance(token_value, str) and not _is_alias(token_value):
+                colors[token_name] = token_value
+
+        with timed(profile, 'categories'):
+            issues = TokenValidator._missing_categories(found_categories)
+        for issue in issues:
+            emit(issue)
+        with timed(profile, 'aliases', len(references)):
+            issues = TokenValidator.check_aliases(references)
+        for issue in issues:
+            emit(issue)
+        if duplicate_threshold is not None:
+            with timed(profile, 'duplicates', len(colors)):
+                issues = TokenValidator.find_duplicate_colors(colors, duplicate_threshold, prefix='')
+            for issue in issues:
+                emit(issue)
+        if cvd_threshold is not None:
+            with timed(profile, 'cvd', len(colors)):
+                issues = TokenValidator.check_color_vision(colors, cvd_threshold)
+            for issue in issues:
+                emit(issue)
 
         result.is_valid = result.error_count == 0
         return result
 
     @staticmethod
-    def validate_token_file(file_path: Path) -> ValidationResult:
+    def validate_colors(tokens: Dict[str, Any], prefix: str = 'color-') -> List[TokenIssue]:
+        """
+        批量验证颜色Token的OKLCH格式与取值范围
+
+        所有颜色先解析进一个ColorPalette, 再一次性做范围检查。
+
+        Args:
+            tokens: Token字典
+            prefix: 只检查以该前缀开头的Token ('' 表示字典中全部是颜色)
+
+        Returns:
+            按Token顺序排列的错误列表
+        """
+        palette = ColorPalette.from_tokens(tokens, prefix)
+        bad = set(palette.invalid)
+        bad.update(
+            name for name, ok in zip(palette.names, palette.valid_mask()) if not ok
+        )
+        if not bad:
+            return []
+
+        return [
+            TokenValidator._color_issue(token_name, tokens[token_name])
+            for token_name in tokens
+            if token_name in bad
+        ]
+
+    @staticmethod
+    def find_duplicate_colors(tokens: Dict[str, Any],
+                              threshold: float = DUPLICATE_DELTA_E,
+                              prefix: str = 'color-') -> List[TokenIssue]:
+        """
+        查找感知上近似重复的颜色Token (合并候选)
+
+        颜色在OKLab空间建立网格索引, 每个Token报告排在它之前、
+        ΔE_OK 小于阈值的最近Token。
+
+        Args:
+            tokens: Token字典
+            threshold: ΔE_OK 阈值
+            prefix: 只检查以该前缀开头的Token ('' 表示字典中全部是颜色)
+
+        Returns:
+            按Token顺序排列的警告列表
+        """
+        palette = ColorPalette.from_tokens(tokens, prefix)
+        nearest = ColorIndex(palette, threshold).nearest_earlier(threshold)
+        names = palette.names
+        return [
+            TokenIssue(
+                'warning', names[j], "颜色与 {0} 近似重复 (ΔE_OK {1:.4f}): {2}",
+                suggestion="合并为同一颜色或引用 {{{0}}}",
+                args=(names[i], distance, tokens[names[j]])
+            )
+            for j, (i, distance) in sorted(nearest.items())
+        ]
+
+    @staticmethod
+    def check_color_vision(tokens: Dict[str, Any],
+                           threshold: float = CVD_MIN_DELTA_E) -> List[TokenIssue]:
+        """
+        检查状态色在红/绿/蓝色盲下是否仍可区分
+
+        只比较用途相同、状态不同的Token (如 color-error 与 color-success,
+        color-error-bg 与 color-success-bg)。
+
+        Args:
+            tokens: Token字典
+            threshold: 最小 ΔE_OK
+
+        Returns:
+            警告列表
+        """
+        status = {}
+        for name in tokens:
+            parts = name.split('-')
+            if len(parts) >= 2 and parts[0] == 'color' and parts[1] in TokenValidator.STATUS_COLORS:
+                status[name] = (parts[1], '-'.join(parts[2:]))
+        palette = ColorPalette.from_tokens({name: tokens[name] for name in status})
+        names = palette.names
+
+        def different_status(i: int, j: int) -> bool:
+            (group_i, role_i), (group_j, role_j) = status[names[i]], status[names[j]]
+            return group_i != group_j and role_i == role_j
+
+        return [
+            TokenIssue(
+                'warning', names[j], "{0}下与 {1} 难以区分 (ΔE_OK {2:.3f}, 正常视觉 {3:.3f})",
+                suggestion="拉开两者的亮度差, 不要只依赖色相区分状态",
+                args=(CVD_NAMES[deficiency], names[i], simulated, original)
+            )
+            for deficiency, i, j, original, simulated in CVDUtils.confusable_pairs(
+                palette, threshold, pair_filter=different_status
+            )
+        ]
+
+    @staticmethod
+    def find_unused_tokens(tokens: Dict[str, Any], usage: TokenUsage) -> List[TokenIssue]:
+        """
+        源码中没有使用的Token
+
+        被已使用的Token引用 (直接或经过引用链) 的Token也视为已使用。
+        源码中有拼写相近的未定义引用时 (Token名称或引用可能拼错) 在建议中指出。
+
+        Args:
+            tokens: Token字典
+            usage: UsageScanner 的扫描结果
+
+        Returns:
+            按Token顺序排列的警告列表
+        """
+        values = {name: value for name, value, _ in TokenValidator.iter_tokens(tokens)}
+        used = set()
+        for name in usage.sites:
+            # 沿引用链标记, 遇到已标记的Token即停止 (也避免循环引用死循环)
+            while name is not None and name in values and name not in used:
+                used.add(name)
+                name = alias_target(values[name])
+        # 未定义的引用通常很少, 按需构建索引
+        undefined = None
+        issues = []
+        for name in values:
+            if name in used:
+                continue
+            if undefined is None:
+                undefined = NameIndex(usage.undefined(values))
+            close = undefined.closest(usage.prefix + name) if len(undefined) else None
+            issues.append(TokenIssue(
+                'warning', name, "Token未在源码中使用 (扫描了 {0} 个文件)",
+                suggestion=(
+                    "确认不再需要后删除, 或检查源码是否以其他方式引用" if close is None
+                    else "源码中有相近的未定义引用 var(--{1}), 可能是拼写错误"
+                ),
+                args=(usage.files, close)
+            ))
+        return issues
+
+    @staticmethod
+    def find_undefined_tokens(tokens: Dict[str, Any], usage: TokenUsage,
+                              names: Optional[NameIndex] = None) -> List[TokenIssue]:
+        """
+        源码中 var(--x) 引用了不存在的Token (源码自行定义的自定义属性除外),
+        附带拼写建议
+
+        Args:
+            tokens: Token字典
+            usage: UsageScanner 的扫描结果
+            names: 全部Token名称的编辑距离索引 (None 时在有未定义引用时构建)
+
+        Returns:
+            错误列表, 每个未定义的名称一条, 按首次出现的顺序
+        """
+        token_names = [name for name, _, _ in TokenValidator.iter_tokens(tokens)]
+        prefix = usage.prefix
+        issues = []
+        for name, sites in usage.undefined(token_names).items():
+            if names is None:
+                names = NameIndex(token_names)
+            close = names.closest(name[len(prefix):]) if name.startswith(prefix) else None
+            issues.append(TokenIssue(
+                'error', f'--{name}', "源码引用了未定义的Token: var(--{0}) (共 {1} 处, 首次出现于 {2})",
+                suggestion=(
+                    "添加该Token, 或改用已有的Token" if close is None
+                    else "是否想引用 var(--{3}{4})?"
+                ),
+                args=(name, len(sites), sites[0], prefix, close)
+            ))
+        return issues
+
+    @staticmethod
+    def find_hardcoded_values(literals: Iterable[HardcodedLiteral], prefix: str = '') -> List[TokenIssue]:
+        """
+        源码中的硬编码值 (LiteralScanner / scan_sources 的结果) 转换为警告
+
+        Args:
+            literals: 硬编码值
+            prefix: CSS自定义属性前缀 (用于建议中的 var(--前缀名称))
+
+        Returns:
+            警告列表, 问题的 token_name 为 "文件:行:列"
+        """
+        issues = []
+        for item in literals:
+            kind = '颜色' if item.kind == 'color' else '尺寸'
+            site = f"{item.path}:{item.line}:{item.column}"
+            if item.token is None:
+                issues.append(TokenIssue(
+                    'warning', site, "硬编码{0}值: {1}",
+                    suggestion="没有相近的Token, 考虑添加新Token后引用",
+                    args=(kind, item.literal)
+                ))
+            elif item.distance < 1e-6:
+                issues.append(TokenIssue(
+                    'warning', site, "硬编码{0}值: {1}",
+                    suggestion="与Token相同, 改用 var(--{2}{3})",
+                    args=(kind, item.literal, prefix, item.token)
+                ))
+            elif item.kind == 'color':
+                issues.append(TokenIssue(
+                    'warning', site, "硬编码{0}值: {1}",
+                    suggestion="最接近的Token: var(--{2}{3}) (ΔE_OK {4:.4f})",
+                    args=(kind, item.literal, prefix, item.token, item.distance)
+                ))
+            else:
+                issues.append(TokenIssue(
+                    'warning', site, "硬编码{0}值: {1}",
+                    suggestion="最接近的Token: var(--{2}{3}) (相差 {4:g}px)",
+                    args=(kind, item.literal, prefix, item.token, item.distance)
+                ))
+        return issues
+
+    @staticmethod
+    def iter_token_file(file_path: Path) -> Iterable[Tuple[str, Any]]:
+        """
+        增量读取Token文件, 逐个产出 (名称, 值)
+
+        JSON按块读取, YAML逐个构建顶层成员; TOML和JSON5整体解析后逐个产出
+        (见 utils/loaders.py)。
+
+        Args:
+            file_path: Token文件路径 (.json/.yaml/.yml/.toml/.json5, 顶层为对象)
+
+        Returns:
+            (名称, 值) 迭代器; JSON语法错误时抛出 json.JSONDecodeError,
+            其他格式的错误抛出 TokenFileError
+        """
+        yield from iter_token_members(file_path)
+
+    @staticmethod
+    def validate_token_file(file_path: Path,
+                            duplicate_threshold: Optional[float] = None,
+                            cvd_threshold: Optional[float] = None,
+                            cache: Optional[ValidationCache] = None,
+                            profile: Optional[RuleProfile] = None) -> ValidationResult:
         """
         验证Token文件
 
         Args:
             file_path: Token文件路径
+            duplicate_threshold: 近似重复颜色的 ΔE_OK 阈值 (None 表示不检查)
+            cvd_threshold: 状态色在色觉缺陷下的最小 ΔE_OK (None 表示不检查)
+            cache: 增量验证缓存 (None 表示全部重新检查)
+            profile: 逐规则耗时统计 (None 表示不计时)
 
         Returns:
-            验证结果
+            验证结果 (读取或解析失败时为带 'file' 错误的结果)
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                tokens = json.load(f)
-            return TokenValidator.validate_token_structure(tokens)
-        except json.JSONDecodeError as e:
-            return ValidationResult(
-                is_valid=False,
-                total_tokens=0,
-                errors=[TokenIssue(
-                    level='error',
-                    token_name='file',
-                    message=f"JSON解析错误: {e}"
-                )]
+            tokens = load_token_file(file_path)
+            return TokenValidator.validate_token_structure(
+                tokens, duplicate_threshold, cvd_threshold, cache, profile
             )
         except Exception as e:
             return ValidationResult(
@@ -200,6 +988,6 @@ class TokenValidator:
                 errors=[TokenIssue(
                     level='error',
                     token_name='file',
-                    message=f"文件读取错误: {e}"
+                    message=load_error_message(e)
                 )]
             )
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Token使用情况扫描模块
+
+一次遍历前端源码 (.css/.scss/.tsx/.vue/.svelte), 建立 Token名称 -> 使用位置
+的倒排索引。所有Token名称 (CSS自定义属性 --name 和 Sass变量 $name 两种写法)
+编译进一个 Aho-Corasick 自动机, 每个文件只扫描一遍, 耗时与源码长度成正比,
+与Token数量无关。同时收集 var(--x) 引用和源码中定义的自定义属性, 用于
+找出引用了不存在的Token的位置。
+"""
+
+import re
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 默认扫描的源码扩展名
+SOURCE_EXTENSIONS = frozenset({'.css', '.scss', '.tsx', '.vue', '.svelte'})
+
+# 遍历目录时跳过的目录 (以 . 开头的目录也跳过)
+SKIP_DIRS = frozenset({'node_modules'})
+
+# Token在源码中的写法前缀
+USAGE_MARKERS = ('--', '$')
+
+# 标识符字符: 匹配前后紧邻这些字符时不是完整的名称 (如 .btn--primary)
+_NAME_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_')
+
+# var(--x) 引用与 --x: 定义 (TSX 中可能带引号, 如 {'--x': 1})
+_VAR_REFERENCE = re.compile(r'var\(\s*--([\w-]+)')
+_PROPERTY_DEFINITION = re.compile(r'(?<![\w-])--([\w-]+)[\'"]?\s*:')
+
+
+def iter_sources(paths: Iterable[Path],
+                 extensions: Iterable[str] = SOURCE_EXTENSIONS) -> Iterator[Path]:
+    """
+    展开要扫描的源文件
+
+    Args:
+        paths: 文件或目录 (目录递归查找, 跳过 node_modules 和隐藏目录)
+        extensions: 目录中要扫描的扩展名 (直接给出的文件不受限制)
+
+    Yields:
+        源文件路径 (目录内按路径排序)
+    """
+    extensions = frozenset(extensions)
+    for path in paths:
+        path = Path(path)
+        if not path.is_dir():
+            yield path
+            continue
+        for file_path in sorted(path.rglob('*')):
+            parts = file_path.relative_to(path).parts
+            if any(part in SKIP_DIRS or part.startswith('.') for part in parts):
+                continue
+            if file_path.suffix in extensions and file_path.is_file():
+                yield file_path
+
+
+class TokenMatcher:
+    """
+    Aho-Corasick 多模式匹配自动机
+
+    goto 为每个状态的转移字典, fail 为失败链接; 每个状态的输出在构建时
+    已沿失败链接合并, 扫描时不需要再回溯。自动机处于根状态时用正则跳到
+    下一个可能的模式开头 (前两个字符), 不匹配的长段文本不逐字符处理。
+    """
+
+    __slots__ = ('patterns', '_goto', '_fail', '_out', '_first')
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Args:
+            patterns: 模式字符串 (不能为空字符串)
+        """
+        self.patterns: List[str] = list(patterns)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[int, ...]] = [()]
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("模式不能为空字符串")
+            state = 0
+            for ch in pattern:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = goto[state][ch] = len(goto)
+                    goto.append({})
+                    out.append(())
+                state = next_state
+            out[state] += (index,)
+
+        # 按广度优先顺序计算失败链接, 父状态的链接总是先于子状态确定
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(ch, 0)
+                out[child] += out[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        # 根状态下的跳转: 所有模式的前两个字符 (单字符模式取其本身)
+        heads = sorted({pattern[:2] for pattern in self.patterns}, key=len, reverse=True)
+        self._first = re.compile('|'.join(map(re.escape, heads))) if heads else None
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        找出所有 (可重叠的) 模式出现
+
+        Args:
+            text: 待扫描文本
+
+        Yields:
+            (起始位置, 模式序号), 按结束位置排列
+        """
+        if self._first is None:
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        lengths = [len(pattern) for pattern in self.patterns]
+        search = self._first.search
+        state = 0
+        i = 0
+        n = len(text)
+        while i < n:
+            if state == 0:
+                match = search(text, i)
+                if match is None:
+                    return
+                i = match.start()
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                yield i - lengths[index] + 1, index
+            i += 1
+
+
+@dataclass
+class UsageSite:
+    """Token在源码中的一处使用 (行列号从1开始)"""
+    path: str
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}:{self.column}"
+
+
+@dataclass
+class TokenUsage:
+    """源码扫描结果"""
+    # CSS自定义属性前缀 (如 "ds-" 表示 --ds-color-primary 对应 color-primary)
+    prefix: str = ''
+    files: int = 0
+    # Token名称 -> 使用位置 (不含 --name: / $name: 形式的定义)
+    sites: Dict[str, List[UsageSite]] = field(default_factory=dict)
+    # var(--x) 引用的自定义属性 (不含 --) -> 引用位置
+    references: Dict[str, List[UsageSite]] = field(default_factory=dict)
+    # 源码中自行定义的自定义属性 (不含 --)
+    defined: Set[str] = field(default_factory=set)
+
+    def undefined(self, token_names: Iterable[str]) -> Dict[str, List[UsageSite]]:
+        """
+        引用了既不是Token、也没有在源码中定义的自定义属性
+
+        Args:
+            token_names: 全部Token名称
+
+        Returns:
+            自定义属性名称 (不含 --) -> 引用位置, 按首次出现的顺序
+        """
+        known = {self.prefix + name for name in token_names}
+        return {
+            name: sites for name, sites in self.references.items()
+            if name not in known and name not in self.defined
+        }
+
+
+class UsageScanner:
+    """Token使用情况扫描器"""
+
+    __slots__ = ('names', 'prefix', 'extensions', '_matcher')
+
+    def __init__(self, token_names: Iterable[str], prefix: str = '',
+                 extensions: Iterable[str] = SOURCE_EXTENSIONS):
+        """
+        Args:
+            token_names: 要查找的Token名称 (规范名称, 如 color-primary)
+            prefix: CSS自定义属性和Sass变量的前缀 (如 "ds-")
+            extensions: 遍历目录时扫描的扩展名
+        """
+        self.names: List[str] = list(dict.fromkeys(token_names))
+        self.prefix = prefix
+        self.extensions = frozenset(extensions)
+        # 模式序号 i 对应 names[i // len(USAGE_MARKERS)]
+        self._matcher = TokenMatcher(
+            marker + prefix + name for name in self.names for marker in USAGE_MARKERS
+        )
+
+    def iter_sources(self, paths: Iterable[Path]) -> Iterator[Path]:
+        """展开要扫描的源文件 (见模块函数 iter_sources)"""
+        return iter_sources(paths, self.extensions)
+
+    def scan(self, paths: Iterable[Path]) -> TokenUsage:
+        """
+        扫描源文件和目录
+
+        Args:
+            paths: 文件或目录
+
+        Returns:
+            TokenUsage
+        """
+        usage = TokenUsage(prefix=self.prefix)
+        for file_path in self.iter_sources(paths):
+            text = file_path.read_text(encoding='utf-8', errors='replace')
+            self.scan_text(text, str(file_path), usage)
+        return usage
+
+    def scan_text(self, text: str, path: str, usage: Optional[TokenUsage] = None) -> TokenUsage:
+        """
+        扫描一段源码, 结果累加到 usage
+
+        Args:
+            text: 源码内容
+            path: 报告中使用的文件路径
+            usage: 累加的扫描结果 (None 时新建)
+
+        Returns:
+            usage
+        """
+        if usage is None:
+            usage = TokenUsage(prefix=self.prefix)
+        usage.files += 1
+        line_starts: Optional[List[int]] = None
+
+        def site(position: int) -> UsageSite:
+            nonlocal line_starts
+            if line_starts is None:
+                line_starts = [0]
+                line_starts.extend(m.end() for m in re.finditer('\n', text))
+            line = bisect_right(line_starts, position)
+            return UsageSite(path, line, position - line_starts[line - 1] + 1)
+
+        names = self.names
+        patterns = self._matcher.patterns
+        markers = len(USAGE_MARKERS)
+        n = len(text)
+        for start, index in self._matcher.finditer(text):
+            end = start + len(patterns[index])
+            # 名称必须完整: 前后都不能紧邻标识符字符
+            if (start and text[start - 1] in _NAME_CHARS) or (end < n and text[end] in _NAME_CHARS):
+                continue
+            # --name: / $name: 是定义而不是使用
+            rest = end
+            while rest < n and text[rest] in ' \t':
+                rest += 1
+            if rest < n and text[rest] == ':':
+                continue
+            usage.sites.setdefault(names[index // markers], []).append(site(start))
+
+        for match in _VAR_REFERENCE.finditer(text):
+            usage.references.setdefault(match.group(1), []).append(site(match.start()))
+        usage.defined.update(_PROPERTY_DEFINITION.findall(text))
+        return usage
@@ -8,6 +8,9 @@
 用法:
     python check-accessibility.py <html-file>
     python check-accessibility.py <html-file> --format json
+    python check-accessibility.py <html-file> --contrast-model apca
+
+报告以流式输出: 问题在检查过程中逐个写出, 状态和计数在报告末尾。
 
 示例:
     python check-accessibility.py index.html
@@ -18,14 +21,14 @@ import sys
 import argparse
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 
 # 添加父目录到路径以导入共享模块
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.color import ColorUtils
-from utils.reporter import Reporter
+from utils.color import ColorUtils, ColorPalette, WCAG_THRESHOLDS
+from utils.reporter import BaseStreamReporter
 
 
 @dataclass
@@ -45,14 +48,21 @@ class A11yResult:
     total_checks: int
     passed: int
     issues: List[A11yIssue] = field(default_factory=list)
+    # 级别 -> 问题数 (流式检查时 issues 为空, 计数以此为准)
+    level_counts: Dict[str, int] = field(default_factory=dict)
+
+    def _count(self, level: str) -> int:
+        if self.level_counts:
+            return self.level_counts.get(level, 0)
+        return sum(1 for i in self.issues if i.level == level)
 
     @property
     def critical_count(self) -> int:
-        return sum(1 for i in self.issues if i.level == 'critical')
+        return self._count('critical')
 
     @property
     def serious_count(self) -> int:
-        return sum(1 for i in self.issues if i.level == 'serious')
+        return self._count('serious')
 
     @property
     def is_valid(self) -> bool:
@@ -62,69 +72,60 @@ class A11yResult:
 class AccessibilityChecker:
     """无障碍检查器"""
 
-    def __init__(self):
+    def __init__(self, contrast_model: str = 'wcag2', font_size: float = 16, font_weight: int = 400):
+        """
+        Args:
+            contrast_model: 对比度模型 ('wcag2' 或 'apca')
+            font_size: APCA模式下按此字号 (px) 查找阈值
+            font_weight: APCA模式下按此字重查找阈值
+        """
         self.issues: List[A11yIssue] = []
+        self.contrast_model = contrast_model
+        self.font_size = font_size
+        self.font_weight = font_weight
 
-    def check_html(self, html_content: str) -> A11yResult:
+    def check_html(self, html_content: str,
+                   on_issue: Optional[Callable[[A11yIssue], None]] = None) -> A11yResult:
         """
         检查HTML无障碍问题
 
         Args:
             html_content: HTML内容
+            on_issue: 每发现一个问题立即调用 (如 A11yStreamReporter.issue);
+                传入时问题不保留在结果中, 只计数
 
         Returns:
             检查结果
         """
         self.issues = []
+        counts: Dict[str, int] = {}
         checks = 0
         passed = 0
 
-        # 1. 检查图片alt属性
-        checks += 1
-        img_issues = self._check_images(html_content)
-        if not img_issues:
-            passed += 1
-        self.issues.extend(img_issues)
-
-        # 2. 检查链接文本
-        checks += 1
-        link_issues = self._check_links(html_content)
-        if not link_issues:
-            passed += 1
-        self.issues.extend(link_issues)
-
-        # 3. 检查表单标签
-        checks += 1
-        form_issues = self._check_forms(html_content)
-        if not form_issues:
-            passed += 1
-        self.issues.extend(form_issues)
-
-        # 4. 检查标题层级
-        checks += 1
-        heading_issues = self._check_headings(html_content)
-        if not heading_issues:
-            passed += 1
-        self.issues.extend(heading_issues)
-
-        # 5. 检查按钮
-        checks += 1
-        button_issues = self._check_buttons(html_content)
-        if not button_issues:
-            passed += 1
-        self.issues.extend(button_issues)
-
-        # 6. 检查颜色对比度 (简化版)
-        checks += 1
-        contrast_issues = self._check_contrast(html_content)
-        if not contrast_issues:
-            passed += 1
-        self.issues.extend(contrast_issues)
+        for check in (
+            self._check_images,    # 1. 图片alt属性
+            self._check_links,     # 2. 链接文本
+            self._check_forms,     # 3. 表单标签
+            self._check_headings,  # 4. 标题层级
+            self._check_buttons,   # 5. 按钮
+            self._check_contrast,  # 6. 颜色对比度 (简化版)
+        ):
+            checks += 1
+            found = check(html_content)
+            if not found:
+                passed += 1
+            for issue in found:
+                counts[issue.level] = counts.get(issue.level, 0) + 1
+                if on_issue is not None:
+                    on_issue(issue)
+                else:
+                    self.issues.append(issue)
 
         return A11yResult(
             total_checks=checks,
             passed=passed,
-            issues=self.issues
+            issues=self.issues,
+            level_counts=counts
         )
 
     def _check_images(self, html: str) -> List[A11yIssue]:
@@ -327,98 +328,117 @@ class AccessibilityChecker:
             html
         )
 
+        # 先收集所有颜色对, 再批量计算对比度
+        foregrounds, backgrounds = [], []
         for match in color_matches:
             # 简化处理 - 实际需要完整解析CSS
             colors = re.findall(r'oklch\(([^)]+)\)', match.group(0))
             if len(colors) >= 2:
-                fg = f"oklch({colors[0]})"
-                bg = f"oklch({colors[1]})"
-                ratio = ColorUtils.calculate_contrast_ratio(fg, bg)
+                foregrounds.append(f"oklch({colors[0]})")
+                backgrounds.append(f"oklch({colors[1]})")
+
+        if not foregrounds:
+            return issues
 
-                if ratio < 4.5:
+        values = ColorPalette.from_values(foregrounds).contrast_ratios(
+            ColorPalette.from_values(backgrounds), self.contrast_model
+        )
+
+        if self.contrast_model == 'apca':
+            threshold = ColorUtils.apca_min_contrast(self.font_size, self.font_weight)
+            for lc in values:
+                if abs(lc) < threshold:
                     issues.append(A11yIssue(
                         level='critical',
                         category='contrast',
                         element='css',
-                        message=f'颜色对比度不足: {ratio:.2f}:1 (要求 4.5:1)',
-                        suggestion='调整前景色或背景色以提高对比度'
+                        message=f'APCA对比度不足: Lc {lc:.1f} '
+                                f'(要求 |Lc| ≥ {threshold}, {self.font_size:g}px/{self.font_weight})',
+                        suggestion='调整前景色或背景色, 或增大字号/字重'
                     ))
+            return issues
+
+        threshold = WCAG_THRESHOLDS[('AA', False)]
+        for ratio in values:
+            if ratio < threshold:
+                issues.append(A11yIssue(
+                    level='critical',
+                    category='contrast',
+                    element='css',
+                    message=f'颜色对比度不足: {ratio:.2f}:1 (要求 {threshold}:1)',
+                    suggestion='调整前景色或背景色以提高对比度'
+                ))
 
         return issues
 
 
-def format_report(result: A11yResult, output_format: str = 'text') -> str:
-    """格式化报告"""
-    if output_format == 'json':
-        import json
-        return json.dumps({
+# 问题级别图标
+LEVEL_ICONS = {'critical': '🔴', 'serious': '🟠', 'moderate': '🟡', 'minor': '⚪'}
+
+
+class A11yStreamReporter(BaseStreamReporter):
+    """无障碍检查的流式报告 (issue() 接收 A11yIssue, end() 接收 A11yResult)"""
+
+    title = "无障碍检查报告"
+
+    def text_issue(self, issue: A11yIssue) -> str:
+        text = f"{LEVEL_ICONS.get(issue.level, '⚪')} [{issue.level.upper()}] {issue.element}\n"
+        if issue.line:
+            text += f"    行: {issue.line}\n"
+        text += f"    {issue.message}\n"
+        if issue.suggestion:
+            text += f"    💡 {issue.suggestion}\n"
+        return text
+
+    def markdown_issue(self, issue: A11yIssue) -> str:
+        text = f"- {LEVEL_ICONS.get(issue.level, '⚪')} **{issue.level.upper()}** `{issue.element}`"
+        if issue.line:
+            text += f" (行 {issue.line})"
+        text += f": {issue.message}"
+        if issue.suggestion:
+            text += f" (**建议**: {issue.suggestion})"
+        return text + "\n"
+
+    def issue_dict(self, issue: A11yIssue) -> Dict[str, Any]:
+        return {
+            'level': issue.level,
+            'category': issue.category,
+            'element': issue.element,
+            'message': issue.message,
+            'suggestion': issue.suggestion,
+            'line': issue.line
+        }
+
+    def summary(self, result: A11yResult) -> List[Tuple[str, Any]]:
+        return [
+            ("状态", '✅ 通过' if result.is_valid else '❌ 失败'),
+            ("检查项", f"{result.passed}/{result.total_checks} 通过"),
+            ("严重问题", result.critical_count),
+            ("重要问题", result.serious_count),
+        ]
+
+    def summary_dict(self, result: A11yResult) -> Dict[str, Any]:
+        return {
             'is_valid': result.is_valid,
             'total_checks': result.total_checks,
             'passed': result.passed,
             'critical_issues': result.critical_count,
-            'serious_issues': result.serious_count,
-            'issues': [
-                {
-                    'level': i.level,
-                    'category': i.category,
-                    'element': i.element,
-                    'message': i.message,
-                    'suggestion': i.suggestion,
-                    'line': i.line
-                }
-                for i in result.issues
-            ]
-        }, ensure_ascii=False, indent=2)
-
-    elif output_format == 'markdown':
-        lines = [
-            "# 无障碍检查报告\n",
-            f"**状态**: {'✅ 通过' if result.is_valid else '❌ 失败'}",
-            f"**检查项**: {result.passed}/{result.total_checks} 通过",
-            f"**严重问题**: {result.critical_count}",
-            f"**重要问题**: {result.serious_count}\n"
-        ]
+            'serious_issues': result.serious_count
+        }
 
-        if result.issues:
-            lines.append("## 问题列表\n")
-            for issue in result.issues:
-                emoji = {'critical': '🔴', 'serious': '🟠', 'moderate': '🟡', 'minor': '⚪'}
-                lines.append(f"### {emoji.get(issue.level, '⚪')} {issue.level.upper()}: {issue.element}")
-                if issue.line:
-                    lines.append(f"**行**: {issue.line}")
-                lines.append(f"{issue.message}")
-                if issue.suggestion:
-                    lines.append(f"**建议**: {issue.suggestion}")
-                lines.append("")
-
-        return "\n".join(lines)
-
-    else:  # text
-        lines = [
-            "=" * 60,
-            "无障碍检查报告",
-            "=" * 60,
-            f"状态: {'✅ 通过' if result.is_valid else '❌ 失败'}",
-            f"检查项: {result.passed}/{result.total_checks} 通过",
-            f"严重问题: {result.critical_count}",
-            f"重要问题: {result.serious_count}",
-            ""
-        ]
 
-        if result.issues:
-            lines.append("问题列表:")
-            lines.append("-" * 40)
-            for issue in result.issues:
-                emoji = {'critical': '🔴', 'serious': '🟠', 'moderate': '🟡', 'minor': '⚪'}
-                lines.append(f"\n{emoji.get(issue.level, '⚪')} [{issue.level.upper()}] {issue.element}")
-                if issue.line:
-                    lines.append(f"    行: {issue.line}")
-                lines.append(f"    {issue.message}")
-                if issue.suggestion:
-                    lines.append(f"    💡 {issue.suggestion}")
+def format_report(result: A11yResult, output_format: str = 'text') -> str:
+    """
+    格式化完整报告 (与命令行的流式输出相同)
+
+    Args:
+        result: 检查结果 (需保留 issues, 即检查时未传入 on_issue)
+        output_format: 输出格式 ('text', 'json', 'markdown')
 
-        lines.append("\n" + "=" * 60)
-        return "\n".join(lines)
+    Returns:
+        报告文本
+    """
+    return A11yStreamReporter.render(result.issues, result, output_format)
 
 
 def main():
@@ -431,6 +451,12 @@ def main():
     parser.add_argument('html_file', type=Path, help='HTML文件路径')
     parser.add_argument('--format', '-f', choices=['text', 'json', 'markdown'], default='text')
     parser.add_argument('--output', '-o', type=Path, help='输出文件路径')
+    parser.add_argument('--contrast-model', choices=['wcag2', 'apca'], default='wcag2',
+                        help='对比度模型 (默认: wcag2)')
+    parser.add_argument('--font-size', type=float, default=16,
+                        help='APCA阈值查找使用的字号px (默认: 16)')
+    parser.add_argument('--font-weight', type=int, default=400,
+                        help='APCA阈值查找使用的字重 (默认: 400)')
 
     args = parser.parse_args()
 
@@ -441,18 +467,25 @@ def main():
     with open(args.html_file, 'r', encoding='utf-8') as f:
         html_content = f.read()
 
-    checker = AccessibilityChecker()
-    result = checker.check_html(html_content)
-
-    report = format_report(result, args.format)
-
     if args.output:
         args.output.parent.mkdir(parents=True, exist_ok=True)
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(report)
-        print(f"📄 报告已保存到: {args.output}")
+        out = open(args.output, 'w', encoding='utf-8')
     else:
-        print(report)
+        out = sys.stdout
+
+    # 问题边检查边写出
+    checker = AccessibilityChecker(args.contrast_model, args.font_size, args.font_weight)
+    try:
+        reporter = A11yStreamReporter(out, args.format)
+        reporter.begin()
+        result = checker.check_html(html_content, reporter.issue)
+        reporter.end(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.output:
+        print(f"📄 报告已保存到: {args.output}")
 
     # 摘要
     status = "✅ 通过" if result.is_valid else "❌ 失败"
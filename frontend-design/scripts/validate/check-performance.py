@@ -12,15 +12,22 @@
 示例:
     python check-performance.py ./src
     python check-performance.py ./src --format markdown --output perf-report.md
+
+报告以流式输出: 问题在扫描过程中逐个写出, 状态和计数在报告末尾。
 """
 
 import sys
 import argparse
 import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 
+# 添加父目录到路径以导入共享模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.reporter import BaseStreamReporter
+
 
 @dataclass
 class PerformanceIssue:
@@ -55,18 +62,25 @@ class PerformanceChecker:
 
     def __init__(self):
         self.issues: List[PerformanceIssue] = []
+        self._on_issue: Optional[Callable[[PerformanceIssue], None]] = None
+        self._counts: Dict[str, int] = {}
 
-    def check_directory(self, directory: Path) -> PerformanceResult:
+    def check_directory(self, directory: Path,
+                        on_issue: Optional[Callable[[PerformanceIssue], None]] = None) -> PerformanceResult:
         """
         检查目录性能
 
         Args:
             directory: 项目目录
+            on_issue: 每发现一个问题立即调用 (如 PerformanceStreamReporter.issue);
+                传入时问题不保留在结果中, 只计数
 
         Returns:
             检查结果
         """
         self.issues = []
+        self._on_issue = on_issue
+        self._counts = {}
         files_checked = 0
 
         for file_path in directory.rglob('*'):
@@ -74,35 +88,31 @@ class PerformanceChecker:
                 files_checked += 1
                 self._check_file(file_path)
 
-        critical = sum(1 for i in self.issues if i.level == 'critical')
-        warning = sum(1 for i in self.issues if i.level == 'warning')
-
+        counts = self._counts
         return PerformanceResult(
             total_files=files_checked,
-            total_issues=len(self.issues),
-            critical_count=critical,
-            warning_count=warning,
+            total_issues=sum(counts.values()),
+            critical_count=counts.get('critical', 0),
+            warning_count=counts.get('warning', 0),
             issues=self.issues
         )
 
+    def _add(self, issue: PerformanceIssue) -> None:
+        """记录一个问题: 计数, 并交给 on_issue 或保存到 issues"""
+        self._counts[issue.level] = self._counts.get(issue.level, 0) + 1
+        if self._on_issue is not None:
+            self._on_issue(issue)
+        else:
+            self.issues.append(issue)
+
     def _check_file(self, file_path: Path):
         """检查单个文件"""
+        # 只捕获读取错误; 流式输出的写入错误 (如管道关闭) 不能当作文件问题再次写出
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-            lines = content.split('\n')
-
-            # 检查各种性能问题
-            self._check_imports(file_path, lines)
-            self._check_large_components(file_path, lines)
-            self._check_missing_keys(file_path, lines)
-            self._check_inline_styles(file_path, lines)
-            self._check_missing_memo(file_path, lines)
-            self._check_large_images(file_path, lines)
-            self._check_missing_lazy_loading(file_path, lines)
-
-        except Exception as e:
-            self.issues.append(PerformanceIssue(
+        except (OSError, ValueError) as e:
+            self._add(PerformanceIssue(
                 level='warning',
                 category='code',
                 file=str(file_path),
@@ -110,6 +120,17 @@ class PerformanceChecker:
                 message=f'文件分析失败: {e}',
                 suggestion='检查文件编码和格式'
             ))
+            return
+        lines = content.split('\n')
+
+        # 检查各种性能问题
+        self._check_imports(file_path, lines)
+        self._check_large_components(file_path, lines)
+        self._check_missing_keys(file_path, lines)
+        self._check_inline_styles(file_path, lines)
+        self._check_missing_memo(file_path, lines)
+        self._check_large_images(file_path, lines)
+        self._check_missing_lazy_loading(file_path, lines)
 
     def _check_imports(self, file_path: Path, lines: List[str]):
         """检查import语句"""
@@ -123,7 +144,7 @@ class PerformanceChecker:
             }
             for pattern, lib in large_imports.items():
                 if pattern in line:
-                    self.issues.append(PerformanceIssue(
+                    self._add(PerformanceIssue(
                         level='warning',
                         category='bundle',
                         file=str(file_path),
@@ -134,7 +155,7 @@ class PerformanceChecker:
 
             # 检查相对路径导入
             if re.search(r"from\s+['\"]\.\.\/\.\.\/\.\.", line):
-                self.issues.append(PerformanceIssue(
+                self._add(PerformanceIssue(
                     level='info',
                     category='code',
                     file=str(file_path),
@@ -146,7 +167,7 @@ class PerformanceChecker:
     def _check_large_components(self, file_path: Path, lines: List[str]):
         """检查大型组件"""
         if len(lines) > 300:
-            self.issues.append(PerformanceIssue(
+            self._add(PerformanceIssue(
                 level='warning',
                 category='code',
                 file=str(file_path),
@@ -159,7 +180,7 @@ class PerformanceChecker:
         """检查缺失的key属性"""
         for i, line in enumerate(lines, 1):
             if '.map(' in line and 'key=' not in line and 'key:' not in line:
-                self.issues.append(PerformanceIssue(
+                self._add(PerformanceIssue(
                     level='critical',
                     category='rendering',
                     file=str(file_path),
@@ -175,7 +196,7 @@ class PerformanceChecker:
             if 'style={{' in line:
                 inline_style_count += 1
                 if inline_style_count > 3:
-                    self.issues.append(PerformanceIssue(
+                    self._add(PerformanceIssue(
                         level='info',
                         category='rendering',
                         file=str(file_path),
@@ -192,7 +213,7 @@ class PerformanceChecker:
         has_memo = any('React.memo' in line or 'memo(' in line for line in lines)
 
         if (has_use_callback or has_use_memo) and not has_memo:
-            self.issues.append(PerformanceIssue(
+            self._add(PerformanceIssue(
                 level='info',
                 category='rendering',
                 file=str(file_path),
@@ -206,7 +227,7 @@ class PerformanceChecker:
         for i, line in enumerate(lines, 1):
             if re.search(r'<img[^>]*(src=).*\.(png|jpg|jpeg)', line, re.IGNORECASE):
                 if 'loading=' not in line and 'loading=' not in lines[min(i, len(lines)-1)]:
-                    self.issues.append(PerformanceIssue(
+                    self._add(PerformanceIssue(
                         level='warning',
                         category='network',
                         file=str(file_path),
@@ -220,7 +241,7 @@ class PerformanceChecker:
         has_dynamic_import = any('import(' in line for line in lines)
 
         if not has_dynamic_import and len(lines) > 200:
-            self.issues.append(PerformanceIssue(
+            self._add(PerformanceIssue(
                 level='info',
                 category='bundle',
                 file=str(file_path),
@@ -230,88 +251,67 @@ class PerformanceChecker:
             ))
 
 
-def format_report(result: PerformanceResult, output_format: str = 'text') -> str:
-    """格式化报告"""
-    if output_format == 'json':
-        import json
-        return json.dumps({
+# 问题级别图标
+LEVEL_ICONS = {'critical': '🔴', 'warning': '🟡', 'info': '⚪'}
+
+
+class PerformanceStreamReporter(BaseStreamReporter):
+    """性能检查的流式报告 (issue() 接收 PerformanceIssue, end() 接收 PerformanceResult)"""
+
+    title = "性能检查报告"
+
+    def text_issue(self, issue: PerformanceIssue) -> str:
+        return (f"{LEVEL_ICONS.get(issue.level, '⚪')} [{issue.level.upper()}] "
+                f"【{issue.category.upper()}】 {Path(issue.file).name}:{issue.line}\n"
+                f"    {issue.message}\n"
+                f"    💡 {issue.suggestion}\n")
+
+    def markdown_issue(self, issue: PerformanceIssue) -> str:
+        return (f"- {LEVEL_ICONS.get(issue.level, '⚪')} **{issue.category.title()}** "
+                f"`{Path(issue.file).name}:{issue.line}`: {issue.message} "
+                f"(**建议**: {issue.suggestion})\n")
+
+    def issue_dict(self, issue: PerformanceIssue) -> Dict[str, Any]:
+        return {
+            'level': issue.level,
+            'category': issue.category,
+            'file': issue.file,
+            'line': issue.line,
+            'message': issue.message,
+            'suggestion': issue.suggestion
+        }
+
+    def summary(self, result: PerformanceResult) -> List[Tuple[str, Any]]:
+        return [
+            ("状态", '✅ 通过' if result.is_valid else '⚠️ 需要优化'),
+            ("检查文件", result.total_files),
+            ("发现问题", result.total_issues),
+            ("严重", result.critical_count),
+            ("警告", result.warning_count),
+        ]
+
+    def summary_dict(self, result: PerformanceResult) -> Dict[str, Any]:
+        return {
             'is_valid': result.is_valid,
             'total_files': result.total_files,
             'total_issues': result.total_issues,
             'critical_count': result.critical_count,
-            'warning_count': result.warning_count,
-            'issues': [
-                {
-                    'level': i.level,
-                    'category': i.category,
-                    'file': i.file,
-                    'line': i.line,
-                    'message': i.message,
-                    'suggestion': i.suggestion
-                }
-                for i in result.issues
-            ]
-        }, ensure_ascii=False, indent=2)
-
-    elif output_format == 'markdown':
-        lines = [
-            "# 性能检查报告\n",
-            f"**状态**: {'✅ 通过' if result.is_valid else '⚠️ 需要优化'}",
-            f"**检查文件**: {result.total_files}",
-            f"**发现问题**: {result.total_issues}",
-            f"**严重**: {result.critical_count}",
-            f"**警告**: {result.warning_count}\n"
-        ]
+            'warning_count': result.warning_count
+        }
 
-        if result.issues:
-            # 按类别分组
-            by_category: Dict[str, List[PerformanceIssue]] = {}
-            for issue in result.issues:
-                by_category.setdefault(issue.category, []).append(issue)
-
-            for category, issues in by_category.items():
-                lines.append(f"## {category.title()}\n")
-                for issue in issues:
-                    emoji = {'critical': '🔴', 'warning': '🟡', 'info': '⚪'}.get(issue.level, '⚪')
-                    lines.append(f"### {emoji} `{Path(issue.file).name}:{issue.line}`")
-                    lines.append(f"{issue.message}")
-                    lines.append(f"**建议**: {issue.suggestion}")
-                    lines.append("")
-
-        return "\n".join(lines)
-
-    else:  # text
-        lines = [
-            "=" * 60,
-            "性能检查报告",
-            "=" * 60,
-            f"状态: {'✅ 通过' if result.is_valid else '⚠️ 需要优化'}",
-            f"检查文件: {result.total_files}",
-            f"发现问题: {result.total_issues}",
-            f"严重: {result.critical_count}",
-            f"警告: {result.warning_count}",
-            ""
-        ]
 
-        if result.issues:
-            lines.append("问题列表:")
-            lines.append("-" * 40)
-
-            # 按类别分组
-            by_category: Dict[str, List[PerformanceIssue]] = {}
-            for issue in result.issues:
-                by_category.setdefault(issue.category, []).append(issue)
+def format_report(result: PerformanceResult, output_format: str = 'text') -> str:
+    """
+    格式化完整报告 (与命令行的流式输出相同)
 
-            for category, issues in by_category.items():
-                lines.append(f"\n【{category.upper()}】")
-                for issue in issues:
-                    emoji = {'critical': '🔴', 'warning': '🟡', 'info': '⚪'}.get(issue.level, '⚪')
-                    lines.append(f"\n{emoji} [{issue.level.upper()}] {Path(issue.file).name}:{issue.line}")
-                    lines.append(f"    {issue.message}")
-                    lines.append(f"    💡 {issue.suggestion}")
+    Args:
+        result: 检查结果 (需保留 issues, 即检查时未传入 on_issue)
+        output_format: 输出格式 ('text', 'json', 'markdown')
 
-        lines.append("\n" + "=" * 60)
-        return "\n".join(lines)
+    Returns:
+        报告文本
+    """
+    return PerformanceStreamReporter.render(result.issues, result, output_format)
 
 
 def main():
@@ -332,18 +332,25 @@ def main():
         print(f"❌ 目录不存在: {args.directory}", file=sys.stderr)
         return 1
 
-    checker = PerformanceChecker()
-    result = checker.check_directory(args.directory)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        out = open(args.output, 'w', encoding='utf-8')
+    else:
+        out = sys.stdout
 
-    report = format_report(result, args.format)
+    # 问题边扫描边写出
+    checker = PerformanceChecker()
+    try:
+        reporter = PerformanceStreamReporter(out, args.format)
+        reporter.begin()
+        result = checker.check_directory(args.directory, reporter.issue)
+        reporter.end(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
 
     if args.output:
-        args.output.parent.mkdir(parents=True, exist_ok=True)
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(report)
         print(f"📄 报告已保存到: {args.output}")
-    else:
-        print(report)
 
     # 摘要
     status = "✅ 通过" if result.is_valid else "⚠️ 需要优化"
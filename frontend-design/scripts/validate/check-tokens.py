@@ -4,33 +4,57 @@
 Design Token 验证工具
 
 验证Design Token的命名规范、格式和结构完整性。
+支持平铺格式和W3C Design Tokens (DTCG) 嵌套格式 ($value/$type)。
+Token文件可以是 JSON、YAML (需要 PyYAML)、TOML 或 JSON5, 按扩展名选择解析器。
 
 用法:
     python check-tokens.py <token-file>
     python check-tokens.py <token-file> --format json
     python check-tokens.py <token-file> --output report.md
+    python check-tokens.py <token-file> --duplicates 0.02
+    python check-tokens.py <token-file> --cvd
+    python check-tokens.py <token-file> --stream
+    python check-tokens.py <token-file> --no-cache
+    python check-tokens.py <目录或glob> [...] --jobs 8
+    python check-tokens.py <token-file> --profile-rules
+    python check-tokens.py <token-file> --baseline <old-token-file>
+    python check-tokens.py <token-file> --usage <源码目录> [--css-prefix ds-]
+    python check-tokens.py <token-file> --hardcoded <源码目录> [--jobs 8]
+    python check-tokens.py <base-file> --brand <品牌文件...> --mode <模式文件...>
 
 示例:
     python check-tokens.py tokens.json
     python check-tokens.py tokens.json --format markdown --output report.md
+    python check-tokens.py brands/ "themes/**/*.tokens.json"
 """
 
+import os
 import sys
+import glob
 import argparse
-import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, NoReturn, Optional, Tuple
 
 # 添加父目录到路径以导入共享模块
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.token import TokenValidator, ValidationResult
+from utils.reporter import StreamReporter
+from utils.spatial import DUPLICATE_DELTA_E
+from utils.cvd import CVD_MIN_DELTA_E
+from utils.cache import ValidationCache, default_cache_path
+from utils.rules import RuleProfile, timed
+from utils.usage import UsageScanner
+from utils.literals import scan_sources
+from utils.layers import layer_combinations
+from utils.loaders import TOKEN_SUFFIXES, load_error_message, load_token_file
 from utils.reporter import Reporter
 
 
 def load_tokens(file_path: Path) -> Dict[str, Any]:
     """
-    加载Token文件
+    加载Token文件 (按扩展名选择 JSON/YAML/TOML/JSON5 解析器, 其他扩展名按JSON)
 
     Args:
         file_path: Token文件路径
@@ -38,12 +62,280 @@ def load_tokens(file_path: Path) -> Dict[str, Any]:
     Returns:
         Token字典
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        if file_path.suffix == '.json':
-            return json.load(f)
+    return load_token_file(file_path)
+
+
+def _exit_on_load_error(error: Exception, source: str = '') -> NoReturn:
+    """
+    把Token文件的加载错误写到 stderr 并以退出码 1 结束
+
+    Args:
+        error: load_tokens / iter_token_file 抛出的异常
+        source: 出错文件的说明 (如 "基线文件 old.json"), 空串表示主Token文件
+    """
+    print(f"❌ {load_error_message(error, source)}", file=sys.stderr)
+    raise SystemExit(1)
+
+
+def _load_or_report(path: Path, source: str = '') -> Dict[str, Any]:
+    """
+    加载Token文件, 失败时报告错误并退出 (见 _exit_on_load_error)
+
+    Args:
+        path: Token文件路径
+        source: 出错时使用的文件说明, 空串表示主Token文件
+
+    Returns:
+        Token字典
+    """
+    try:
+        return load_tokens(path)
+    except Exception as e:
+        _exit_on_load_error(e, source)
+
+
+def collect_token_files(patterns: List[str]) -> Tuple[List[Path], List[str]]:
+    """
+    展开命令行输入: 文件原样保留, 目录递归查找支持格式的Token文件
+    (*.json/*.yaml/*.yml/*.toml/*.json5, 跳过隐藏文件),
+    glob模式 (支持 **) 按匹配展开; 结果去重并保持输入顺序
+
+    Args:
+        patterns: 文件、目录或glob模式
+
+    Returns:
+        (Token文件列表, 不存在或没有匹配的输入)
+    """
+    files: List[Path] = []
+    seen = set()
+    missing = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(
+                p for p in path.rglob('*')
+                if p.suffix.lower() in TOKEN_SUFFIXES and not p.name.startswith('.') and p.is_file()
+            )
+        elif any(char in pattern for char in '*?['):
+            matches = sorted(Path(p) for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
         else:
-            # 尝试解析为JSON
-            return json.load(f)
+            matches = [path] if path.exists() else []
+        if not matches:
+            missing.append(pattern)
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                files.append(match)
+    return files, missing
+
+
+# 进程池工作进程的验证参数, 由 _init_worker 在每个进程中设置一次
+_worker_options: Dict[str, Any] = {}
+
+
+def _init_worker(duplicates: Optional[float], cvd: Optional[float],
+                 cache_path: Optional[Path], profile_rules: bool) -> None:
+    """工作进程初始化: 每个进程只加载一次缓存"""
+    _worker_options['duplicates'] = duplicates
+    _worker_options['cvd'] = cvd
+    _worker_options['profile_rules'] = profile_rules
+    _worker_options['cache'] = (
+        ValidationCache(cache_path, TokenValidator.ruleset_fingerprint()) if cache_path else None
+    )
+
+
+def _validate_in_worker(file_path: Path
+                        ) -> Tuple[ValidationResult, Dict[str, Any], Optional[RuleProfile]]:
+    """在工作进程中验证一个文件, 同时交回本次用到的缓存条目和规则耗时"""
+    cache = _worker_options['cache']
+    profile = RuleProfile() if _worker_options['profile_rules'] else None
+    result = TokenValidator.validate_token_file(
+        file_path, _worker_options['duplicates'], _worker_options['cvd'], cache, profile
+    )
+    used = {}
+    if cache is not None:
+        used, cache.used = cache.used, {}
+    return result, used, profile
+
+
+def validate_files(files: List[Path], args, cache: Optional[ValidationCache],
+                   profile: Optional[RuleProfile]) -> List[ValidationResult]:
+    """
+    验证多个Token文件; 多于一个任务进程时使用进程池 (解释器启动和模块导入
+    每个进程只发生一次), 缓存使用记录和规则耗时汇总到主进程
+
+    Args:
+        files: Token文件列表
+        args: 命令行参数
+        cache: 增量验证缓存 (None 表示不使用)
+        profile: 逐规则耗时统计 (None 表示不计时)
+
+    Returns:
+        与 files 顺序一致的验证结果
+    """
+    jobs = min(args.jobs or os.cpu_count() or 1, len(files))
+    if jobs <= 1:
+        return [
+            TokenValidator.validate_token_file(path, args.duplicates, args.cvd, cache, profile)
+            for path in files
+        ]
+
+    results = []
+    cache_path = cache.path if cache is not None else None
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(jobs, initializer=_init_worker,
+                             initargs=(args.duplicates, args.cvd, cache_path,
+                                       profile is not None)) as pool:
+        for result, used, file_profile in pool.map(_validate_in_worker, files, chunksize=chunksize):
+            if cache is not None:
+                cache.merge(used, result.cache_hits, result.cache_misses)
+            if profile is not None:
+                profile.merge(file_profile)
+            results.append(result)
+    return results
+
+
+def check_files(files: List[Path], args) -> int:
+    """
+    多文件验证: 合并为一份报告, 每个文件一节
+
+    Args:
+        files: Token文件列表
+        args: 命令行参数
+
+    Returns:
+        退出码
+    """
+    cache = None
+    if not args.no_cache:
+        cache = ValidationCache(args.cache, TokenValidator.ruleset_fingerprint())
+    profile = RuleProfile() if args.profile_rules else None
+    results = validate_files(files, args, cache, profile)
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"⚠️  无法写入缓存 {args.cache}: {e}", file=sys.stderr)
+
+    if args.strict:
+        for result in results:
+            if result.warning_count > 0:
+                result.is_valid = False
+
+    report = Reporter.format_token_reports(list(zip(files, results)), args.format)
+    if args.output:
+        Reporter.save_report(report, args.output)
+        print(f"📄 报告已保存到: {args.output}")
+    else:
+        print(report)
+
+    merged = TokenValidator.merge_results(results)
+    Reporter.print_summary(merged, len(files))
+    if profile is not None:
+        print(Reporter.format_rule_profile(profile))
+    return 0 if merged.is_valid else 1
+
+
+def check_layers(args) -> int:
+    """
+    分层验证: 基础文件 × 品牌覆盖 × 模式覆盖的每个组合, 每个组合一节
+
+    组合通过 TokenLayers 按层查找, 不生成合并后的Token字典; 各组合共享同一个
+    缓存, 未被覆盖的Token只检查一次。
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        退出码
+    """
+    layers = {}
+    for option in ('brand', 'mode'):
+        layers[option] = {}
+        for path in getattr(args, option) or []:
+            layers[option][path.stem] = _load_or_report(path, str(path))
+    base = _load_or_report(args.token_file)
+
+    # --no-cache 时仍在内存中复用各组合共有Token的结果
+    cache = ValidationCache(None if args.no_cache else args.cache, TokenValidator.ruleset_fingerprint())
+    profile = RuleProfile() if args.profile_rules else None
+    labels = []
+    results = []
+    for brand, mode, store in layer_combinations(base, layers['brand'], layers['mode']):
+        labels.append(' × '.join(name for name in (brand, mode) if name))
+        results.append(TokenValidator.validate_token_structure(
+            store.entries(), args.duplicates, args.cvd, cache, profile
+        ))
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"⚠️  无法写入缓存 {args.cache}: {e}", file=sys.stderr)
+
+    if args.strict:
+        for result in results:
+            if result.warning_count > 0:
+                result.is_valid = False
+
+    report = Reporter.format_token_reports(list(zip(labels, results)), args.format)
+    if args.output:
+        Reporter.save_report(report, args.output)
+        print(f"📄 报告已保存到: {args.output}")
+    else:
+        print(report)
+
+    merged = TokenValidator.merge_results(results)
+    Reporter.print_summary(merged, len(results))
+    if profile is not None:
+        print(Reporter.format_rule_profile(profile))
+    return 0 if merged.is_valid else 1
+
+
+def stream_tokens(args) -> int:
+    """
+    流式验证: 边读边验证, 问题直接写入报告, 内存占用与文件大小无关
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        退出码
+    """
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        out = open(args.output, 'w', encoding='utf-8')
+    else:
+        out = sys.stdout
+
+    profile = RuleProfile() if args.profile_rules else None
+    try:
+        reporter = StreamReporter(out, args.format)
+        reporter.begin()
+        try:
+            result = TokenValidator.validate_token_stream(
+                TokenValidator.iter_token_file(args.token_file),
+                reporter.issue,
+                args.duplicates,
+                args.cvd,
+                profile
+            )
+        except Exception as e:
+            # 报告已部分写出, 错误另起一行
+            print(file=sys.stderr)
+            _exit_on_load_error(e)
+
+        if args.strict and result.warning_count > 0:
+            result.is_valid = False
+        reporter.end(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.output:
+        print(f"📄 报告已保存到: {args.output}")
+    Reporter.print_summary(result)
+    if profile is not None:
+        print(Reporter.format_rule_profile(profile))
+    return 0 if result.is_valid else 1
 
 
 def main():
@@ -56,13 +348,26 @@ def main():
   %(prog)s tokens.json                    # 文本格式输出
   %(prog)s tokens.json --format json      # JSON格式输出
   %(prog)s tokens.json --format markdown --output report.md
+  %(prog)s tokens.json --duplicates       # 报告近似重复的颜色
+  %(prog)s tokens.json --cvd              # 检查状态色在色盲下的区分度
+  %(prog)s huge-tokens.json --stream      # 流式验证超大文件
+  %(prog)s tokens.json --no-cache         # 不使用增量缓存, 全部重新检查
+  %(prog)s brands/ --jobs 8               # 并行验证目录下所有Token文件
+  %(prog)s tokens.yaml                    # YAML/TOML/JSON5 按扩展名解析
+  %(prog)s "brands/**/*.json" base.json   # glob模式与文件混合
+  %(prog)s tokens.json --profile-rules    # 打印每条规则的调用次数和耗时
+  %(prog)s tokens.json --baseline main-tokens.json  # 只验证相对基线变更的Token
+  %(prog)s tokens.json --usage src/       # 报告未使用的Token和引用了不存在Token的位置
+  %(prog)s tokens.json --hardcoded src/   # 报告源码中的硬编码颜色/尺寸并建议最接近的Token
+  %(prog)s base.json --brand acme.json --mode dark.json  # 验证每个 品牌×模式 组合
         """
     )
 
     parser.add_argument(
-        'token_file',
-        type=Path,
-        help='Token文件路径 (JSON格式)'
+        'token_files',
+        nargs='+',
+        metavar='token_file',
+        help='Token文件路径 (.json/.yaml/.yml/.toml/.json5), 也可以是目录 (递归查找这些扩展名) 或glob模式'
     )
 
     parser.add_argument(
@@ -84,25 +389,181 @@ def main():
         help='严格模式: 警告也视为错误'
     )
 
+    parser.add_argument(
+        '--duplicates',
+        type=float,
+        nargs='?',
+        const=DUPLICATE_DELTA_E,
+        metavar='DELTA_E',
+        help=f'报告 ΔE_OK 小于阈值的近似重复颜色 (默认阈值: {DUPLICATE_DELTA_E})'
+    )
+
+    parser.add_argument(
+        '--cvd',
+        type=float,
+        nargs='?',
+        const=CVD_MIN_DELTA_E,
+        metavar='DELTA_E',
+        help=f'检查状态色在红/绿/蓝色盲下的最小 ΔE_OK (默认阈值: {CVD_MIN_DELTA_E})'
+    )
+
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='流式验证: 边读边输出问题, 适合数百MB的Token文件'
+    )
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=0,
+        metavar='N',
+        help='多文件验证和 --hardcoded 扫描的并行进程数 (默认: CPU核数; 1 表示不使用进程池)'
+    )
+
+    parser.add_argument(
+        '--baseline',
+        type=Path,
+        metavar='OLD_FILE',
+        help='基线Token文件: 只验证相对它新增或修改的Token (缺失类别仍检查完整集合)'
+    )
+
+    parser.add_argument(
+        '--usage',
+        type=Path,
+        nargs='+',
+        metavar='SRC',
+        help='扫描源码文件或目录 (.css/.scss/.tsx/.vue/.svelte), 报告未使用的Token和未定义的 var(--x) 引用'
+    )
+
+    parser.add_argument(
+        '--hardcoded',
+        type=Path,
+        nargs='+',
+        metavar='SRC',
+        help='扫描源码文件或目录中的硬编码颜色和 px/rem 尺寸, 建议最接近的Token (并行进程数同 --jobs)'
+    )
+
+    parser.add_argument(
+        '--css-prefix',
+        default='',
+        metavar='PREFIX',
+        help='源码中CSS自定义属性和Sass变量的前缀 (如 ds- 表示 --ds-color-primary)'
+    )
+
+    parser.add_argument(
+        '--brand',
+        type=Path,
+        nargs='+',
+        metavar='FILE',
+        help='品牌覆盖Token文件 (文件名即品牌名), 叠加在基础文件之上; 与 --mode 组合验证'
+    )
+
+    parser.add_argument(
+        '--mode',
+        type=Path,
+        nargs='+',
+        metavar='FILE',
+        help='模式覆盖Token文件 (如 dark.json), 叠加在每个品牌之上'
+    )
+
+    parser.add_argument(
+        '--profile-rules',
+        action='store_true',
+        help='统计每条规则的调用次数和耗时, 在摘要后打印耗时表'
+    )
+
+    parser.add_argument(
+        '--cache',
+        type=Path,
+        metavar='PATH',
+        help='增量验证缓存文件 (默认: 用户缓存目录下按当前目录区分的文件; 流式验证不使用缓存)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='不读取也不写入缓存, 全部Token重新检查'
+    )
+
     args = parser.parse_args()
+    if args.cache is None:
+        args.cache = default_cache_path()
 
-    # 检查文件存在
-    if not args.token_file.exists():
-        print(f"❌ 错误: 文件不存在 - {args.token_file}", file=sys.stderr)
+    # 展开目录和glob, 检查文件存在
+    files, missing = collect_token_files(args.token_files)
+    for pattern in missing:
+        print(f"❌ 错误: 文件不存在 - {pattern}", file=sys.stderr)
+    if missing:
         return 1
 
+    if len(files) > 1:
+        for option in ('stream', 'baseline', 'usage', 'hardcoded', 'brand', 'mode'):
+            if getattr(args, option):
+                print(f"❌ 错误: --{option} 只支持单个文件", file=sys.stderr)
+                return 1
+        return check_files(files, args)
+    for option in ('baseline', 'usage', 'hardcoded'):
+        if args.stream and getattr(args, option):
+            print(f"❌ 错误: --stream 不能与 --{option} 同时使用", file=sys.stderr)
+            return 1
+    if args.brand or args.mode:
+        for option in ('stream', 'baseline', 'usage', 'hardcoded'):
+            if getattr(args, option):
+                print(f"❌ 错误: --brand/--mode 不能与 --{option} 同时使用", file=sys.stderr)
+                return 1
+    for source in (args.usage or []) + (args.hardcoded or []):
+        if not source.exists():
+            print(f"❌ 错误: 源码路径不存在 - {source}", file=sys.stderr)
+            return 1
+    for layer in (args.brand or []) + (args.mode or []):
+        if not layer.is_file():
+            print(f"❌ 错误: 文件不存在 - {layer}", file=sys.stderr)
+            return 1
+
+    args.token_file = files[0]
+    if args.stream:
+        return stream_tokens(args)
+    if args.brand or args.mode:
+        return check_layers(args)
+
     # 加载Token
-    try:
-        tokens = load_tokens(args.token_file)
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON解析错误: {e}", file=sys.stderr)
-        return 1
-    except Exception as e:
-        print(f"❌ 文件读取错误: {e}", file=sys.stderr)
-        return 1
+    tokens = _load_or_report(args.token_file)
+
+    # 加载基线 (只验证变更时不使用缓存: 缓存只会记录变更的Token)
+    baseline = None
+    if args.baseline:
+        baseline = _load_or_report(args.baseline, f"基线文件 {args.baseline}")
+
+    # 验证Token (未变化的Token重放缓存结果)
+    cache = None
+    if not args.no_cache and baseline is None:
+        cache = ValidationCache(args.cache, TokenValidator.ruleset_fingerprint())
+    profile = RuleProfile() if args.profile_rules else None
+    result = TokenValidator.validate_token_structure(
+        tokens, args.duplicates, args.cvd, cache, profile, baseline
+    )
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"⚠️  无法写入缓存 {args.cache}: {e}", file=sys.stderr)
+
+    # Token使用情况: 未使用的Token为警告, 引用不存在的Token为错误
+    if args.usage:
+        names = [name for name, _, _ in TokenValidator.iter_tokens(tokens)]
+        scanner = UsageScanner(names, args.css_prefix)
+        with timed(profile, 'usage'):
+            usage = scanner.scan(args.usage)
+            result.errors.extend(TokenValidator.find_undefined_tokens(tokens, usage))
+            result.warnings.extend(TokenValidator.find_unused_tokens(tokens, usage))
+        result.is_valid = result.error_count == 0
 
-    # 验证Token
-    result = TokenValidator.validate_token_structure(tokens)
+    # 硬编码值: 源码中直接写的颜色和尺寸 (警告)
+    if args.hardcoded:
+        with timed(profile, 'hardcoded'):
+            literals, _ = scan_sources(TokenValidator.iter_tokens(tokens), args.hardcoded, args.jobs)
+            result.warnings.extend(TokenValidator.find_hardcoded_values(literals, args.css_prefix))
 
     # 严格模式
     if args.strict and result.warning_count > 0:
@@ -120,6 +581,8 @@ def main():
 
     # 打印摘要
     Reporter.print_summary(result)
+    if profile is not None:
+        print(Reporter.format_rule_profile(profile))
 
     # 返回状态码
     return 0 if result.is_valid else 1
@@ -0,0 +1,13 @@
+"""
+单元测试公共配置
+
+把 frontend-design/scripts 加入Python路径, 使 utils 包可直接导入。
+tests/utils 也是名为 utils 的包, 因此必须插在路径最前面。
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / 'frontend-design' / 'scripts'
+
+sys.path.insert(0, str(SCRIPTS_DIR))
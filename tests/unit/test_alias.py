@@ -0,0 +1,73 @@
+"""
+Token引用解析测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import random
+
+from utils.alias import AliasGraph, alias_target
+from utils.token import TokenValidator
+
+
+def _naive_resolve(values: dict, name: str):
+    """沿引用链逐步查找, 悬空或成环时返回 KeyError"""
+    seen = set()
+    while True:
+        target = alias_target(values[name])
+        if target is None:
+            return values[name]
+        if target not in values or target in seen:
+            return KeyError
+        seen.add(target)
+        name = target
+
+
+def test_alias_target():
+    assert alias_target('{color.primary}') == 'color-primary'
+    assert alias_target('{color-primary}') == 'color-primary'
+    assert alias_target('{a} {b}') is None
+    assert alias_target('#fff') is None
+    assert alias_target(12) is None
+
+
+def test_alias_graph_resolves_chains():
+    graph = AliasGraph({'a': '{b}', 'b': '{c.d}', 'c-d': '#fff', 'x': '{missing}', 'p': '{q}', 'q': '{p}'})
+    assert graph.resolve('a') == '#fff'
+    assert graph.resolve('c-d') == '#fff'
+    assert graph.order.index('c-d') < graph.order.index('b') < graph.order.index('a')
+    assert graph.dangling == [('x', 'missing')]
+    assert graph.cycles == [['p', 'q']]
+    assert graph.describe_cycle(graph.cycles[0]) == 'p → q → p'
+    assert graph.unresolved() == ['x', 'p', 'q']
+    assert not graph.is_valid
+    assert AliasGraph({'a': '{b}', 'b': '1px'}).is_valid
+
+
+def test_alias_graph_matches_naive_resolution():
+    rng = random.Random(10)
+    for _ in range(200):
+        names = [f"t{i}" for i in range(12)]
+        values = {
+            name: f"{{{rng.choice(names + ['gone'])}}}" if rng.random() < 0.6 else f"{i}px"
+            for i, name in enumerate(names)
+        }
+        graph = AliasGraph(values)
+        for name in names:
+            expected = _naive_resolve(values, name)
+            if expected is KeyError:
+                assert name in graph.unresolved()
+            else:
+                assert graph.resolve(name) == expected
+
+
+def test_check_aliases_reports_dangling_cycles_and_types():
+    values = {'color-primary': '#f00', 'color-link': '{color.missing}', 'a': '{b}', 'b': '{a}',
+              'spacing-md': '{color-primary}'}
+    issues = TokenValidator.check_aliases(values, {'color-primary': 'color', 'spacing-md': 'dimension'})
+    assert [(issue.level, issue.token_name) for issue in issues] == [
+        ('error', 'color-link'), ('error', 'a'), ('warning', 'spacing-md')]
+    assert issues[0].message == '引用的Token不存在: {color.missing}'
+    assert issues[1].message == '循环引用: a → b → a'
+    assert TokenValidator.check_aliases({'a': '{b}', 'b': '1px'}) == []
@@ -0,0 +1,113 @@
+"""
+增量验证缓存测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import json
+
+import pytest
+
+from utils.cache import CACHE_VERSION, ValidationCache, default_cache_path
+from utils.token import TokenValidator
+
+FINGERPRINT = TokenValidator.ruleset_fingerprint()
+
+TOKENS = {"color-primary": "#12", "spacing-md": "16em", "font-body": "Inter"}
+
+
+def test_cache_round_trip(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = ValidationCache(path, FINGERPRINT)
+    first = TokenValidator.validate_token_structure(TOKENS, cache=cache)
+    cache.save()
+    assert (first.cache_hits, first.cache_misses) == (0, 3)
+
+    cache = ValidationCache(path, FINGERPRINT)
+    second = TokenValidator.validate_token_structure(TOKENS, cache=cache)
+    assert (second.cache_hits, second.cache_misses) == (3, 0)
+    assert [(i.token_name, i.message) for i in second.errors + second.warnings] == \
+        [(i.token_name, i.message) for i in first.errors + first.warnings]
+
+
+@pytest.mark.parametrize('content', [
+    '[1, 2]',
+    '"text"',
+    'null',
+    '{"version": %d, "fingerprint": "%s", "entries": [1]}' % (CACHE_VERSION, FINGERPRINT),
+    '{broken',
+])
+def test_cache_ignores_malformed_files(tmp_path, content):
+    path = tmp_path / 'cache.json'
+    path.write_text(content, encoding='utf-8')
+    cache = ValidationCache(path, FINGERPRINT)
+    assert cache.entries == {}
+    result = TokenValidator.validate_token_structure(TOKENS, cache=cache)
+    assert result.cache_misses == 3
+    cache.save()
+    assert json.loads(path.read_text(encoding='utf-8'))['version'] == CACHE_VERSION
+
+
+def test_cache_discards_other_fingerprints(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = ValidationCache(path, FINGERPRINT)
+    TokenValidator.validate_token_structure(TOKENS, cache=cache)
+    cache.save()
+    assert ValidationCache(path, 'other').entries == {}
+
+
+def test_default_cache_path_outside_project(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path / 'xdg'))
+    monkeypatch.setattr('sys.platform', 'linux')
+    project = tmp_path / 'project'
+    path = default_cache_path(project)
+    assert project not in path.parents
+    assert path == default_cache_path(project)
+    assert path != default_cache_path(tmp_path / 'other')
+
+
+def test_cache_keeps_entries_of_other_files(tmp_path):
+    path = tmp_path / 'cache.json'
+    other = {"color-accent": "#ff0000", "spacing-lg": "24px"}
+    for tokens in (TOKENS, other):
+        cache = ValidationCache(path, FINGERPRINT)
+        TokenValidator.validate_token_structure(tokens, cache=cache)
+        cache.save()
+
+    cache = ValidationCache(path, FINGERPRINT)
+    result = TokenValidator.validate_token_structure(TOKENS, cache=cache)
+    assert (result.cache_hits, result.cache_misses) == (3, 0)
+    cache.save()
+
+    cache = ValidationCache(path, FINGERPRINT)
+    result = TokenValidator.validate_token_structure(other, cache=cache)
+    assert (result.cache_hits, result.cache_misses) == (2, 0)
+
+
+def test_cache_drops_idle_and_excess_entries(tmp_path, monkeypatch):
+    path = tmp_path / 'cache.json'
+    cache = ValidationCache(path, FINGERPRINT)
+    TokenValidator.validate_token_structure(TOKENS, cache=cache)
+    cache.save()
+
+    monkeypatch.setattr('utils.cache.MAX_IDLE_RUNS', 2)
+    other = {"color-accent": "#ff0000"}
+    for runs in (1, 2, 3):
+        cache = ValidationCache(path, FINGERPRINT)
+        TokenValidator.validate_token_structure(other, cache=cache)
+        cache.save()
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assert len(data['entries']) == (4 if runs <= 2 else 1)
+        assert set(data['idle'].values()) <= {runs}
+
+    monkeypatch.setattr('utils.cache.MAX_IDLE_RUNS', 30)
+    monkeypatch.setattr('utils.cache.MAX_ENTRIES', 2)
+    for tokens in (TOKENS, other):
+        cache = ValidationCache(path, FINGERPRINT)
+        TokenValidator.validate_token_structure(tokens, cache=cache)
+        cache.save()
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert len(data['entries']) == 2
+    assert next(iter(data['entries'])).startswith('color-accent')
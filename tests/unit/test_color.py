@@ -0,0 +1,204 @@
+"""
+颜色工具测试
+
+已知值来自 WCAG 2.x 相对亮度公式、Björn Ottosson 的 OKLab 参考值和
+APCA-W3 0.0.98G-4g 参考实现; 批量 (NumPy) 接口与逐个计算的标量接口互相校验。
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import pickle
+import random
+
+import pytest
+
+from utils import color as color_module
+from utils.color import ColorPalette, ColorUtils, OKLCHColor, intern_oklch
+
+np = pytest.importorskip('numpy')
+
+
+def _random_hex(rng: random.Random) -> str:
+    return '#%06x' % rng.randrange(1 << 24)
+
+
+# ---------------------------------------------------------------- 已知值
+
+@pytest.mark.parametrize('foreground, background, expected', [
+    ('#767676', '#ffffff', 4.54),
+    ('#000000', '#ffffff', 21.0),
+    ('#777777', '#ffffff', 4.48),
+    ('#ffffff', '#ffffff', 1.0),
+    ('#0000ff', '#ffffff', 8.59),
+])
+def test_wcag_contrast_known_values(foreground, background, expected):
+    assert ColorUtils.calculate_contrast_ratio(foreground, background) == pytest.approx(expected, abs=0.005)
+    # 对比度与前景/背景顺序无关
+    assert ColorUtils.calculate_contrast_ratio(background, foreground) == pytest.approx(expected, abs=0.005)
+
+
+@pytest.mark.parametrize('text, background, expected', [
+    ('#000000', '#ffffff', 106.04),
+    ('#ffffff', '#000000', -107.88),
+    ('#888888', '#ffffff', 63.06),
+    ('#ffffff', '#ffffff', 0.0),
+])
+def test_apca_known_values(text, background, expected):
+    assert ColorUtils.calculate_apca_contrast(text, background) == pytest.approx(expected, abs=0.01)
+
+
+def test_apca_font_lookup():
+    assert ColorUtils.apca_min_contrast(16, 400) == 90
+    assert ColorUtils.apca_min_contrast(24, 700) >= ColorUtils.apca_min_contrast(36, 700)
+    # 字号向下取档
+    assert ColorUtils.apca_min_contrast(17, 400) == ColorUtils.apca_min_contrast(16, 400)
+
+
+@pytest.mark.parametrize('rgb, expected', [
+    ((1.0, 1.0, 1.0), (1.0, 0.0, 0.0)),
+    ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0)),
+    ((1.0, 0.0, 0.0), (0.627955, 0.257683, 29.2339)),
+    ((0.0, 1.0, 0.0), (0.86644, 0.294827, 142.4953)),
+    ((0.0, 0.0, 1.0), (0.452014, 0.313214, 264.052)),
+])
+def test_oklch_reference_values(rgb, expected):
+    assert ColorUtils.srgb_to_oklch(*rgb) == pytest.approx(expected, abs=1e-3)
+
+
+def test_oklab_round_trip():
+    rng = random.Random(1)
+    for _ in range(200):
+        rgb = [rng.random() for _ in range(3)]
+        l, c, h = ColorUtils.srgb_to_oklch(*rgb)
+        linear = ColorUtils.oklch_to_linear_srgb(l, c, h)
+        encoded = [color_module._srgb_encode(v) for v in linear]
+        assert encoded == pytest.approx(rgb, abs=1e-4)
+
+
+# ---------------------------------------------------------------- CSS解析
+
+@pytest.mark.parametrize('text, expected', [
+    ('#fff', (1.0, 0.0, 0.0, 1.0)),
+    ('#FFFFFF', (1.0, 0.0, 0.0, 1.0)),
+    ('#ff000080', (0.627955, 0.257683, 29.2339, 0.501961)),
+    ('rgb(255 0 0)', (0.627955, 0.257683, 29.2339, 1.0)),
+    ('rgb(255, 0, 0)', (0.627955, 0.257683, 29.2339, 1.0)),
+    ('rgb(100% 0% 0% / 50%)', (0.627955, 0.257683, 29.2339, 0.5)),
+    ('rgba(255,0,0,.5)', (0.627955, 0.257683, 29.2339, 0.5)),
+    ('hsl(120 100% 50%)', (0.86644, 0.294827, 142.4953, 1.0)),
+    ('hsl(120deg, 100%, 50%)', (0.86644, 0.294827, 142.4953, 1.0)),
+    ('oklch(0.7 0.1 200)', (0.7, 0.1, 200.0, 1.0)),
+    ('oklch(70% 0.1 200 / 50%)', (0.7, 0.1, 200.0, 0.5)),
+    ('oklch(0.7 0.1 0.5turn)', (0.7, 0.1, 180.0, 1.0)),
+    ('OKLCH(0.7 0.1 200DEG)', (0.7, 0.1, 200.0, 1.0)),
+    ('oklab(0.5 0.1 -0.1)', (0.5, 0.141421, 315.0, 1.0)),
+])
+def test_parse_color(text, expected):
+    color = ColorUtils.parse_color(text)
+    assert isinstance(color, OKLCHColor)
+    assert tuple(color) == pytest.approx(expected, abs=1e-4)
+
+
+@pytest.mark.parametrize('text', [
+    'red', '#ggg', '#ffff1', 'rgb(1 2)', 'rgb(1, 2 3)', 'rgb(1 2 3 4)',
+    'oklch(0.7, 0.1, 200)', 'oklab(0.5, 0.1, 0.1)', 'oklch(0.7 0.1)', 'hsl(1 2 3',
+    '', 'oklch()',
+])
+def test_parse_color_rejects(text):
+    assert ColorUtils.parse_color(text) is None
+    assert not ColorUtils.is_valid_color(text)
+
+
+def test_parsed_colors_are_interned():
+    a = ColorUtils.parse_color('oklch(0.5 0.1 100)')
+    assert a is ColorUtils.parse_color('oklch(50% 0.1 100deg)')
+    assert a is intern_oklch(0.5, 0.1, 100.0)
+    assert a == OKLCHColor(0.5, 0.1, 100.0)
+    assert pickle.loads(pickle.dumps(a)) == a
+
+
+# ---------------------------------------------------------------- 批量与标量一致
+
+def test_luminance_array_matches_scalar():
+    rng = random.Random(2)
+    colors = [ColorUtils.parse_color(_random_hex(rng)) for _ in range(300)]
+    l, c, h = (np.array(values) for values in zip(*[color[:3] for color in colors]))
+    wcag = ColorUtils.luminance_array(l, c, h)
+    apca = ColorUtils.apca_luminance_array(l, c, h)
+    for i, color in enumerate(colors):
+        assert wcag[i] == pytest.approx(ColorUtils.luminance_from_oklch(*color[:3]), abs=1e-12)
+        assert apca[i] == pytest.approx(ColorUtils.apca_luminance_from_oklch(*color[:3]), abs=1e-12)
+
+
+@pytest.mark.parametrize('model', ['wcag2', 'apca'])
+def test_contrast_matrix_matches_scalar(model):
+    rng = random.Random(3)
+    foregrounds = [_random_hex(rng) for _ in range(40)] + ['not-a-color']
+    backgrounds = [_random_hex(rng) for _ in range(30)] + ['#fff', '#000']
+    matrix = ColorUtils.contrast_matrix(foregrounds, backgrounds, model)
+    scalar = ColorUtils.calculate_apca_contrast if model == 'apca' else ColorUtils.calculate_contrast_ratio
+    for i, fg in enumerate(foregrounds):
+        for j, bg in enumerate(backgrounds):
+            assert matrix[i, j] == pytest.approx(scalar(fg, bg), abs=1e-9)
+
+
+def test_pass_masks_match_thresholds():
+    rng = random.Random(4)
+    foregrounds = [_random_hex(rng) for _ in range(30)]
+    backgrounds = ['#ffffff', '#000000', '#336699']
+    ratios = ColorUtils.contrast_matrix(foregrounds, backgrounds)
+    assert (ColorUtils.meets_wcag_aa(foregrounds, backgrounds) == (ratios >= 4.5)).all()
+    assert (ColorUtils.meets_wcag_aaa(foregrounds, backgrounds, large_text=True) == (ratios >= 4.5)).all()
+    assert ColorUtils.meets_wcag_aa('#767676', '#ffffff') is True
+    assert ColorUtils.meets_wcag_aa('#777777', '#ffffff') is False
+
+
+# ---------------------------------------------------------------- 可访问亮度求解
+
+def _brute_force_lightness(color, background, target, model):
+    """在 0.0001 网格上找离原亮度最近的达标亮度 (没有时为None)"""
+    grid = np.round(np.linspace(0.0, 1.0, 10001), 4)
+    c = np.full_like(grid, color.c)
+    h = np.full_like(grid, color.h)
+    luminance = ColorUtils.apca_luminance_array if model == 'apca' else ColorUtils.luminance_array
+    y_bg = ColorUtils.luminance_array(*background[:3]) if model != 'apca' \
+        else ColorUtils.apca_luminance_array(*background[:3])
+    ok = np.abs(ColorUtils.contrast_array(luminance(grid, c, h), y_bg, model)) >= target
+    if not ok.any():
+        return None
+    candidates = grid[ok]
+    return float(candidates[np.argmin(np.abs(candidates - color.l))])
+
+
+@pytest.mark.parametrize('model, target', [('wcag2', 4.5), ('wcag2', 7.0), ('apca', 60), ('apca', 90)])
+def test_solver_matches_brute_force(model, target):
+    rng = random.Random(5)
+    foregrounds = [f"oklch({rng.random():.3f} {rng.random() * 0.2:.3f} {rng.random() * 360:.1f})"
+                   for _ in range(60)]
+    backgrounds = [_random_hex(rng) for _ in range(60)]
+    solved = ColorUtils.solve_accessible_lightness(foregrounds, backgrounds, target, model)
+    values = ColorUtils.contrast_matrix(solved, backgrounds, model).diagonal()
+    for i, (fg, bg) in enumerate(zip(foregrounds, backgrounds)):
+        color = ColorUtils.parse_color(fg)
+        expected = _brute_force_lightness(color, ColorUtils.parse_color(bg), target, model)
+        if expected is None:
+            assert solved.l[i] in (0.0, 1.0)
+            continue
+        assert abs(values[i]) >= target - 1e-9
+        assert abs(solved.l[i] - color.l) <= abs(expected - color.l) + 2e-4
+
+
+@pytest.mark.parametrize('direction', [None, 'darker', 'lighter'])
+@pytest.mark.parametrize('model, target', [('wcag2', 4.5), ('apca', 75)])
+def test_solver_numpy_matches_scalar(model, target, direction):
+    rng = random.Random(6)
+    foregrounds = ColorPalette.from_values(
+        [f"oklch({rng.random():.3f} {rng.random() * 0.2:.3f} {rng.random() * 360:.1f})" for _ in range(80)])
+    backgrounds = ColorPalette.from_values([_random_hex(rng) for _ in range(80)])
+    solved = ColorUtils.solve_accessible_lightness(foregrounds, backgrounds, target, model, direction)
+    y_bg = backgrounds.luminance(model)
+    for i in range(len(foregrounds)):
+        scalar = color_module._solve_lightness(
+            foregrounds.l[i], foregrounds.c[i], foregrounds.h[i], y_bg[i], target, model, direction)
+        assert solved.l[i] == pytest.approx(scalar, abs=1e-4)
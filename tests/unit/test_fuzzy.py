@@ -0,0 +1,72 @@
+"""
+编辑距离与名称索引测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import random
+
+from utils.fuzzy import NameIndex, edit_distance
+from utils.token import TokenValidator
+
+
+def _levenshtein(a: str, b: str) -> int:
+    """教科书式的动态规划, 作为位并行实现的对照"""
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[0], i
+        for j, cb in enumerate(b, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (ca != cb))
+    return row[-1]
+
+
+def _random_word(rng: random.Random, alphabet: str, max_length: int) -> str:
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randrange(max_length + 1)))
+
+
+def test_edit_distance_matches_dynamic_programming():
+    rng = random.Random(7)
+    for _ in range(2000):
+        a, b = _random_word(rng, 'abc-', 12), _random_word(rng, 'abc-', 12)
+        expected = _levenshtein(a, b)
+        assert edit_distance(a, b) == expected
+        for limit in (0, 1, 2):
+            assert edit_distance(a, b, limit) == min(expected, limit + 1)
+    # 超过机器字长的名称
+    long_a = 'color-' * 20 + 'primary'
+    long_b = 'colour-' * 20 + 'primray'
+    assert edit_distance(long_a, long_b) == _levenshtein(long_a, long_b)
+
+
+def test_name_index_matches_brute_force():
+    rng = random.Random(8)
+    names = list(dict.fromkeys(_random_word(rng, 'abcd-', 10) for _ in range(500)))
+    index = NameIndex(names)
+    assert len(index) == len(names)
+    for _ in range(300):
+        word = _random_word(rng, 'abcd-', 10)
+        distances = [(_levenshtein(word, name), name) for name in names]
+        for k in (0, 1, 2):
+            # 按距离升序, 距离相同时按加入顺序 (sorted 是稳定排序)
+            expected = sorted((item for item in distances if item[0] <= k), key=lambda item: item[0])
+            assert index.search(word, k) == expected
+
+
+def test_name_index_closest():
+    index = NameIndex(['color-primary', 'color-secondary', 'spacing-md', 'red'])
+    assert index.closest('color-primray') == 'color-primary'
+    assert index.closest('color-secondray', 1) is None
+    assert index.closest('spacing-nd') == 'spacing-md'
+    # 短名称只允许一处错误
+    assert index.closest('rde') is None
+    assert index.closest('rad') == 'red'
+    # 不返回查询串本身
+    assert index.closest('red') is None
+
+
+def test_dangling_alias_suggests_closest_token():
+    values = {'color-primary': '#f00', 'color-link': '{color.primray}', 'color-ghost': '{nothing-like-it}'}
+    issues = TokenValidator.check_aliases(values)
+    assert [issue.suggestion for issue in issues] == [
+        '是否想引用 {color-primary}?', '检查引用名称或添加 nothing-like-it Token']
@@ -0,0 +1,64 @@
+"""
+分层Token测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import pytest
+
+from utils.layers import TokenLayers, layer_combinations
+from utils.token import TokenValidator
+
+
+BASE = {'color': {'primary': {'$value': '#000'}, 'bg': {'$value': '#fff'}}, 'spacing-md': '16px'}
+BRAND = {'color-primary': '#f00', 'color-accent': '#0f0'}
+DARK = {'color': {'bg': {'$value': '#111'}, 'shadow': {'$value': '#000', '$type': 'shadow'}}}
+
+
+def test_token_layers_lookup_and_order():
+    layers = TokenLayers(BASE, name='base').overlay(BRAND, 'acme').overlay(DARK, 'dark')
+    assert layers.label == 'base/acme/dark'
+    assert list(layers) == ['color-primary', 'color-bg', 'spacing-md', 'color-accent', 'color-shadow']
+    assert len(layers) == 5
+    assert layers['color-primary'] == '#f00'
+    assert layers['color-bg'] == '#111'
+    assert layers.owner('spacing-md').name == 'base'
+    assert 'color-missing' not in layers
+    with pytest.raises(KeyError):
+        layers['color-missing']
+    with pytest.raises(KeyError):
+        layers.owner('color-missing')
+
+
+def test_token_layers_entries_match_merged_tokens():
+    layers = TokenLayers(BASE, name='base').overlay(BRAND, 'acme').overlay(DARK, 'dark')
+    expected = {}
+    for tokens in (BASE, BRAND, DARK):
+        for name, value, token_type in TokenValidator.iter_tokens(tokens):
+            expected[name] = (value, token_type)
+    # entries 经 iter_tokens 得到与逐层合并相同的值和类型
+    flattened = {name: (value, token_type)
+                 for name, value, token_type in TokenValidator.iter_tokens(dict(layers.entries()))}
+    assert flattened == expected
+
+
+def test_overlay_rejects_multi_layer_stacks():
+    stacked = TokenLayers(BASE).overlay(BRAND)
+    with pytest.raises(ValueError):
+        TokenLayers(BASE).overlay(stacked)
+
+
+def test_layer_combinations_share_mode_layers():
+    base = {'color-bg': '#fff', 'color-fg': '#000'}
+    brands = {'acme': {'color-fg': '#00f'}, 'zen': {}}
+    modes = {'light': {}, 'dark': {'color-bg': '#000'}}
+    combos = list(layer_combinations(base, brands, modes))
+    assert [(brand, mode) for brand, mode, _ in combos] == [
+        ('acme', 'light'), ('acme', 'dark'), ('zen', 'light'), ('zen', 'dark')]
+    values = {(brand, mode): dict(layers) for brand, mode, layers in combos}
+    assert values[('acme', 'dark')] == {'color-bg': '#000', 'color-fg': '#00f'}
+    assert values[('zen', 'light')] == base
+    # 同一模式层的展开结果在品牌间共享
+    assert combos[1][2].tokens is combos[3][2].tokens
+    assert [mode for _, mode, _ in layer_combinations(base)] == ['']
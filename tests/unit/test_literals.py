@@ -0,0 +1,83 @@
+"""
+硬编码值扫描测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import pytest
+
+from utils.literals import PARALLEL_MIN_FILES, LiteralScanner, TokenValueIndex, scan_sources
+
+ENTRIES = [
+    ('color-primary', '#336699', 'color'),
+    ('spacing-md', '16px', 'dimension'),
+    ('radius-sm', '4px', 'dimension'),
+]
+
+
+@pytest.fixture(scope='module')
+def scanner():
+    return LiteralScanner(TokenValueIndex(ENTRIES))
+
+
+def _literals(scanner, text, path):
+    return [(item.literal, item.token) for item in scanner.scan_text(text, path)]
+
+
+@pytest.mark.parametrize('text', [
+    '<a href="#abc">top</a>',
+    '<a href="/docs/#fade">docs</a>',
+    '<a href="https://example.com/#cafe">x</a>',
+    "document.querySelector('#feed')",
+    '<Link to="#add" />',
+])
+def test_anchors_are_not_colors(scanner, text):
+    assert _literals(scanner, text, 'page.tsx') == []
+
+
+def test_colors_in_style_contexts(scanner):
+    text = (
+        "<div style={{ color: '#336699', padding: '16px' }} />\n"
+        '<svg fill="#336699" stroke={\'#abc\'} />\n'
+        '<p style="border-radius: 4px; background: #336699">x</p>\n'
+    )
+    assert _literals(scanner, text, 'page.tsx') == [
+        ('#336699', 'color-primary'), ('16px', 'spacing-md'),
+        ('#336699', 'color-primary'), ('#abc', None),
+        ('4px', 'radius-sm'), ('#336699', 'color-primary'),
+    ]
+
+
+def test_stylesheet_declarations_span_lines(scanner):
+    text = '#fade { color: #336699;\n  box-shadow:\n    0 0 0 #abc;\n}\n'
+    assert _literals(scanner, text, 'a.css') == [('#336699', 'color-primary'), ('#abc', None)]
+
+
+def test_vue_style_block(scanner):
+    text = ('<template><a href="#abc">x</a></template>\n'
+            '<style>\n.a {\n  border:\n    1px solid #336699;\n}\n</style>\n')
+    literals = scanner.scan_text(text, 'a.vue')
+    assert [(item.literal, item.line) for item in literals] == [('1px', 5), ('#336699', 5)]
+
+
+def test_skipped_contexts(scanner):
+    text = ':root { --brand: #336699; }\n$gap: 16px;\n.a { margin: var(--gap, 16px); }\n@media (min-width: 16px) {}\n'
+    assert _literals(scanner, text, 'a.scss') == []
+
+
+def test_pooled_scan_matches_serial(tmp_path):
+    for i in range(PARALLEL_MIN_FILES + 10):
+        sub = tmp_path / f'pkg-{i // 50}'
+        sub.mkdir(exist_ok=True)
+        if i % 2:
+            (sub / f'a{i}.css').write_text(f'.a{i} {{ color: #3366{i % 100:02d};\n  padding: {i % 40}px; }}\n',
+                                           encoding='utf-8')
+        else:
+            (sub / f'A{i}.tsx').write_text(f"<a href=\"#x{i}\" style={{{{ margin: '{i % 9}rem' }}}} />\n",
+                                           encoding='utf-8')
+    serial = scan_sources(ENTRIES, [tmp_path], jobs=1)
+    pooled = scan_sources(ENTRIES, [tmp_path], jobs=2)
+    assert serial[1] == PARALLEL_MIN_FILES + 10
+    assert len(serial[0]) > PARALLEL_MIN_FILES
+    assert pooled == serial
@@ -0,0 +1,134 @@
+"""
+Token文件加载测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import json
+import math
+
+import pytest
+
+from utils.loaders import TokenFileError, iter_token_members, json5_to_json, load_error_message, load_token_file
+from utils.token import TokenValidator
+
+YAML_NUMERIC_KEYS = """\
+color:
+  $type: color
+  gray:
+    100: {$value: "#f5f5f5"}
+    200: {$value: "#e5e5e5"}
+    1.50: {$value: "#d4d4d4"}
+  on: {$value: "#000"}
+100: 16px
+base: &base
+  300: "#a3a3a3"
+palette:
+  <<: *base
+  400: "#737373"
+"""
+
+EXPECTED_NAMES = ['color-gray-100', 'color-gray-200', 'color-gray-1.50', 'color-on',
+                  '100', 'base-300', 'palette-300', 'palette-400']
+
+
+def _tokens(source):
+    return list(TokenValidator.iter_tokens(source))
+
+
+def test_yaml_numeric_keys_are_strings(tmp_path):
+    pytest.importorskip('yaml')
+    path = tmp_path / 'tokens.yaml'
+    path.write_text(YAML_NUMERIC_KEYS, encoding='utf-8')
+    loaded = _tokens(load_token_file(path))
+    assert [name for name, _, _ in loaded] == EXPECTED_NAMES
+    assert _tokens(iter_token_members(path)) == loaded
+    assert loaded[0] == ('color-gray-100', '#f5f5f5', 'color')
+
+
+def test_yaml_numeric_keys_validate(tmp_path):
+    pytest.importorskip('yaml')
+    path = tmp_path / 'tokens.yaml'
+    path.write_text(YAML_NUMERIC_KEYS, encoding='utf-8')
+    batch = TokenValidator.validate_token_file(path)
+    issues = []
+    stream = TokenValidator.validate_token_stream(TokenValidator.iter_token_file(path), issues.append)
+    assert batch.total_tokens == stream.total_tokens == len(EXPECTED_NAMES)
+    assert batch.error_count == stream.error_count
+
+
+def test_toml_numeric_keys(tmp_path):
+    pytest.importorskip('tomllib')
+    path = tmp_path / 'tokens.toml'
+    path.write_text('[color.gray]\n100 = "#f5f5f5"\n200 = "#e5e5e5"\n', encoding='utf-8')
+    assert _tokens(load_token_file(path)) == [
+        ('color-gray-100', '#f5f5f5', 'color'), ('color-gray-200', '#e5e5e5', 'color')
+    ]
+
+
+# ---------------------------------------------------------------- JSON5
+
+@pytest.mark.parametrize('literal, expected', [
+    ('NaN', math.nan),
+    ('-NaN', math.nan),
+    ('+NaN', math.nan),
+    ('Infinity', math.inf),
+    ('-Infinity', -math.inf),
+    ('+1', 1),
+    ('.5', 0.5),
+    ('5.', 5.0),
+    ('-.5e3', -500.0),
+    ('1.e2', 100.0),
+    ('0', 0),
+    ('0.25', 0.25),
+    ('0e0', 0.0),
+    ('0x1F', 31),
+    ('-0x1f', -31),
+])
+def test_json5_numbers(literal, expected):
+    value = json.loads(json5_to_json(f'{{a: {literal}}}'))['a']
+    if math.isnan(expected):
+        assert math.isnan(value)
+    else:
+        assert value == expected and type(value) is type(expected)
+
+
+@pytest.mark.parametrize('literal', ['007', '-007', '+01', '00.5', '01e3'])
+def test_json5_rejects_leading_zeros(literal):
+    with pytest.raises(TokenFileError, match='前导零'):
+        json5_to_json(f'{{a: {literal}}}')
+
+
+def test_json5_file(tmp_path):
+    path = tmp_path / 'tokens.json5'
+    path.write_text("""// 设计Token
+{
+  color: {
+    $type: 'color',
+    primary: {$value: '#336699',},  /* 主色 */
+  },
+  'spacing-md': "16px",
+  scale: [.5, 1., +2, 0x10, -NaN, Infinity],
+}
+""", encoding='utf-8')
+    data = load_token_file(path)
+    assert data['color'] == {'$type': 'color', 'primary': {'$value': '#336699'}}
+    assert data['spacing-md'] == '16px'
+    assert data['scale'][:4] == [0.5, 1.0, 2, 16]
+    assert math.isnan(data['scale'][4]) and data['scale'][5] == math.inf
+
+
+def test_load_error_message(tmp_path):
+    path = tmp_path / 'bad.json'
+    path.write_text('{"a": 1,}', encoding='utf-8')
+    with pytest.raises(json.JSONDecodeError) as error:
+        load_token_file(path)
+    assert load_error_message(error.value) == f"JSON解析错误: {error.value}"
+    assert load_error_message(error.value, '基线文件 bad.json') == f"JSON解析错误 (基线文件 bad.json): {error.value}"
+    assert load_error_message(TokenFileError('YAML解析错误: x')) == 'YAML解析错误: x'
+    assert load_error_message(TokenFileError('YAML解析错误: x'), 'a.yaml') == 'a.yaml: YAML解析错误: x'
+    assert load_error_message(OSError('denied')) == '文件读取错误: denied'
+    # validate_token_file 使用同一条信息
+    result = TokenValidator.validate_token_file(path)
+    assert [issue.message for issue in result.errors] == [load_error_message(error.value)]
@@ -0,0 +1,167 @@
+"""
+报告工具测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import importlib.util
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.reporter import BaseStreamReporter, Reporter, StreamReporter
+from utils.token import TokenIssue, TokenValidator, ValidationResult
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / 'frontend-design' / 'scripts'
+
+
+def _load_script(relative_path: str):
+    """按路径导入文件名含连字符的检查脚本"""
+    path = SCRIPTS_DIR / relative_path
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _result() -> ValidationResult:
+    result = ValidationResult(is_valid=False, total_tokens=3)
+    result.errors.append(TokenIssue('error', 'color-link', "引用的Token不存在: {0}",
+                                    suggestion="是否想引用 {{{1}}}?", args=('{color.primray}', 'color-primary')))
+    result.warnings.append(TokenIssue('warning', 'spacing-md', "值包含\n换行与 \"引号\""))
+    return result
+
+
+class _FlushCounter(io.StringIO):
+    """记录每次刷新时已写出的内容"""
+
+    def __init__(self):
+        super().__init__()
+        self.flushed = []
+
+    def flush(self):
+        self.flushed.append(self.getvalue())
+        super().flush()
+
+
+@pytest.mark.parametrize('issue_count', [0, 1, 2])
+def test_stream_json_matches_batch_report(issue_count):
+    result = _result()
+    issues = (result.errors + result.warnings)[:issue_count]
+    data = json.loads(StreamReporter.render(issues, result, 'json'))
+    batch = json.loads(Reporter.format_token_report(result, 'json'))
+    assert list(data) == ['issues', 'is_valid', 'total_tokens', 'error_count', 'warning_count']
+    assert data['issues'] == (batch['errors'] + batch['warnings'])[:issue_count]
+    for key in ('is_valid', 'total_tokens', 'error_count', 'warning_count'):
+        assert data[key] == batch[key]
+
+
+def test_stream_json_layout_matches_json_dumps():
+    result = _result()
+    issues = result.errors + result.warnings
+    reporter = StreamReporter(io.StringIO(), 'json')
+    expected = dict(issues=[reporter.issue_dict(issue) for issue in issues], **reporter.summary_dict(result))
+    rendered = StreamReporter.render(issues, result, 'json')
+    # 问题各占一行, 摘要字段与 json.dumps(indent=2) 排版一致
+    assert rendered.endswith(json.dumps(expected, ensure_ascii=False, indent=2).split('  ],', 1)[1] + '\n')
+
+
+@pytest.mark.parametrize('output_format', ['text', 'markdown', 'json'])
+def test_stream_flushes_each_issue(output_format):
+    result = _result()
+    stream = _FlushCounter()
+    reporter = StreamReporter(stream, output_format)
+    reporter.begin()
+    for issue in result.errors + result.warnings:
+        reporter.issue(issue)
+        assert stream.flushed[-1] == stream.getvalue()
+    reporter.end(result)
+    assert len(stream.flushed) == 4
+    assert stream.getvalue() == StreamReporter.render(result.errors + result.warnings, result, output_format)
+
+
+def test_stream_text_report():
+    result = _result()
+    text = StreamReporter.render(result.errors + result.warnings, result)
+    assert text.startswith("=" * 60 + "\nDesign Token 验证报告\n")
+    assert "❌ [color-link]\n    引用的Token不存在: {color.primray}\n    💡 建议: 是否想引用 {color-primary}?\n" in text
+    assert "状态: ❌ 失败\n" in text
+    assert text.endswith("警告数: 1\n" + "=" * 60 + "\n")
+
+
+def test_base_stream_reporter_is_abstract():
+    with pytest.raises(TypeError):
+        BaseStreamReporter(io.StringIO())
+
+    class Partial(BaseStreamReporter):
+        def text_issue(self, issue):
+            return str(issue)
+
+    with pytest.raises(TypeError):
+        Partial(io.StringIO())
+
+
+@pytest.mark.parametrize('output_format', ['text', 'markdown', 'json'])
+def test_format_token_report(output_format):
+    report = Reporter.format_token_report(_result(), output_format)
+    if output_format == 'json':
+        data = json.loads(report)
+        assert data['is_valid'] is False and data['error_count'] == 1 and data['warning_count'] == 1
+        assert data['errors'][0]['suggestion'] == '是否想引用 {color-primary}?'
+    else:
+        assert 'color-link' in report and 'spacing-md' in report
+        assert '是否想引用 {color-primary}?' in report
+
+
+def test_format_token_report_for_valid_tokens():
+    result = TokenValidator.validate_token_structure({
+        'color-primary': 'oklch(0.5 0.1 200)', 'spacing-md': '16px', 'typography-body': '16px',
+    })
+    text = Reporter.format_token_report(result)
+    assert f"总Token数: {result.total_tokens}" in text
+    assert ('✅ 通过' in text) == result.is_valid
+
+
+HTML = """<html><body>
+<img src="a.png">
+<a href="/x">点击这里</a>
+<h1>标题</h1><h3>跳级</h3>
+<p style="color: #999; background: #fff">低对比度</p>
+</body></html>
+"""
+
+JSX = """import _ from 'lodash';
+export function List({ items }) {
+  return items.map(item => <li style={{color: 'red'}}>{item}</li>);
+}
+"""
+
+
+@pytest.mark.parametrize('output_format', ['text', 'markdown', 'json'])
+def test_accessibility_format_report_matches_stream(output_format):
+    module = _load_script('validate/check-accessibility.py')
+    streamed = io.StringIO()
+    reporter = module.A11yStreamReporter(streamed, output_format)
+    reporter.begin()
+    streamed_result = module.AccessibilityChecker().check_html(HTML, reporter.issue)
+    reporter.end(streamed_result)
+    result = module.AccessibilityChecker().check_html(HTML)
+    assert result.issues
+    assert module.format_report(result, output_format) == streamed.getvalue()
+
+
+@pytest.mark.parametrize('output_format', ['text', 'markdown', 'json'])
+def test_performance_format_report_matches_stream(tmp_path, output_format):
+    module = _load_script('validate/check-performance.py')
+    (tmp_path / 'List.jsx').write_text(JSX, encoding='utf-8')
+    streamed = io.StringIO()
+    reporter = module.PerformanceStreamReporter(streamed, output_format)
+    reporter.begin()
+    streamed_result = module.PerformanceChecker().check_directory(tmp_path, reporter.issue)
+    reporter.end(streamed_result)
+    result = module.PerformanceChecker().check_directory(tmp_path)
+    assert result.issues
+    assert module.format_report(result, output_format) == streamed.getvalue()
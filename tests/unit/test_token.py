@@ -0,0 +1,147 @@
+"""
+Token工具测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import io
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from utils.cache import ValidationCache
+from utils.jsonstream import ObjectStream, iter_json_members
+from utils.loaders import iter_token_members
+from utils.token import TokenValidator
+
+
+def _nested_tokens(count: int) -> dict:
+    """生成单个顶层分组下含 count 个Token的嵌套文件内容"""
+    groups = {}
+    for i in range(count):
+        groups.setdefault(f"g{i // 1000}", {})[f"t{i}"] = {"$value": f"#{i:06x}", "$type": "color"}
+    return {"color": {"$description": "palette", **groups}}
+
+
+SAMPLE = {
+    "color": {
+        "$type": "color",
+        "bg": {"base": {"$value": "#fff"}, "subtle": {"$value": "#eee", "$description": "x"}},
+        "token": {"$value": "#123", "child": {"$value": "#456"}},
+    },
+    "spacing-md": "16px",
+    "list": [1, {"a": 2}],
+    "empty": {},
+}
+
+
+# ---------------------------------------------------------------- 流式读取
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 16])
+def test_stream_matches_json_load(chunk_size):
+    text = json.dumps(SAMPLE, indent=2)
+    expected = list(TokenValidator.iter_tokens(SAMPLE))
+    lazy = iter_json_members(io.StringIO(text), chunk_size, lazy=True)
+    assert list(TokenValidator.iter_tokens(lazy)) == expected
+    assert dict(iter_json_members(io.StringIO(text), chunk_size)) == SAMPLE
+
+
+def test_stream_yields_object_stream_for_large_groups():
+    text = json.dumps(_nested_tokens(200))
+    members = iter_json_members(io.StringIO(text), 256, lazy=True)
+    key, value = next(members)
+    assert key == 'color' and isinstance(value, ObjectStream)
+    assert value.materialize() == _nested_tokens(200)['color']
+    assert next(members, None) is None
+
+
+def test_stream_skips_unconsumed_objects():
+    text = json.dumps({"a": _nested_tokens(200), "b": 1})
+    members = iter_json_members(io.StringIO(text), 256, lazy=True)
+    key, value = next(members)
+    assert isinstance(value, ObjectStream)
+    assert next(members) == ('b', 1)
+    assert list(value) == []
+
+
+@pytest.mark.parametrize('text', ['{"a":{"b":1 "c":2}}', '{"a":{"b":1,}}', '{"a":{"b":1}',
+                                  '{"a":{"b":tru}}', '{"a":1}x'])
+def test_stream_error_position_matches_json(text):
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+    for chunk_size in (1, 3, 100):
+        with pytest.raises(json.JSONDecodeError) as error:
+            for _ in TokenValidator.iter_tokens(iter_json_members(io.StringIO(text), chunk_size, lazy=True)):
+                pass
+        assert error.value.pos == expected.value.pos
+
+
+def _stream_cost(path, chunk_size):
+    """流式展开文件中所有Token, 返回 (Token数, 耗时, 峰值内存)"""
+    best = float('inf')
+    for _ in range(2):
+        start = time.perf_counter()
+        with open(path, encoding='utf-8') as f:
+            count = sum(1 for _ in TokenValidator.iter_tokens(iter_json_members(f, chunk_size, lazy=True)))
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    with open(path, encoding='utf-8') as f:
+        for _ in TokenValidator.iter_tokens(iter_json_members(f, chunk_size, lazy=True)):
+            pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, best, peak
+
+
+def test_stream_scales_linearly_on_nested_file(tmp_path):
+    # 大分组跨越大量读取块: 逐块重新解码时耗时与分组大小的平方成正比
+    costs = []
+    for count in (5000, 20000):
+        path = tmp_path / f"tokens-{count}.json"
+        path.write_text(json.dumps(_nested_tokens(count), indent=2), encoding='utf-8')
+        costs.append((path.stat().st_size,) + _stream_cost(path, 4096))
+    (small_size, small_count, small_time, small_peak), (large_size, large_count, large_time, large_peak) = costs
+    assert (small_count, large_count) == (5000, 20000)
+    # 4倍的Token: 线性约4倍, 平方约16倍
+    assert large_time < small_time * 8
+    # 峰值内存与文件大小无关
+    assert large_peak < small_peak * 2
+    assert large_peak < large_size / 4
+
+
+def test_iter_token_members_streams_nested_json(tmp_path):
+    path = tmp_path / 'tokens.json'
+    path.write_text(json.dumps(_nested_tokens(3000)), encoding='utf-8')
+    streamed = list(TokenValidator.iter_tokens(iter_token_members(path)))
+    assert streamed == list(TokenValidator.iter_tokens(_nested_tokens(3000)))
+
+
+# ---------------------------------------------------------------- 问题顺序
+
+def test_validate_token_structure_keeps_per_token_order(tmp_path):
+    tokens = {
+        'color-Bad': 'not-a-color',
+        'spacing-md': '1em',
+        'color-ok': 'oklch(0.5 0.1 200)',
+        'color_link': '{color.missing}',
+        'color-range': 'oklch(2 0.1 200)',
+    }
+    expected_errors = [(issue.token_name, issue.message)
+                       for issue in TokenValidator._missing_categories({'color', 'spacing', 'color_link'})]
+    expected_warnings = []
+    for name, value, token_type in TokenValidator.iter_tokens(tokens):
+        for issue in TokenValidator.check_token(name, value, token_type):
+            (expected_errors if issue.level == 'error' else expected_warnings).append((issue.token_name, issue.message))
+    expected_errors += [(issue.token_name, issue.message)
+                        for issue in TokenValidator.check_aliases(tokens) if issue.level == 'error']
+
+    # 缺失类别在前, 然后按Token顺序 (批量的颜色格式检查并入所属Token), 引用问题在后
+    cache = ValidationCache(tmp_path / 'cache.json', TokenValidator.ruleset_fingerprint())
+    for _ in range(2):
+        result = TokenValidator.validate_token_structure(tokens, cache=cache)
+        assert [(issue.token_name, issue.message) for issue in result.errors] == expected_errors
+        assert [(issue.token_name, issue.message) for issue in result.warnings] == expected_warnings
+    assert result.cache_hits == len(tokens)
@@ -0,0 +1,67 @@
+"""
+Token使用情况扫描测试
+
+> 📅 **创建日期**: 2026-10-17
+> 👤 **作者**: Frontend Design Agent Skills 项目团队
+"""
+
+import random
+
+import pytest
+
+from utils.usage import TokenMatcher, UsageScanner
+
+
+def _random_word(rng: random.Random, alphabet: str, max_length: int) -> str:
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randrange(max_length + 1)))
+
+
+def test_token_matcher_matches_naive_find():
+    rng = random.Random(9)
+    for _ in range(300):
+        patterns = list(dict.fromkeys(_random_word(rng, 'ab-', 4) or 'a' for _ in range(6)))
+        text = _random_word(rng, 'ab-c', 40)
+        expected = [(start, index) for index, pattern in enumerate(patterns)
+                    for start in range(len(text)) if text.startswith(pattern, start)]
+        found = list(TokenMatcher(patterns).finditer(text))
+        assert sorted(found) == sorted(expected)
+        # 按结束位置排列
+        ends = [start + len(patterns[index]) for start, index in found]
+        assert ends == sorted(ends)
+
+
+def test_token_matcher_rejects_empty_pattern():
+    with pytest.raises(ValueError):
+        TokenMatcher(['a', ''])
+    assert list(TokenMatcher([]).finditer('abc')) == []
+
+
+def test_usage_scanner_sites():
+    text = (
+        ":root { --ds-color-primary: #fff; }\n"
+        ".a { color: var(--ds-color-primary); margin: $ds-spacing-md; }\n"
+        ".b { color: var(--ds-color-primary-dark); border: var(--ds-missing); --local: 1px; gap: var(--local); }\n"
+    )
+    scanner = UsageScanner(['color-primary', 'spacing-md', 'color-primary-dark', 'unused'], prefix='ds-')
+    usage = scanner.scan_text(text, 'a.css')
+    assert usage.files == 1
+    # 定义不算使用; 名称必须完整匹配
+    assert {name: [str(site) for site in sites] for name, sites in usage.sites.items()} == {
+        'color-primary': ['a.css:2:17'],
+        'spacing-md': ['a.css:2:46'],
+        'color-primary-dark': ['a.css:3:17'],
+    }
+    assert set(usage.references) == {'ds-color-primary', 'ds-color-primary-dark', 'ds-missing', 'local'}
+    assert 'local' in usage.defined
+    assert list(usage.undefined(scanner.names)) == ['ds-missing']
+
+
+def test_usage_scanner_walks_directories(tmp_path):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'a.css').write_text('.a { color: var(--color-primary); }', encoding='utf-8')
+    (tmp_path / 'src' / 'b.txt').write_text('var(--color-primary)', encoding='utf-8')
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'node_modules' / 'c.css').write_text('var(--color-primary)', encoding='utf-8')
+    usage = UsageScanner(['color-primary']).scan([tmp_path])
+    assert usage.files == 1
+    assert [site.path for site in usage.sites['color-primary']] == [str(tmp_path / 'src' / 'a.css')]